@@ -0,0 +1,160 @@
+"""initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Первое число строки JSONB-поля: "450 кг" -> 450, "38,5 °C" -> 38.5
+NUMBER_PATTERN = "[-+]?[0-9]+(?:[.,][0-9]+)?"
+
+
+def _jsonb_number(source: str, key: str) -> sa.Computed:
+    return sa.Computed(
+        f"replace(substring({source} ->> '{key}' FROM '{NUMBER_PATTERN}'), ',', '.')::numeric",
+        persisted=True,
+    )
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    op.create_table(
+        "users",
+        sa.Column("id", sa.BigInteger(), primary_key=True),
+        sa.Column("email", sa.String(), nullable=False, unique=True),
+        sa.Column("username", sa.String(), nullable=False, unique=True),
+        sa.Column("password_hash", sa.String(), nullable=False),
+        sa.Column("refresh_token", sa.String(), nullable=True, unique=True),
+        sa.Column("registered_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+    )
+
+    op.create_table(
+        "animals",
+        sa.Column("id", sa.BigInteger(), primary_key=True),
+        sa.Column("animal", sa.String(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index("ix_animals_animal_id", "animals", ["animal", "id"])
+    op.create_index("uq_animals_name_lower", "animals", [sa.text("lower(name)")], unique=True)
+    op.create_index(
+        "ix_animals_name_trgm",
+        "animals",
+        ["name"],
+        postgresql_using="gin",
+        postgresql_ops={"name": "gin_trgm_ops"},
+    )
+
+    op.create_table(
+        "animal_transcriptions",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("animal_id", sa.BigInteger(), sa.ForeignKey("animals.id"), nullable=False),
+        sa.Column("behavior_state", sa.Text(), nullable=True),
+        sa.Column("measurements", postgresql.JSONB(), nullable=True),
+        sa.Column("weight_kg", sa.Numeric(), _jsonb_number("measurements", "weight")),
+        sa.Column("temperature_c", sa.Numeric(), _jsonb_number("measurements", "temperature")),
+        sa.Column("feeding_details", postgresql.JSONB(), nullable=True),
+        sa.Column("feed_quantity", sa.Numeric(), _jsonb_number("feeding_details", "quantity")),
+        sa.Column("relationships", postgresql.JSONB(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint("id", "created_at"),
+        postgresql_partition_by="RANGE (created_at)",
+    )
+    op.create_index(
+        "ix_animal_transcriptions_animal_id_created_at_id",
+        "animal_transcriptions",
+        ["animal_id", sa.text("created_at DESC"), sa.text("id DESC")],
+    )
+    op.create_index(
+        "ix_animal_transcriptions_weight_kg",
+        "animal_transcriptions",
+        ["weight_kg"],
+        postgresql_where=sa.text("weight_kg IS NOT NULL"),
+    )
+    op.create_index(
+        "ix_animal_transcriptions_temperature_c",
+        "animal_transcriptions",
+        ["temperature_c"],
+        postgresql_where=sa.text("temperature_c IS NOT NULL"),
+    )
+    op.create_index(
+        "ix_animal_transcriptions_created_at_brin", "animal_transcriptions", ["created_at"], postgresql_using="brin"
+    )
+
+    op.create_table(
+        "animal_daily_stats",
+        sa.Column("animal_id", sa.BigInteger(), sa.ForeignKey("animals.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("day", sa.Date(), primary_key=True),
+        sa.Column("notes_count", sa.Integer(), nullable=False),
+        sa.Column("weight_min", sa.Numeric(), nullable=True),
+        sa.Column("weight_max", sa.Numeric(), nullable=True),
+        sa.Column("weight_sum", sa.Numeric(), nullable=False),
+        sa.Column("weight_count", sa.Integer(), nullable=False),
+        sa.Column("temperature_min", sa.Numeric(), nullable=True),
+        sa.Column("temperature_max", sa.Numeric(), nullable=True),
+        sa.Column("temperature_sum", sa.Numeric(), nullable=False),
+        sa.Column("temperature_count", sa.Integer(), nullable=False),
+        sa.Column("feed_quantity", sa.Numeric(), nullable=False),
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION animal_daily_stats_on_insert() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            INSERT INTO animal_daily_stats AS s (
+                animal_id, day, notes_count, weight_min, weight_max, weight_sum, weight_count,
+                temperature_min, temperature_max, temperature_sum, temperature_count, feed_quantity
+            )
+            SELECT animal_id, (created_at AT TIME ZONE 'UTC')::date, count(*),
+                   min(weight_kg), max(weight_kg), coalesce(sum(weight_kg), 0), count(weight_kg),
+                   min(temperature_c), max(temperature_c), coalesce(sum(temperature_c), 0), count(temperature_c),
+                   coalesce(sum(feed_quantity), 0)
+            FROM inserted_transcriptions
+            GROUP BY 1, 2
+            ON CONFLICT (animal_id, day) DO UPDATE SET
+                notes_count = s.notes_count + EXCLUDED.notes_count,
+                weight_min = LEAST(s.weight_min, EXCLUDED.weight_min),
+                weight_max = GREATEST(s.weight_max, EXCLUDED.weight_max),
+                weight_sum = s.weight_sum + EXCLUDED.weight_sum,
+                weight_count = s.weight_count + EXCLUDED.weight_count,
+                temperature_min = LEAST(s.temperature_min, EXCLUDED.temperature_min),
+                temperature_max = GREATEST(s.temperature_max, EXCLUDED.temperature_max),
+                temperature_sum = s.temperature_sum + EXCLUDED.temperature_sum,
+                temperature_count = s.temperature_count + EXCLUDED.temperature_count,
+                feed_quantity = s.feed_quantity + EXCLUDED.feed_quantity;
+            RETURN NULL;
+        END
+        $$
+        """
+    )
+    op.execute(
+        "CREATE TRIGGER animal_transcriptions_daily_stats AFTER INSERT ON animal_transcriptions "
+        "REFERENCING NEW TABLE AS inserted_transcriptions "
+        "FOR EACH STATEMENT EXECUTE FUNCTION animal_daily_stats_on_insert()"
+    )
+    # Месячные партиции animal_transcriptions создаёт приложение (db/postgres/partitions.py)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS animal_transcriptions_daily_stats ON animal_transcriptions")
+    op.execute("DROP FUNCTION IF EXISTS animal_daily_stats_on_insert()")
+    op.drop_table("animal_daily_stats")
+    op.drop_table("animal_transcriptions")
+    op.drop_table("animals")
+    op.drop_table("users")
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Скрипт массового импорта/экспорта животных и транскрипций через COPY
+
+Примеры:
+    python animals_data.py export --table animals --format parquet --path animals.parquet
+    python animals_data.py import --table transcriptions --format csv --path transcriptions.csv
+
+CSV - с заголовком, колонки - колонки таблицы (как при экспорте). После
+импорта животных пересобираются фасеты типов в Redis.
+"""
+
+import argparse
+import asyncio
+import sys
+sys.path.append('src')
+
+from db.postgres.postgres_client import engine
+from v1.animals.config import AnimalsServiceConfig
+from v1.animals.data_transfer import DataFormat, DataTable, export_table, import_table
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Импорт/экспорт таблиц животных через COPY")
+    parser.add_argument("command", choices=["import", "export"])
+    parser.add_argument("--table", type=DataTable, choices=[t.value for t in DataTable], required=True)
+    parser.add_argument("--format", dest="data_format", type=DataFormat, choices=[f.value for f in DataFormat], default=DataFormat.CSV)
+    parser.add_argument("--path", required=True, help="Файл для импорта или экспорта")
+    parser.add_argument(
+        "--chunk-rows",
+        type=int,
+        default=AnimalsServiceConfig().DATA_TRANSFER_CHUNK_ROWS,
+        help="Строк в чанке при конвертации Parquet",
+    )
+    return parser.parse_args()
+
+
+async def main(args: argparse.Namespace):
+    try:
+        if args.command == "export":
+            stats = await export_table(args.table, args.data_format, args.path, args.chunk_rows)
+        else:
+            stats = await import_table(args.table, args.data_format, args.path, args.chunk_rows)
+            if args.table == DataTable.ANIMALS:
+                from rebuild_animal_facets import rebuild_animal_facets
+                await rebuild_animal_facets()
+    finally:
+        await engine.dispose()
+
+    action = "Выгружено" if args.command == "export" else "Загружено"
+    print(
+        f"✅ {action} {stats.rows} строк ({stats.table.value}, {stats.format.value}) "
+        f"за {stats.seconds:.2f} с - {stats.rows_per_second} строк/с"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Скрипт архивации старых транскрипций
+
+Партиции animal_transcriptions старше --older-than-months месяцев отсоединяются
+(DETACH PARTITION CONCURRENTLY, без блокировки таблицы) и переносятся в схему archive.
+С --export-dir каждая перенесённая партиция выгружается в CSV, с --drop после
+выгрузки удаляется из БД. Дневные сводки (animal_daily_stats) не меняются.
+
+    python archive_transcriptions.py --older-than-months 24
+    python archive_transcriptions.py --older-than-months 24 --export-dir /mnt/cold --drop
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+sys.path.append('src')
+
+from config import DatabaseConfig
+from db.postgres.partitions import archive_partitions, export_archived_partition
+from db.postgres.postgres_client import engine
+
+
+async def archive_transcriptions(args: argparse.Namespace):
+    try:
+        archived = await archive_partitions(args.older_than_months, DatabaseConfig().POSTGRES_PARTITION_LOCK_TIMEOUT)
+        print(f"✅ Отсоединено партиций: {len(archived)}")
+        for name in archived:
+            if args.export_dir:
+                path = os.path.join(args.export_dir, f"{name}.csv")
+                rows = await export_archived_partition(name, path, drop=args.drop)
+                print(f"  {name}: {rows} строк -> {path}{' (таблица удалена)' if args.drop else ''}")
+            else:
+                print(f"  {name} -> archive.{name}")
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Архивация старых партиций animal_transcriptions")
+    parser.add_argument("--older-than-months", type=int, required=True, help="Архивировать месяцы старше N")
+    parser.add_argument("--export-dir", default=None, help="Выгрузить архивные партиции в CSV в эту директорию")
+    parser.add_argument("--drop", action="store_true", help="Удалить партицию из БД после выгрузки")
+    args = parser.parse_args()
+    if args.drop and not args.export_dir:
+        parser.error("--drop requires --export-dir")
+    if args.older_than_months < 1:
+        parser.error("--older-than-months must be at least 1")
+    asyncio.run(archive_transcriptions(args))
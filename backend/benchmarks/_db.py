@@ -0,0 +1,108 @@
+"""
+Общие помощники для бенчмарков против локального Postgres.
+
+Подключение берётся из тех же настроек, что и у приложения (POSTGRES_* в .env).
+Данные генерируются на стороне сервера через generate_series, поэтому
+миллион строк вставляется за секунды.
+"""
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Awaitable, Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from sqlalchemy import text  # noqa: E402
+
+import common_models  # noqa: E402,F401  # регистрирует модели в Base.metadata
+from db.postgres.migrations import upgrade_to_head  # noqa: E402
+from db.postgres.partitions import create_partition_sql, partitions_between  # noqa: E402
+from db.postgres.postgres_client import engine, sync_engine  # noqa: E402
+
+ANIMAL_TYPES = ("корова", "свинья", "курица", "овца", "коза", "лошадь", "кролик", "утка")
+
+
+def ensure_schema() -> None:
+    upgrade_to_head()
+
+
+def seed_animals(target_rows: int) -> int:
+    """Догенерирует животных до target_rows; возвращает итоговое количество"""
+    with sync_engine.begin() as conn:
+        current = conn.execute(text("SELECT count(*) FROM animals")).scalar_one()
+        if current < target_rows:
+            print(f"Seeding animals: {current} -> {target_rows}...")
+            conn.execute(
+                text(
+                    """
+                    INSERT INTO animals (animal, name, created_at, updated_at)
+                    SELECT (:types)[1 + (g % :type_count)],
+                           'Животное-' || md5(g::text),
+                           now() - (g || ' seconds')::interval,
+                           now()
+                    FROM generate_series(:start, :stop) AS g
+                    """
+                ),
+                {
+                    "types": list(ANIMAL_TYPES),
+                    "type_count": len(ANIMAL_TYPES),
+                    "start": current + 1,
+                    "stop": target_rows,
+                },
+            )
+            conn.execute(text("ANALYZE animals"))
+        return max(current, target_rows)
+
+
+def seed_transcriptions(target_rows: int, animals: int) -> int:
+    """
+    Догенерирует транскрипции до target_rows, распределяя их по первым `animals` животным
+
+    Рассчитывает на плотные id животных (как после seed_animals).
+    """
+    with sync_engine.begin() as conn:
+        current = conn.execute(text("SELECT count(*) FROM animal_transcriptions")).scalar_one()
+        if current < target_rows:
+            print(f"Seeding animal_transcriptions: {current} -> {target_rows}...")
+            # Строка g создана g минут назад: партиции на весь этот период
+            now = datetime.now(timezone.utc)
+            for partition in partitions_between((now - timedelta(minutes=target_rows)).date(), now.date()):
+                conn.execute(text(create_partition_sql(partition)))
+            conn.execute(
+                text(
+                    """
+                    INSERT INTO animal_transcriptions
+                        (animal_id, behavior_state, measurements, feeding_details, relationships, created_at, updated_at)
+                    SELECT first.id + (g % :animals),
+                           'Спокойное поведение, запись ' || g,
+                           jsonb_build_object('weight', (400 + g % 100) || ' кг',
+                                              'temperature', (38 + (g % 20) / 10.0)::text || ' °C'),
+                           jsonb_build_object('food_type', 'сено', 'quantity', (g % 15) || ' кг'),
+                           jsonb_build_object('interactions', 'нет'),
+                           now() - (g || ' minutes')::interval,
+                           now()
+                    FROM generate_series(:start, :stop) AS g
+                    CROSS JOIN (SELECT min(id) AS id FROM animals) AS first
+                    """
+                ),
+                {"start": current + 1, "stop": target_rows, "animals": animals},
+            )
+            conn.execute(text("ANALYZE animal_transcriptions"))
+        return max(current, target_rows)
+
+
+async def measure(fn: Callable[[], Awaitable], repeat: int = 5) -> float:
+    """Медиана времени выполнения корутины в миллисекундах (после одного прогрева)"""
+    await fn()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+async def dispose() -> None:
+    await engine.dispose()
@@ -0,0 +1,114 @@
+"""
+Бенчмарк каскада ASR: латентность и согласованность быстрой и большой моделей.
+
+Каждый файл распознаётся обоими уровнями; большая модель служит эталоном,
+для быстрой считается WER относительно неё. В конце выводится, сколько клипов
+каскад отправил бы на эскалацию и какую среднюю латентность это даёт.
+
+Запуск (из каталога backend):
+    python benchmarks/bench_asr_cascade.py path/to/audio_dir [--repeat 3]
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from v1.animals.asr_routing import ASRTier  # noqa: E402
+from v1.animals.inference import (  # noqa: E402
+    TARGET_SAMPLE_RATE,
+    cascade_policy,
+    get_asr_backend,
+    load_audio_for_asr,
+)
+
+AUDIO_EXTENSIONS = {".wav", ".mp3", ".m4a", ".flac", ".aac", ".ogg", ".wma", ".webm", ".opus"}
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """WER как расстояние Левенштейна по словам, нормированное на длину эталона"""
+    ref, hyp = reference.split(), hypothesis.split()
+    if not ref:
+        return 0.0 if not hyp else 1.0
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i] + [0] * len(hyp)
+        for j, hyp_word in enumerate(hyp, 1):
+            current[j] = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ref_word != hyp_word),
+            )
+        previous = current
+    return previous[-1] / len(ref)
+
+
+def percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("audio_dir", type=Path)
+    parser.add_argument("--repeat", type=int, default=1, help="Прогонов на файл для усреднения латентности")
+    args = parser.parse_args()
+
+    files = sorted(p for p in args.audio_dir.iterdir() if p.suffix.lower() in AUDIO_EXTENSIONS)
+    if not files:
+        sys.exit(f"No audio files in {args.audio_dir}")
+
+    # Модели грузим заранее, чтобы не учитывать загрузку в латентности
+    t0 = time.perf_counter()
+    fast, large = get_asr_backend(ASRTier.FAST), get_asr_backend(ASRTier.LARGE)
+    print(f"Models loaded in {time.perf_counter() - t0:.1f}s: fast={fast.model_name} large={large.model_name}")
+
+    latency = {ASRTier.FAST: [], ASRTier.LARGE: [], "cascade": []}
+    wers, escalated = [], 0
+
+    print(f"{'file':40} {'sec':>6} {'fast,s':>7} {'large,s':>7} {'conf':>5} {'WER':>5} route")
+    for path in files:
+        wav = load_audio_for_asr(str(path))
+        audio_seconds = wav.shape[-1] / TARGET_SAMPLE_RATE
+
+        fast_runs = [fast.transcribe(wav) for _ in range(args.repeat)]
+        large_runs = [large.transcribe(wav) for _ in range(args.repeat)]
+        fast_seconds = statistics.mean(r.elapsed_seconds for r in fast_runs)
+        large_seconds = statistics.mean(r.elapsed_seconds for r in large_runs)
+        fast_result, large_result = fast_runs[0], large_runs[0]
+
+        wer = word_error_rate(large_result.text, fast_result.text)
+        latency[ASRTier.FAST].append(fast_seconds)
+        latency[ASRTier.LARGE].append(large_seconds)
+        wers.append(wer)
+
+        # Что сделал бы каскад с этим клипом
+        if cascade_policy.initial_tier(audio_seconds) == ASRTier.LARGE:
+            route, cascade_seconds = "large", large_seconds
+        elif cascade_policy.should_escalate(fast_result):
+            route, cascade_seconds = "fast->large", fast_seconds + large_seconds
+            escalated += 1
+        else:
+            route, cascade_seconds = "fast", fast_seconds
+        latency["cascade"].append(cascade_seconds)
+
+        print(
+            f"{path.name[:40]:40} {audio_seconds:6.1f} {fast_seconds:7.2f} {large_seconds:7.2f} "
+            f"{fast_result.confidence:5.2f} {wer:5.2f} {route}"
+        )
+
+    print()
+    for name, values in latency.items():
+        label = name.value if isinstance(name, ASRTier) else name
+        print(
+            f"{label:8} p50={percentile(values, 0.5):.2f}s p95={percentile(values, 0.95):.2f}s "
+            f"mean={statistics.mean(values):.2f}s"
+        )
+    print(f"fast vs large: mean WER={statistics.mean(wers):.3f}, exact match={sum(w == 0 for w in wers)}/{len(wers)}")
+    print(f"cascade escalations: {escalated}/{len(files)}")
+
+
+if __name__ == "__main__":
+    main()
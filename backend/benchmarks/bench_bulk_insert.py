@@ -0,0 +1,71 @@
+"""
+Бенчмарк массовой вставки транскрипций: insert_one против insert_many и COPY.
+
+Каждый способ вставляет одни и те же --rows строк в отдельной транзакции,
+которая затем откатывается, так что таблица не растёт между прогонами.
+
+Запуск (из каталога backend, Postgres из docker-compose):
+    python benchmarks/bench_bulk_insert.py --rows 20000 --batch-size 1000
+"""
+import argparse
+import asyncio
+import time
+
+from _db import dispose, ensure_schema, seed_animals
+
+from common_schemas import AnimalTranscriptionCreate
+from db.postgres.unit_of_work import UnitOfWork
+
+
+def _transcriptions(count: int, animal_id: int):
+    return [
+        AnimalTranscriptionCreate(
+            animal_id=animal_id,
+            behavior_state=f"Спокойное поведение, запись {i}",
+            measurements={"weight": f"{400 + i % 100} кг", "temperature": f"{38 + (i % 20) / 10} °C"},
+            feeding_details={"food_type": "сено", "quantity": f"{i % 15} кг"},
+        )
+        for i in range(count)
+    ]
+
+
+async def rows_per_second(insert, rows) -> float:
+    async with UnitOfWork() as uow:
+        start = time.perf_counter()
+        await insert(uow.animal_transcriptions, rows)
+        elapsed = time.perf_counter() - start
+        await uow.rollback()
+    return len(rows) / elapsed
+
+
+async def insert_one_by_one(repository, rows):
+    for row in rows:
+        await repository.insert_one(row)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20_000)
+    parser.add_argument("--batch-size", type=int, default=1_000)
+    args = parser.parse_args()
+
+    ensure_schema()
+    seed_animals(1)
+    async with UnitOfWork() as uow:
+        animal_id = (await uow.animals.find_page(limit=1)).items[0].id
+    rows = _transcriptions(args.rows, animal_id)
+
+    methods = {
+        "insert_one": insert_one_by_one,
+        "insert_many": lambda repo, batch: repo.insert_many(batch, batch_size=args.batch_size, use_copy=False),
+        "copy_many": lambda repo, batch: repo.copy_many(batch),
+    }
+    print(f"{'method':>12} {'rows/s':>10}")
+    for name, insert in methods.items():
+        print(f"{name:>12} {await rows_per_second(insert, rows):>10.0f}")
+
+    await dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,66 @@
+"""
+Бенчмарк пагинации животных: LIMIT/OFFSET против keyset (курсор по id).
+
+Засевает таблицу animals до --rows строк и меряет время выборки страницы
+на разной глубине. OFFSET растёт линейно с глубиной, keyset - константа.
+Затем то же для выборки по типу животного (индекс (animal, id)) вместе
+с подсчётом total: старый путь грузил всю выборку и резал её в Python.
+
+Запуск (из каталога backend, Postgres из docker-compose):
+    python benchmarks/bench_keyset_pagination.py --rows 1000000
+"""
+import argparse
+import asyncio
+
+from _db import ANIMAL_TYPES, dispose, ensure_schema, measure, seed_animals
+
+from db.postgres.unit_of_work import UnitOfWork
+from pagination import encode_cursor
+
+DEPTHS = (0, 1_000, 10_000, 100_000, 500_000, 999_000)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--page-size", type=int, default=50)
+    args = parser.parse_args()
+
+    ensure_schema()
+    total = seed_animals(args.rows)
+
+    async with UnitOfWork() as uow:
+        first_id = (await uow.animals.find_page(limit=1)).items[0].id
+
+        print(f"{'depth':>9} {'OFFSET, ms':>11} {'keyset, ms':>11}")
+        for depth in DEPTHS:
+            if depth + args.page_size > total:
+                continue
+            # Курсор, указывающий на строку перед нужной страницей (id плотные после сидинга)
+            cursor = encode_cursor([first_id + depth - 1]) if depth else None
+
+            offset_ms = await measure(lambda: uow.animals.find_all(limit=args.page_size, offset=depth))
+            keyset_ms = await measure(lambda: uow.animals.find_page(cursor=cursor, limit=args.page_size))
+            print(f"{depth:>9} {offset_ms:>11.2f} {keyset_ms:>11.2f}")
+
+        animal_type = ANIMAL_TYPES[0]
+        first_page = await uow.animals.find_page_by_animal_type(animal_type, limit=args.page_size)
+        python_ms = await measure(
+            lambda: uow.animals.find_all(limit=total, animal_type=animal_type, mappings=True), repeat=3
+        )
+        sql_ms = await measure(lambda: uow.animals.find_page_by_animal_type(animal_type, limit=args.page_size))
+        next_ms = await measure(
+            lambda: uow.animals.find_page_by_animal_type(
+                animal_type, cursor=first_page[0].next_cursor, limit=args.page_size
+            )
+        )
+        print(f"\nanimal_type={animal_type!r}, total={first_page[1].value} (exact={first_page[1].exact})")
+        print(f"{'fetch all + slice, ms':>24} {python_ms:>9.2f}")
+        print(f"{'SQL first page, ms':>24} {sql_ms:>9.2f}")
+        print(f"{'SQL next page, ms':>24} {next_ms:>9.2f}")
+
+    await dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
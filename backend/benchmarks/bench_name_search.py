@@ -0,0 +1,56 @@
+"""
+Бенчмарк поиска животных по имени.
+
+Сравнивает старый путь (первые 1000 животных + фильтр в Python), ILIKE без
+ранжирования и триграммный поиск с сортировкой по похожести (GIN-индекс
+ix_animals_name_trgm). Старый путь быстрый, но видит только первую тысячу строк.
+
+Запуск (из каталога backend, Postgres из docker-compose):
+    python benchmarks/bench_name_search.py --rows 1000000
+"""
+import argparse
+import asyncio
+
+from _db import dispose, engine, ensure_schema, measure, seed_animals
+from sqlalchemy import select
+
+from common_models import Animal
+from db.postgres.unit_of_work import UnitOfWork
+
+# Имена после сидинга: 'Животное-' || md5(n)
+QUERIES = ("a1b2", "Животное-00", "ffff", "Животное-c4ca4238a0b923820dcc509a6f75849b")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args()
+
+    ensure_schema()
+    seed_animals(args.rows)
+
+    async with UnitOfWork() as uow:
+
+        async def python_filter(term: str):
+            animals = await uow.animals.find_all(limit=1000)
+            return [animal for animal in animals if term.lower() in animal.name.lower()]
+
+        async def ilike_filter(term: str):
+            query = select(Animal.id, Animal.name).where(Animal.name.ilike(f"%{term}%"))
+            async with engine.connect() as conn:
+                return (await conn.execute(query)).all()
+
+        print(f"{'query':>44} {'python, ms':>11} {'ILIKE, ms':>10} {'trgm, ms':>9} {'hits':>5}")
+        for term in QUERIES:
+            python_ms = await measure(lambda: python_filter(term))
+            ilike_ms = await measure(lambda: ilike_filter(term), repeat=3)
+            trgm_ms = await measure(lambda: uow.animals.search_ranked_by_name(term, limit=args.limit))
+            hits = len((await uow.animals.search_ranked_by_name(term, limit=args.limit)).items)
+            print(f"{term:>44} {python_ms:>11.2f} {ilike_ms:>10.2f} {trgm_ms:>9.2f} {hits:>5}")
+
+    await dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
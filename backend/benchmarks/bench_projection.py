@@ -0,0 +1,77 @@
+"""
+Бенчмарк списков животных: схемы на строку против проекции колонок.
+
+Страница из --page-size животных читается через репозиторий и превращается в
+AnimalResponse. Прежний путь: ORM-объект (или строка) -> AnimalSchema ->
+AnimalResponse(...) с повторной валидацией. Новый: только колонки таблицы
+(mappings=True) -> AnimalResponse.model_construct. Сравнивается процессорное
+время (process_time) на страницу - работа Python без ожидания базы - для
+сессии (UnitOfWork) и облегчённого пути (ReadOnlyUnitOfWork).
+
+Запуск (из каталога backend, Postgres из docker-compose):
+    python benchmarks/bench_projection.py --rows 100000 --page-size 1000
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+from _db import dispose, ensure_schema, seed_animals
+
+from db.postgres.unit_of_work import ReadOnlyUnitOfWork, UnitOfWork
+from v1.animals.schemas import AnimalResponse
+from v1.animals.service import AnimalsService
+
+
+async def cpu_ms(fn, repeat: int) -> float:
+    """Медиана процессорного времени корутины в миллисекундах (после одного прогрева)"""
+    await fn()
+    timings = []
+    for _ in range(repeat):
+        start = time.process_time()
+        await fn()
+        timings.append((time.process_time() - start) * 1000)
+    return statistics.median(timings)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--page-size", type=int, default=1_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    ensure_schema()
+    seed_animals(args.rows)
+
+    print(f"{'unit of work':>20} {'schemas, ms':>12} {'mappings, ms':>13} {'speedup':>8}")
+    for uow_type in (UnitOfWork, ReadOnlyUnitOfWork):
+
+        async def schemas():
+            async with uow_type() as uow:
+                page, _ = await uow.animals.find_page_by_animal_type(limit=args.page_size)
+            return [
+                AnimalResponse(
+                    id=animal.id,
+                    animal=animal.animal,
+                    name=animal.name,
+                    created_at=animal.created_at,
+                    updated_at=animal.updated_at,
+                )
+                for animal in page.items
+            ]
+
+        async def mappings():
+            async with uow_type() as uow:
+                page, _ = await uow.animals.find_page_by_animal_type(limit=args.page_size, mappings=True)
+            return AnimalsService._animal_responses(page.items)
+
+        before = await cpu_ms(schemas, args.repeat)
+        after = await cpu_ms(mappings, args.repeat)
+        print(f"{uow_type.__name__:>20} {before:>12.1f} {after:>13.1f} {before / after:>7.2f}x")
+
+    await dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
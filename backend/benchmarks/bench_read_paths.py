@@ -0,0 +1,81 @@
+"""
+Бенчмарк GET-эндпоинтов животных: ORM-сессия против облегчённого read-only пути.
+
+Запросы идут в приложение in-process (httpx + ASGI, без сети и без lifespan),
+так что в замер попадают роутер, сервис, UnitOfWork и база. Для каждого
+эндпоинта сравниваются POSTGRES_LIGHTWEIGHT_READS=false (UnitOfWork:
+сессия, BEGIN/ROLLBACK, ORM-объекты) и true (ReadOnlyUnitOfWork: AUTOCOMMIT-
+соединение, строки таблиц).
+
+Запуск (из каталога backend, Postgres из docker-compose):
+    python benchmarks/bench_read_paths.py --rows 100000 --requests 2000 --concurrency 20
+"""
+import argparse
+import asyncio
+import time
+
+from _db import dispose, ensure_schema, seed_animals, seed_transcriptions
+
+import httpx
+from fastapi import FastAPI
+
+from core.containers import setup_containers
+from core.routers import main_router
+from db.postgres.postgres_client import settings
+from db.postgres.unit_of_work import UnitOfWork
+
+
+async def requests_per_second(client: httpx.AsyncClient, url: str, total: int, concurrency: int) -> float:
+    remaining = iter(range(total))
+
+    async def worker():
+        for _ in remaining:
+            response = await client.get(url)
+            response.raise_for_status()
+
+    await client.get(url)  # прогрев
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return total / (time.perf_counter() - start)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--requests", type=int, default=2_000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+
+    ensure_schema()
+    seed_animals(args.rows)
+    seed_transcriptions(args.rows, animals=min(args.rows, 1_000))
+
+    async with UnitOfWork() as uow:
+        animal_id = (await uow.animals.find_page(limit=1)).items[0].id
+
+    endpoints = {
+        "animal by id": f"/v1/animals/{animal_id}",
+        "animals list": "/v1/animals/?page_size=50",
+        "transcriptions page": f"/v1/animals/{animal_id}/transcriptions/history?limit=50",
+        "animal + transcriptions": f"/v1/animals/{animal_id}/transcriptions",
+    }
+
+    setup_containers()
+    app = FastAPI()
+    app.include_router(main_router)
+    transport = httpx.ASGITransport(app=app)
+
+    print(f"{'endpoint':>24} {'ORM, req/s':>11} {'light, req/s':>13} {'speedup':>8}")
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name, url in endpoints.items():
+            results = {}
+            for lightweight in (False, True):
+                settings.POSTGRES_LIGHTWEIGHT_READS = lightweight
+                results[lightweight] = await requests_per_second(client, url, args.requests, args.concurrency)
+            print(f"{name:>24} {results[False]:>11.0f} {results[True]:>13.0f} {results[True] / results[False]:>7.2f}x")
+
+    await dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
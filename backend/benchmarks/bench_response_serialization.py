@@ -0,0 +1,96 @@
+"""
+Бенчмарк сериализации ответа: прежний путь FastAPI против EnvelopeResponse.
+
+Ответ - страница из --items транскрипций с большими JSONB-полями (measurements,
+feeding_details, relationships по --jsonb-keys ключей). Прежний путь повторяет
+то, что делал эндпоинт: model_dump() -> ResponseSchema -> валидация по
+response_model -> сериализация в JSON-совместимый dict -> json.dumps.
+Новый - orjson сразу из модели ответа в байты. БД не нужна.
+
+Запуск (из каталога backend):
+    python benchmarks/bench_response_serialization.py --items 100 --jsonb-keys 50
+"""
+import argparse
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from fastapi.responses import JSONResponse  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+
+from common_schemas import ResponseSchema  # noqa: E402
+from core.responses import EnvelopeResponse  # noqa: E402
+from v1.animals.schemas import TranscriptionResponse, TranscriptionsPageResponse  # noqa: E402
+
+
+def _document(keys: int, prefix: str) -> dict:
+    return {
+        f"{prefix}_{i}": {"value": f"{i * 1.5} ед.", "note": "Наблюдение за состоянием животного " * 3, "tags": [i, i + 1]}
+        for i in range(keys)
+    }
+
+
+def build_page(items: int, jsonb_keys: int) -> TranscriptionsPageResponse:
+    now = datetime.now(timezone.utc)
+    transcriptions = [
+        TranscriptionResponse(
+            id=i,
+            animal_id=1,
+            behavior_state="Спокойное поведение, аппетит хороший",
+            measurements={"weight": "450 кг", "temperature": "38,5 °C", **_document(jsonb_keys, "m")},
+            weight_kg=450.0,
+            temperature_c=38.5,
+            feeding_details=_document(jsonb_keys, "f"),
+            relationships=_document(jsonb_keys, "r"),
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(items)
+    ]
+    return TranscriptionsPageResponse(animal_id=1, transcriptions=transcriptions, next_cursor="abc")
+
+
+RESPONSE_ADAPTER = TypeAdapter(ResponseSchema)
+
+
+def legacy_response(page: TranscriptionsPageResponse) -> bytes:
+    content = ResponseSchema(exception=0, data=page.model_dump()).model_dump()
+    value = RESPONSE_ADAPTER.validate_python(content)
+    return JSONResponse(RESPONSE_ADAPTER.dump_python(value, mode="json")).body
+
+
+def envelope_response(page: TranscriptionsPageResponse) -> bytes:
+    return EnvelopeResponse(page).body
+
+
+def median_ms(fn, page, repeat: int) -> float:
+    fn(page)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(page)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=100)
+    parser.add_argument("--jsonb-keys", type=int, default=50, help="Ключей в каждом JSONB-поле")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    page = build_page(args.items, args.jsonb_keys)
+    size_kb = len(envelope_response(page)) / 1024
+    print(f"items={args.items} jsonb_keys={args.jsonb_keys} body={size_kb:.0f} KiB")
+    print(f"{'path':>22} {'median ms':>10}")
+    for name, fn in (("ResponseSchema+model", legacy_response), ("EnvelopeResponse", envelope_response)):
+        print(f"{name:>22} {median_ms(fn, page, args.repeat):>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
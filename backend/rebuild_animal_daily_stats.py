@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Скрипт для пересборки дневных сводок животных (animal_daily_stats) из истории транскрипций
+
+Нужен после первого развёртывания сводок, правки или удаления транскрипций
+(триггер учитывает только вставки) и для проверки расхождений.
+Пересчёт идёт по подключённым партициям: сводки месяцев из архивных партиций
+(archive_transcriptions.py) не удаляются и не пересчитываются.
+
+    python rebuild_animal_daily_stats.py               # все животные
+    python rebuild_animal_daily_stats.py --animal-id 7 # одно животное
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+sys.path.append('src')
+
+from db.postgres.unit_of_work import UnitOfWork
+
+
+async def rebuild_animal_daily_stats(animal_id=None):
+    """Пересчет сводок в одной транзакции"""
+    started_at = time.perf_counter()
+    async with UnitOfWork() as uow:
+        days = await uow.animal_daily_stats.rebuild(animal_id)
+        await uow.commit()
+
+    scope = f"животное {animal_id}" if animal_id is not None else "все животные"
+    print(f"✅ Сводки пересобраны ({scope}): {days} дней за {time.perf_counter() - started_at:.2f} с")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Пересборка animal_daily_stats из транскрипций")
+    parser.add_argument("--animal-id", type=int, default=None, help="Только для одного животного")
+    asyncio.run(rebuild_animal_daily_stats(parser.parse_args().animal_id))
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Скрипт для полной пересборки фасетов типов животных в Redis
+
+Нужен после потери Redis или если счётчики разошлись с БД
+(например, при сбое между коммитом и обновлением фасетов).
+"""
+
+import asyncio
+import sys
+sys.path.append('src')
+
+from db.postgres.unit_of_work import UnitOfWork
+from db.redis.redis_client import RedisClient
+from v1.animals.facets import AnimalTypeFacets
+
+
+async def rebuild_animal_facets():
+    """Пересчет количества животных каждого типа и замена фасетов"""
+    async with UnitOfWork() as uow:
+        counts = await uow.animals.count_by_animal_types()
+
+    await AnimalTypeFacets(RedisClient()).rebuild(counts)
+
+    print(f"✅ Фасеты пересобраны: {len(counts)} типов, {sum(counts.values())} животных")
+    for animal_type, count in sorted(counts.items()):
+        print(f"  {animal_type}: {count}")
+
+
+if __name__ == "__main__":
+    asyncio.run(rebuild_animal_facets())
@@ -1,4 +1,4 @@
-from sqlalchemy import BigInteger, String, Integer, DateTime
+from sqlalchemy import BigInteger, String, Integer, DateTime, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from db.postgres.postgres_client import Base
@@ -6,15 +6,34 @@ from typing import TypeVar
 from sqlalchemy.dialects.postgresql import JSONB
 
 from pydantic import BaseModel, ConfigDict
-from datetime import datetime
+from datetime import date, datetime
 from typing import List, Optional
 
-from sqlalchemy import ForeignKey, String, Text, DateTime, Integer, Boolean
+from sqlalchemy import Computed, Date, ForeignKey, Index, Numeric, String, Text, DateTime, Integer, Boolean, func
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 
 Model = TypeVar("Model", bound=BaseModel)
 
+# Схема БД создаётся миграциями (backend/alembic): расширение pg_trgm и триггер
+# дневных сводок есть только там, месячные партиции animal_transcriptions создаёт
+# db/postgres/partitions.py. Изменения моделей сопровождаются новой миграцией.
+
+
+# Первое число в строке: целое или с десятичной точкой/запятой
+MEASUREMENT_NUMBER_PATTERN = "[-+]?[0-9]+(?:[.,][0-9]+)?"
+
+
+def jsonb_number(source: str, key: str) -> str:
+    """
+    SQL-выражение: число из source->>key
+
+    LLM пишет измерения строками ("450 кг", "38,5 °C", "около 40"): берётся первое
+    число, десятичная запятая заменяется точкой. Нет числа - NULL. Выражение
+    IMMUTABLE, поэтому годится для генерируемой колонки.
+    """
+    return f"replace(substring({source} ->> '{key}' FROM '{MEASUREMENT_NUMBER_PATTERN}'), ',', '.')::numeric"
+
 
 class User(Base):
     __tablename__ = "users"
@@ -35,16 +54,30 @@ class User(Base):
 
 class Animal(Base):
     __tablename__ = "animals"
+    __table_args__ = (
+        # Фильтр по типу + keyset-пагинация по id: WHERE animal = ? AND id > ? ORDER BY id
+        Index("ix_animals_animal_id", "animal", "id"),
+        # Имя уникально без учёта регистра: дубликаты ловит БД при INSERT/UPDATE
+        Index("uq_animals_name_lower", func.lower(text("name")), unique=True),
+        # Поиск по подстроке/похожести имени: ILIKE '%x%' и name % x через триграммы
+        Index(
+            "ix_animals_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+    )
 
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
     animal: Mapped[str] = mapped_column(String, nullable=False)  # Тип животного
     name: Mapped[str] = mapped_column(String, nullable=False)    # Имя животного
 
+    # server_default - для вставок в обход ORM (COPY при импорте)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=datetime.utcnow
+        DateTime(timezone=True), default=datetime.utcnow, server_default=func.now()
     )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow
+        DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow, server_default=func.now()
     )
 
     # Связь с транскрипциями
@@ -54,9 +87,38 @@ class Animal(Base):
 
 
 class AnimalTranscription(Base):
+    """
+    Транскрипции: таблица только дополняется и секционирована по месяцам created_at
+
+    Партиции создаются заранее (db/postgres/partitions.py), старые отсоединяются
+    скриптом archive_transcriptions.py. Первичный ключ включает ключ секционирования.
+    Запросы "последние N" (ORDER BY created_at DESC LIMIT) читают партиции от новой
+    к старой и останавливаются на первой, где набралось N строк.
+    """
+
     __tablename__ = "animal_transcriptions"
+    __table_args__ = (
+        # Ключ keyset-пагинации транскрипций животного: (animal_id, created_at DESC, id DESC)
+        Index(
+            "ix_animal_transcriptions_animal_id_created_at_id",
+            "animal_id",
+            text("created_at DESC"),
+            text("id DESC"),
+        ),
+        # Диапазонные запросы по измерениям (строки без измерения в индекс не попадают)
+        Index("ix_animal_transcriptions_weight_kg", "weight_kg", postgresql_where=text("weight_kg IS NOT NULL")),
+        Index(
+            "ix_animal_transcriptions_temperature_c",
+            "temperature_c",
+            postgresql_where=text("temperature_c IS NOT NULL"),
+        ),
+        # Выборки за период: created_at растёт вместе с физическим порядком строк,
+        # BRIN на порядки меньше B-tree
+        Index("ix_animal_transcriptions_created_at_brin", "created_at", postgresql_using="brin"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
-    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
     animal_id: Mapped[int] = mapped_column(BigInteger, ForeignKey("animals.id"), nullable=False)
     
     # Поведение/состояние (с историей)
@@ -64,19 +126,78 @@ class AnimalTranscription(Base):
     
     # Детализированные параметры (измерения животного - вес, температура)
     measurements: Mapped[Optional[dict]] = mapped_column(JSONB, nullable=True)
+
+    # Вес и температура числами, вычисляются БД из measurements при записи
+    weight_kg: Mapped[Optional[float]] = mapped_column(
+        Numeric(asdecimal=False), Computed(jsonb_number("measurements", "weight"), persisted=True)
+    )
+    temperature_c: Mapped[Optional[float]] = mapped_column(
+        Numeric(asdecimal=False), Computed(jsonb_number("measurements", "temperature"), persisted=True)
+    )
     
     # Детали кормления (пища, количество)
     feeding_details: Mapped[Optional[dict]] = mapped_column(JSONB, nullable=True)
+
+    # Количество корма числом из feeding_details (вычисляется БД)
+    feed_quantity: Mapped[Optional[float]] = mapped_column(
+        Numeric(asdecimal=False), Computed(jsonb_number("feeding_details", "quantity"), persisted=True)
+    )
     
     # Взаимоотношения с другими животными
     relationships: Mapped[Optional[dict]] = mapped_column(JSONB, nullable=True)
 
+    # server_default - для вставок в обход ORM (COPY при импорте)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=datetime.utcnow
+        DateTime(timezone=True), primary_key=True, default=datetime.utcnow, server_default=func.now()
     )
     updated_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow
+        DateTime(timezone=True), default=datetime.utcnow, onupdate=datetime.utcnow, server_default=func.now()
     )
 
     # Связь с животным
     animal: Mapped["Animal"] = relationship("Animal", back_populates="transcriptions")
+
+
+class AnimalDailyStats(Base):
+    """
+    Дневная сводка по животному для графиков: заполняется триггером при вставке
+    транскрипций (animal_transcriptions_daily_stats, миграция 0001), пересобирается из истории скриптом rebuild_animal_daily_stats.py
+
+    Хранятся суммы и количества, а не средние: так сводка обновляется инкрементально.
+    """
+
+    __tablename__ = "animal_daily_stats"
+
+    animal_id: Mapped[int] = mapped_column(
+        BigInteger, ForeignKey("animals.id", ondelete="CASCADE"), primary_key=True
+    )
+    day: Mapped[date] = mapped_column(Date, primary_key=True)  # день по UTC
+    notes_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    weight_min: Mapped[Optional[float]] = mapped_column(Numeric(asdecimal=False), nullable=True)
+    weight_max: Mapped[Optional[float]] = mapped_column(Numeric(asdecimal=False), nullable=True)
+    weight_sum: Mapped[float] = mapped_column(Numeric(asdecimal=False), nullable=False, default=0)
+    weight_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    temperature_min: Mapped[Optional[float]] = mapped_column(Numeric(asdecimal=False), nullable=True)
+    temperature_max: Mapped[Optional[float]] = mapped_column(Numeric(asdecimal=False), nullable=True)
+    temperature_sum: Mapped[float] = mapped_column(Numeric(asdecimal=False), nullable=False, default=0)
+    temperature_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+    feed_quantity: Mapped[float] = mapped_column(Numeric(asdecimal=False), nullable=False, default=0)
+
+
+# Агрегаты транскрипций по (животное, день UTC) в колонках animal_daily_stats;
+# {source} - таблица транскрипций или подзапрос (пересборка сводок)
+DAILY_STATS_COLUMNS = (
+    "animal_id, day, notes_count, weight_min, weight_max, weight_sum, weight_count, "
+    "temperature_min, temperature_max, temperature_sum, temperature_count, feed_quantity"
+)
+DAILY_STATS_SELECT = """
+    SELECT animal_id, (created_at AT TIME ZONE 'UTC')::date, count(*),
+           min(weight_kg), max(weight_kg), coalesce(sum(weight_kg), 0), count(weight_kg),
+           min(temperature_c), max(temperature_c), coalesce(sum(temperature_c), 0), count(temperature_c),
+           coalesce(sum(feed_quantity), 0)
+    FROM {source}
+    GROUP BY 1, 2
+"""
@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import date, datetime
 from enum import Enum
 from typing import Any, Dict, List, Optional, TypeVar
 
@@ -631,7 +631,10 @@ class AnimalTranscriptionSchema(BaseSchema):
     animal_id: int
     behavior_state: Optional[str] = None  # Поведение/состояние с историей
     measurements: Optional[Dict[str, Any]] = None  # Измерения (вес, температура и т.д.)
+    weight_kg: Optional[float] = None  # Вес числом из measurements (вычисляется БД)
+    temperature_c: Optional[float] = None  # Температура числом из measurements (вычисляется БД)
     feeding_details: Optional[Dict[str, Any]] = None  # Детали кормления
+    feed_quantity: Optional[float] = None  # Количество корма числом из feeding_details (вычисляется БД)
     relationships: Optional[Dict[str, Any]] = None  # Взаимоотношения с другими животными
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
@@ -657,3 +660,19 @@ class AnimalTranscriptionUpdate(BaseSchema):
 # Схема животного с транскрипциями
 class AnimalWithTranscriptionsSchema(AnimalSchema):
     transcriptions: List[AnimalTranscriptionSchema] = []
+
+
+# Дневная сводка по животному (средние - из сумм и количеств в animal_daily_stats)
+class AnimalDailyStatsSchema(BaseSchema):
+    animal_id: int
+    day: date
+    notes_count: int
+    weight_min: Optional[float] = None
+    weight_max: Optional[float] = None
+    weight_avg: Optional[float] = None
+    temperature_min: Optional[float] = None
+    temperature_max: Optional[float] = None
+    temperature_avg: Optional[float] = None
+    feed_quantity: float = 0
+
+    model_config = ConfigDict(from_attributes=True)
@@ -47,4 +47,40 @@ class DatabaseConfig(BaseSettings):
     POSTGRES_HOST: str = Field(default="localhost")
     POSTGRES_PORT: int = Field(default=5437)
     POSTGRES_DB: str = Field(default="postgres")
+
+    # Пул соединений async-движка (на воркер)
+    POSTGRES_POOL_SIZE: int = Field(default=10)
+    POSTGRES_MAX_OVERFLOW: int = Field(default=10)
+    POSTGRES_POOL_TIMEOUT: float = Field(default=30.0)  # ожидание свободного соединения, сек
+    POSTGRES_POOL_RECYCLE: int = Field(default=1800)    # пересоздавать соединения старше, сек (-1 - никогда)
+    POSTGRES_POOL_PRE_PING: bool = Field(default=True)
+    # Кэш подготовленных выражений asyncpg на соединение
+    POSTGRES_STATEMENT_CACHE_SIZE: int = Field(default=100)
+    # Подключение через PgBouncer в режиме transaction pooling: без кэша подготовленных выражений
+    POSTGRES_PGBOUNCER_MODE: bool = Field(default=False)
+
+    # Реплики для read-only UnitOfWork: "host1:5432,host2:5432" (пусто - всё читается с primary)
+    POSTGRES_REPLICA_HOSTS: str = Field(default="")
+    POSTGRES_REPLICA_HEALTH_CHECK_INTERVAL: float = Field(default=5.0)
+    POSTGRES_REPLICA_HEALTH_CHECK_TIMEOUT: float = Field(default=1.0)
+    POSTGRES_REPLICA_MAX_LAG_SECONDS: float = Field(default=0.0)  # 0 - лаг не проверяется
+    # Сколько секунд после коммита клиент читает с primary (0 - выключено)
+    POSTGRES_READ_YOUR_WRITES_SECONDS: float = Field(default=5.0)
+    # Чтения в GET-эндпоинтах без ORM-сессии: AUTOCOMMIT-соединение и строки таблиц
+    POSTGRES_LIGHTWEIGHT_READS: bool = Field(default=True)
+    # Применять миграции Alembic при старте, если схема отстала (False - только проверка версии,
+    # миграции запускаются отдельно: alembic upgrade head)
+    POSTGRES_MIGRATE_ON_STARTUP: bool = Field(default=True)
+    # Схему без alembic_version (create_all до миграций) удалить и создать миграциями заново
+    # (dev only: данные теряются; False - воркер не стартует, см. README)
+    POSTGRES_RESET_UNVERSIONED_SCHEMA: bool = Field(default=False)
+    # Месячные партиции animal_transcriptions: на сколько месяцев вперёд создавать,
+    # как часто проверять (сек) и сколько ждать блокировку таблицы при DDL (сек)
+    POSTGRES_PARTITION_MONTHS_AHEAD: int = Field(default=3)
+    POSTGRES_PARTITION_MAINTENANCE_INTERVAL: float = Field(default=6 * 3600.0)
+    POSTGRES_PARTITION_LOCK_TIMEOUT: float = Field(default=2.0)
+    # Лог медленных запросов: порог в секундах (0 - выключен) и доля логируемых из них;
+    # время всех запросов - в гистограмме db_query_seconds
+    POSTGRES_SLOW_QUERY_SECONDS: float = Field(default=0.5)
+    POSTGRES_SLOW_QUERY_SAMPLE_RATE: float = Field(default=1.0)
     model_config = SettingsConfigDict(env_file=Path(__file__).parent.parent.joinpath(".env"), extra="ignore")
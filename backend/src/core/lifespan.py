@@ -1,9 +1,13 @@
 from contextlib import asynccontextmanager
+import asyncio
+import importlib
 import logging
 
-from db.postgres.postgres_client import Base, sync_engine
+from db.postgres.partitions import ensure_upcoming_partitions, partition_maintenance
+from db.postgres.migrations import ensure_schema_current
+from db.postgres.postgres_client import settings
 from core.containers import setup_containers
-from sqlalchemy import text
+from v1.animals.config import AnimalsServiceConfig
 import common_models  # noqa: F401  # Ensure models are imported so mappers are configured
 
 logging.basicConfig(level=logging.INFO)
@@ -13,22 +17,38 @@ logger = logging.getLogger(__name__)
 def initialize_containers():
     setup_containers()  # Настройка всех контейнеров
 
+
+def _preload_inference():
+    """Импорт ML-стека и загрузка ASR-модели вне обработки запроса"""
+    try:
+        inference = importlib.import_module("v1.animals.inference")
+        inference.preload_asr_backends()
+        logger.info("Inference stack preloaded")
+    except Exception as e:
+        logger.warning(f"Failed to preload inference stack: {e}")
+
 @asynccontextmanager
 async def lifespan(app):
     # Инициализация контейнеров, если ещё не выполнена
     initialize_containers()
 
-    # Полное каскадное удаление схемы и пересоздание (dev only)
-    try:
-        with sync_engine.connect() as conn:
-            conn.execution_options(isolation_level="AUTOCOMMIT").execute(
-                text("DROP SCHEMA IF EXISTS public CASCADE")
-            )
-            conn.execute(text("CREATE SCHEMA IF NOT EXISTS public"))
-    except Exception as e:
-        logger.warning(f"Failed to drop schema with CASCADE: {e}")
+    # Схема - миграциями Alembic; если она актуальна, старт без DDL
+    await ensure_schema_current(
+        migrate=settings.POSTGRES_MIGRATE_ON_STARTUP,
+        reset_unversioned=settings.POSTGRES_RESET_UNVERSIONED_SCHEMA,
+    )
 
-    Base.metadata.create_all(bind=sync_engine)
+    # Партиции транскрипций на текущий и следующие месяцы, дальше - фоновая задача
+    await ensure_upcoming_partitions(
+        settings.POSTGRES_PARTITION_MONTHS_AHEAD, settings.POSTGRES_PARTITION_LOCK_TIMEOUT
+    )
+    partition_task = asyncio.create_task(
+        partition_maintenance(
+            settings.POSTGRES_PARTITION_MAINTENANCE_INTERVAL,
+            settings.POSTGRES_PARTITION_MONTHS_AHEAD,
+            settings.POSTGRES_PARTITION_LOCK_TIMEOUT,
+        )
+    )
 
     try:
         # Запускаем task scheduler с обработкой ошибок
@@ -36,13 +56,10 @@ async def lifespan(app):
     except Exception as e:
         logger.error(f"Failed to start task scheduler: {e}")
 
-    print("start backend")
-    
-    try:
-        connection = sync_engine.connect()
-        print("База данных подключена!")
-        connection.close()
-    except Exception as e:
-        print(f"Ошибка подключения: {e}")
+    if AnimalsServiceConfig().PRELOAD_INFERENCE:
+        # Прогреваем в пуле потоков, не блокируя старт воркера
+        asyncio.get_running_loop().run_in_executor(None, _preload_inference)
 
     yield
+
+    partition_task.cancel()
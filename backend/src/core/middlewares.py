@@ -4,6 +4,8 @@ from fastapi.middleware.gzip import GZipMiddleware
 import time
 import logging
 
+from db.postgres.replicas import read_your_writes_key
+
 logger = logging.getLogger(__name__)
 
 
@@ -21,6 +23,17 @@ def setup_middlewares(app: FastAPI):
     # Gzip middleware для сжатия ответов
     app.add_middleware(GZipMiddleware, minimum_size=1000)
     
+    # Ключ клиента для read-your-writes: токен, а без него - IP
+    @app.middleware("http")
+    async def bind_read_your_writes_key(request, call_next):
+        authorization = request.headers.get("authorization")
+        client_host = request.client.host if request.client else None
+        token = read_your_writes_key.set(authorization or client_host)
+        try:
+            return await call_next(request)
+        finally:
+            read_your_writes_key.reset(token)
+
     # Middleware для логирования запросов
     @app.middleware("http")
     async def log_requests(request, call_next):
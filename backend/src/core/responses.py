@@ -0,0 +1,56 @@
+from decimal import Decimal
+from typing import Any, Optional
+
+import orjson
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+# Быстрый путь ответа в конверте {exception, data, message}: модель ответа
+# валидируется один раз при создании в сервисе, дальше orjson сериализует её
+# сразу в байты. В отличие от ResponseSchema(data=model.model_dump()) нет
+# промежуточных dict, повторной валидации по response_model и jsonable_encoder.
+# Формат дат как у pydantic: UTC с суффиксом Z.
+
+
+def _default(value: Any) -> Any:
+    """Типы, которых orjson не знает: pydantic-модели и Decimal"""
+    if isinstance(value, BaseModel):
+        if type(value).model_computed_fields:
+            return value.model_dump()
+        # Поля модели как есть: вложенные JSONB-словари не копируются
+        return value.__dict__
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z)
+
+
+class EnvelopeResponse(Response):
+    """
+    JSON-ответ {"exception": ..., "data": ..., "message": ...}
+
+    data - pydantic-модель ответа (без model_dump) или обычные JSON-значения.
+    Модели сериализуются по полям: alias, field_serializer и exclude не
+    применяются, поэтому для моделей с ними нужен model_dump().
+    FastAPI не валидирует Response повторно, response_model остаётся для OpenAPI.
+    """
+
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        data: Any = None,
+        message: Optional[str] = None,
+        exception: int = 0,
+        status_code: int = 200,
+        **kwargs: Any,
+    ) -> None:
+        super().__init__(
+            content={"exception": exception, "data": data, "message": message}, status_code=status_code, **kwargs
+        )
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
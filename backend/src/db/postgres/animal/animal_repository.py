@@ -1,56 +1,88 @@
-from typing import List, Optional
-from sqlalchemy import select
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy import func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from db.postgres.base import BaseRepository
-from common_models import Animal, AnimalTranscription
+from pagination import KeysetPage, TotalCount, encode_cursor, paginate_keyset
+from common_models import Animal
 from common_schemas import (
     AnimalSchema, 
     AnimalCreate, 
-    AnimalUpdate,
-    AnimalWithTranscriptionsSchema
+    AnimalUpdate
 )
 
 
 class AnimalRepository(BaseRepository[AnimalSchema, Animal]):
     model = Animal
     schema = AnimalSchema
+    unique_violation_detail = "Animal with this name already exists"
 
     def __init__(self, session: AsyncSession) -> None:
         super().__init__(session)
 
-    async def find_all(self, limit: int = 100, offset: int = 0) -> List[AnimalSchema]:
-        """Получить всех животных с пагинацией"""
-        query = select(self.model).limit(limit).offset(offset)
-        result = await self._session.execute(query)
-        animals = result.scalars().all()
-        return [self.schema.model_validate(animal, from_attributes=True) for animal in animals]
+    def _type_filters(self, animal_type: Optional[str]) -> tuple:
+        return (self.model.animal == animal_type,) if animal_type else ()
 
-    async def find_by_animal_type(self, animal_type: str) -> List[AnimalSchema]:
-        """Найти животных по типу"""
-        query = select(self.model).where(self.model.animal == animal_type)
-        result = await self._session.execute(query)
-        animals = result.scalars().all()
-        return [self.schema.model_validate(animal, from_attributes=True) for animal in animals]
-
-    async def find_with_transcriptions(self, animal_id: int) -> Optional[AnimalWithTranscriptionsSchema]:
-        """Получить животное с его транскрипциями"""
-        query = select(self.model).options(
-            selectinload(self.model.transcriptions)
-        ).where(self.model.id == animal_id)
-        
+    async def find_all(
+        self, limit: int = 100, offset: int = 0, animal_type: Optional[str] = None, mappings: bool = False
+    ) -> List[AnimalSchema]:
+        """Получить всех животных с пагинацией (опционально - только указанного типа)"""
+        query = (
+            self._select(mappings=mappings)
+            .where(*self._type_filters(animal_type))
+            .order_by(self.model.id)
+            .limit(limit)
+            .offset(offset)
+        )
         result = await self._session.execute(query)
-        animal = result.scalars().first()
-        
-        if not animal:
-            return None
-            
-        return AnimalWithTranscriptionsSchema.model_validate(animal, from_attributes=True)
-
-    async def search_by_name(self, name_pattern: str) -> List[AnimalSchema]:
-        """Поиск животных по имени (частичное совпадение)"""
-        query = select(self.model).where(self.model.name.ilike(f"%{name_pattern}%"))
+        return self._page_items(result.all(), mappings)
+
+    async def find_page_by_animal_type(
+        self,
+        animal_type: Optional[str] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+        mappings: bool = False,
+    ) -> Tuple[KeysetPage[AnimalSchema], TotalCount]:
+        """Страница животных по курсору с общим количеством (опционально - только указанного типа)"""
+        return await self.find_page_counted(cursor, limit, self._type_filters(animal_type), mappings)
+
+    async def count_by_animal_type(self, animal_type: Optional[str] = None) -> TotalCount:
+        """Количество животных (опционально - только указанного типа)"""
+        return await self.count(self._type_filters(animal_type))
+
+    async def count_by_animal_types(self) -> Dict[str, int]:
+        """Количество животных каждого типа (index-only scan по (animal, id))"""
+        query = select(self.model.animal, func.count()).group_by(self.model.animal)
         result = await self._session.execute(query)
-        animals = result.scalars().all()
-        return [self.schema.model_validate(animal, from_attributes=True) for animal in animals]
+        return {animal_type: count for animal_type, count in result.all()}
+
+    async def search_ranked_by_name(
+        self, query_text: str, cursor: Optional[str] = None, limit: int = 50, mappings: bool = False
+    ) -> KeysetPage[AnimalSchema]:
+        """
+        Поиск по имени с ранжированием по триграммной похожести
+
+        Находит имена, содержащие строку (ILIKE), и похожие на неё (оператор %),
+        оба условия обслуживаются GIN-индексом ix_animals_name_trgm.
+        Сортировка по (похожесть, id) по убыванию, курсор хранит оба значения.
+        """
+        escaped = query_text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        score = func.similarity(self.model.name, query_text)
+        query = self._select(score.label("score"), mappings=mappings).where(
+            or_(
+                self.model.name.ilike(f"%{escaped}%", escape="\\"),
+                self.model.name.op("%")(query_text),
+            )
+        )
+        query = paginate_keyset(query, [score, self.model.id], cursor, limit, descending=True)
+        rows = (await self._session.execute(query)).all()
+
+        items = self._page_items(rows[:limit], mappings)
+        next_cursor = None
+        if len(rows) > limit:
+            last = rows[limit - 1]
+            next_cursor = encode_cursor([last.score, last.id if mappings else self._entity(last).id])
+        # RowMapping-строки не валидируются схемой: страница без параметра типа
+        page_type = KeysetPage if mappings else KeysetPage[AnimalSchema]
+        return page_type(items=items, next_cursor=next_cursor)
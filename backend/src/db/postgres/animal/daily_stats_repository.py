@@ -0,0 +1,93 @@
+from datetime import date, datetime, time, timezone
+from typing import List, Optional
+
+from sqlalchemy import and_, delete, func, or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from db.postgres.base import BaseRepository
+from db.postgres.partitions import attached_partitions
+from common_models import DAILY_STATS_COLUMNS, DAILY_STATS_SELECT, AnimalDailyStats, AnimalTranscription
+from common_schemas import AnimalDailyStatsSchema
+
+
+class AnimalDailyStatsRepository(BaseRepository[AnimalDailyStatsSchema, AnimalDailyStats]):
+    """
+    Дневные сводки по животным
+
+    Вставки транскрипций учитываются триггером animal_transcriptions_daily_stats;
+    изменения и удаления транскрипций - только пересборкой (rebuild). Сводки месяцев,
+    чьи партиции отсоединены в архив, пересборка не трогает.
+    """
+
+    model = AnimalDailyStats
+    schema = AnimalDailyStatsSchema
+
+    def __init__(self, session: AsyncSession) -> None:
+        super().__init__(session)
+
+    def _average(self, total, count):
+        return (total / func.nullif(count, 0)).label(total.key.replace("_sum", "_avg"))
+
+    async def find_range(self, animal_id: int, date_from: date, date_to: date) -> List[AnimalDailyStatsSchema]:
+        """Сводки животного за дни [date_from, date_to] по первичному ключу (animal_id, day)"""
+        query = (
+            select(
+                self.model.animal_id,
+                self.model.day,
+                self.model.notes_count,
+                self.model.weight_min,
+                self.model.weight_max,
+                self._average(self.model.weight_sum, self.model.weight_count),
+                self.model.temperature_min,
+                self.model.temperature_max,
+                self._average(self.model.temperature_sum, self.model.temperature_count),
+                self.model.feed_quantity,
+            )
+            .where(
+                self.model.animal_id == animal_id,
+                self.model.day >= date_from,
+                self.model.day <= date_to,
+            )
+            .order_by(self.model.day)
+        )
+        rows = (await self._session.execute(query)).all()
+        return [self.schema.model_validate(row._mapping) for row in rows]
+
+    async def rebuild(self, animal_id: Optional[int] = None) -> int:
+        """
+        Пересчёт сводок из истории транскрипций (всех или одного животного)
+
+        Пересчитываются только дни подключённых партиций: сводки архивных месяцев
+        остаются как есть. Удаление и вставка в одной транзакции: читатели видят
+        старые сводки до коммита. Возвращает количество записанных дней.
+        """
+        partitions = [
+            partition
+            for partition in (await attached_partitions(self._session)).values()
+            if not partition.detach_pending
+        ]
+        if not partitions:
+            return 0
+
+        # Границы партиций - полночь UTC, день сводки - дата created_at по UTC
+        deletion = delete(self.model).where(
+            or_(*(and_(self.model.day >= p.start, self.model.day < p.end) for p in partitions))
+        )
+        conditions, params = [], {}
+        for index, partition in enumerate(partitions):
+            conditions.append(f"(created_at >= :start_{index} AND created_at < :end_{index})")
+            params[f"start_{index}"] = datetime.combine(partition.start, time(), timezone.utc)
+            params[f"end_{index}"] = datetime.combine(partition.end, time(), timezone.utc)
+        where = f"({' OR '.join(conditions)})"
+        if animal_id is not None:
+            deletion = deletion.where(self.model.animal_id == animal_id)
+            where = f"animal_id = :animal_id AND {where}"
+            params["animal_id"] = animal_id
+        source = f"(SELECT * FROM {AnimalTranscription.__tablename__} WHERE {where}) AS transcriptions"
+
+        await self._session.execute(deletion)
+        result = await self._session.execute(
+            text(f"INSERT INTO {self.model.__tablename__} ({DAILY_STATS_COLUMNS}) {DAILY_STATS_SELECT.format(source=source)}"),
+            params,
+        )
+        return result.rowcount
@@ -1,5 +1,7 @@
 from typing import List, Optional
-from sqlalchemy import select, desc
+
+from pagination import KeysetPage, build_page, paginate_keyset
+from sqlalchemy import delete, desc, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -15,34 +17,110 @@ from common_schemas import (
 class AnimalTranscriptionRepository(BaseRepository[AnimalTranscriptionSchema, AnimalTranscription]):
     model = AnimalTranscription
     schema = AnimalTranscriptionSchema
+    foreign_key_violation_detail = "Animal not found"
+    cursor_keys = ("created_at", "id")
+    cursor_descending = True
+    # Большие JSONB-документы, которые не нужны в кратком списке транскрипций
+    detail_columns = ("measurements", "feeding_details", "relationships")
 
     def __init__(self, session: AsyncSession) -> None:
         super().__init__(session)
 
     async def find_by_animal_id(self, animal_id: int, limit: int = 100, offset: int = 0) -> List[AnimalTranscriptionSchema]:
         """Получить все транскрипции для конкретного животного"""
-        query = select(self.model).where(
+        query = self._select().where(
             self.model.animal_id == animal_id
         ).order_by(desc(self.model.created_at)).limit(limit).offset(offset)
         
         result = await self._session.execute(query)
-        transcriptions = result.scalars().all()
+        transcriptions = self._entities(result)
         return [self.schema.model_validate(transcription, from_attributes=True) for transcription in transcriptions]
 
+    async def delete_by_animal_id(self, animal_id: int) -> int:
+        """Удалить все транскрипции животного; возвращает количество удалённых"""
+        result = await self._session.execute(
+            delete(self.model).where(self.model.animal_id == animal_id).execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+
+    async def find_page_by_animal_id(
+        self, animal_id: int, cursor: Optional[str] = None, limit: int = 50
+    ) -> KeysetPage[AnimalTranscriptionSchema]:
+        """Транскрипции животного от новых к старым, страница по курсору"""
+        return await self.find_page(cursor, limit, filters=(self.model.animal_id == animal_id,))
+
+    async def find_recent_by_animal_id(
+        self, animal_id: int, cursor: Optional[str] = None, limit: int = 20, include_details: bool = True
+    ) -> KeysetPage[AnimalTranscriptionSchema]:
+        """
+        Последние транскрипции животного, страница по курсору
+
+        Без include_details JSONB-колонки (измерения, кормление, взаимоотношения)
+        не выбираются: из БД не читаются и не декодируются большие документы.
+        Курсор совместим с find_page_by_animal_id.
+        """
+        if include_details:
+            return await self.find_page_by_animal_id(animal_id, cursor=cursor, limit=limit)
+
+        columns = [column for column in self.model.__table__.columns if column.name not in self.detail_columns]
+        keys = [getattr(self.model, name) for name in self.cursor_keys]
+        query = paginate_keyset(
+            select(*columns).where(self.model.animal_id == animal_id), keys, cursor, limit, self.cursor_descending
+        )
+        rows = (await self._session.execute(query)).all()
+        return build_page([self.schema.model_validate(row._mapping) for row in rows], self.cursor_keys, limit)
+
     async def find_latest_by_animal_id(self, animal_id: int) -> Optional[AnimalTranscriptionSchema]:
         """Получить последнюю транскрипцию для животного"""
-        query = select(self.model).where(
+        query = self._select().where(
             self.model.animal_id == animal_id
         ).order_by(desc(self.model.created_at)).limit(1)
         
         result = await self._session.execute(query)
-        transcription = result.scalars().first()
+        transcription = self._one_or_none(result)
         
         if not transcription:
             return None
             
         return self.schema.model_validate(transcription, from_attributes=True)
 
+    async def find_by_weight_range(
+        self,
+        min_kg: Optional[float] = None,
+        max_kg: Optional[float] = None,
+        animal_id: Optional[int] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+    ) -> KeysetPage[AnimalTranscriptionSchema]:
+        """Транскрипции с весом в диапазоне [min_kg, max_kg], от новых к старым"""
+        return await self.find_page(
+            cursor, limit, filters=self._range_filters(self.model.weight_kg, min_kg, max_kg, animal_id)
+        )
+
+    async def find_by_temperature_range(
+        self,
+        min_c: Optional[float] = None,
+        max_c: Optional[float] = None,
+        animal_id: Optional[int] = None,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+    ) -> KeysetPage[AnimalTranscriptionSchema]:
+        """Транскрипции с температурой в диапазоне [min_c, max_c], от новых к старым"""
+        return await self.find_page(
+            cursor, limit, filters=self._range_filters(self.model.temperature_c, min_c, max_c, animal_id)
+        )
+
+    def _range_filters(self, column, low: Optional[float], high: Optional[float], animal_id: Optional[int]) -> tuple:
+        # IS NOT NULL совпадает с условием частичных индексов ix_animal_transcriptions_weight_kg/temperature_c
+        filters = [column.is_not(None)]
+        if low is not None:
+            filters.append(column >= low)
+        if high is not None:
+            filters.append(column <= high)
+        if animal_id is not None:
+            filters.append(self.model.animal_id == animal_id)
+        return tuple(filters)
+
     async def find_by_behavior_state(self, behavior_state: str) -> List[AnimalTranscriptionSchema]:
         """Найти транскрипции по состоянию поведения"""
         query = select(self.model).where(
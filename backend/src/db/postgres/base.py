@@ -1,25 +1,114 @@
+import json
 from abc import ABC
-from typing import Generic, Optional, Type
+from typing import Any, Generic, List, Optional, Sequence, Tuple, Type, Union
 
-from sqlalchemy import insert, select, update
+from sqlalchemy import Result, Select, bindparam, delete, func, insert, select, text, update
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.exc import IntegrityError, NoResultFound
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
 
-from exceptions import DBException, DoesNotExist
+from exceptions import AlreadyExists, DBException, DoesNotExist
 from common_models import Model
 from common_schemas import Schema
+from pagination import KeysetPage, TotalCount, build_page, paginate_keyset
+from db.postgres.tracing import trace_methods
 
 import logging
 logging.basicConfig()
-logging.getLogger("sqlalchemy.engine").setLevel(logging.INFO)
+
+UNIQUE_VIOLATION = "23505"
+FOREIGN_KEY_VIOLATION = "23503"
+
+
+def _copy_value(column, values: dict) -> Any:
+    """Значение колонки для COPY: Python-умолчание, если поле не задано; JSON - строкой"""
+    value = values.get(column.name)
+    if value is None and column.default is not None:
+        value = column.default.arg(None) if column.default.is_callable else column.default.arg
+    if value is not None and isinstance(column.type, postgresql.JSONB):
+        value = json.dumps(value, ensure_ascii=False)
+    return value
+
+
+def _sqlstate(error: IntegrityError) -> Optional[str]:
+    """SQLSTATE нарушения ограничения (asyncpg и psycopg2)"""
+    orig = error.orig
+    return (
+        getattr(orig, "pgcode", None)
+        or getattr(orig, "sqlstate", None)
+        or getattr(getattr(orig, "__cause__", None), "sqlstate", None)
+    )
+
+
+class Explain(Executable, ClauseElement):
+    """EXPLAIN (FORMAT JSON) над выражением: значения фильтров остаются bind-параметрами"""
+
+    inherit_cache = False
+
+    def __init__(self, statement: Select) -> None:
+        self.statement = statement
+
+
+@compiles(Explain)
+def _compile_explain(element: Explain, compiler, **kw) -> str:
+    return f"EXPLAIN (FORMAT JSON) {compiler.process(element.statement, **kw)}"
 
 
 class BaseRepository(Generic[Schema, Model], ABC):
     model: Type[Model]
     schema: Type[Schema]
+    # Уникальный ключ сортировки для keyset-пагинации
+    cursor_keys: Tuple[str, ...] = ("id",)
+    cursor_descending: bool = False
+    # До этого размера таблицы (по статистике планировщика) total считается точным COUNT(*)
+    exact_count_threshold: int = 100_000
+
+    # Размер пачки для insert_many/upsert_many/update_many и порог перехода на COPY
+    bulk_batch_size: int = 1000
+    copy_threshold: int = 50_000
+    # Ответы на нарушения ограничений в insert_returning/update_returning
+    unique_violation_detail: str = "Object already exists"
+    foreign_key_violation_detail: str = "Referenced object does not exist"
 
-    def __init__(self, session: AsyncSession) -> None:
+    def __init_subclass__(cls, **kwargs) -> None:
+        super().__init_subclass__(**kwargs)
+        # Запросы публичных методов попадают в метрики под именем "Repository.method"
+        trace_methods(cls)
+
+    def __init__(self, session: Union[AsyncSession, AsyncConnection]) -> None:
         self._session = session
+        # На голом соединении (ReadOnlyUnitOfWork) чтения идут через Core:
+        # строки таблицы без ORM-объектов и identity map
+        self._orm = isinstance(session, AsyncSession)
+
+    def _select(self, *extra_columns, mappings: bool = False) -> Select:
+        """
+        SELECT сущности: ORM-объект в сессии или колонки таблицы на соединении
+
+        mappings - колонки таблицы в любом режиме: для списков, которые сервис
+        превращает в ответы сам, без ORM-объектов и схем на каждую строку.
+        """
+        if self._orm and not mappings:
+            return select(self.model, *extra_columns)
+        return select(*self.model.__table__.columns, *extra_columns)
+
+    def _page_items(self, rows: Sequence[Any], mappings: bool) -> List[Any]:
+        """Строки результата _select: RowMapping (mappings) или провалидированные схемы"""
+        if mappings:
+            return [row._mapping for row in rows]
+        return [self.schema.model_validate(self._entity(row), from_attributes=True) for row in rows]
+
+    def _entity(self, row: Any) -> Any:
+        """Сущность из строки результата _select (с дополнительными колонками)"""
+        return row[0] if self._orm else row
+
+    def _entities(self, result: Result) -> List[Any]:
+        return result.scalars().all() if self._orm else result.all()
+
+    def _one_or_none(self, result: Result) -> Any:
+        return (result.scalars() if self._orm else result).one_or_none()
 
     async def insert_one(self, obj: Schema) -> int:
         try:
@@ -33,6 +122,189 @@ class BaseRepository(Generic[Schema, Model], ABC):
         inserted_id = insertion_result.scalar()
         return int(inserted_id)
 
+    def _raise_constraint_violation(self, error: IntegrityError) -> None:
+        sqlstate = _sqlstate(error)
+        if sqlstate == UNIQUE_VIOLATION:
+            raise AlreadyExists(self.unique_violation_detail)
+        if sqlstate == FOREIGN_KEY_VIOLATION:
+            raise DoesNotExist(self.foreign_key_violation_detail)
+        raise DBException("Error while writing object to database")
+
+    async def insert_returning(self, obj: Schema) -> Schema:
+        """
+        INSERT ... RETURNING * одним запросом
+
+        Уникальность и ссылки проверяет БД: нарушение unique - AlreadyExists,
+        foreign key - DoesNotExist, без предварительных SELECT.
+        """
+        try:
+            insertion_result = await self._session.execute(
+                insert(self.model).values(obj.model_dump()).returning(*self.model.__table__.columns)
+            )
+        except IntegrityError as e:
+            self._raise_constraint_violation(e)
+        return self.schema.model_validate(insertion_result.one(), from_attributes=True)
+
+    async def update_returning(
+        self, obj_id: int, values: dict, previous_columns: Sequence[str] = ()
+    ) -> Optional[Tuple[Schema, dict]]:
+        """
+        UPDATE ... RETURNING * одним запросом; None, если записи нет
+
+        previous_columns - колонки, значения которых нужны до изменения: строка
+        блокируется в CTE (FOR UPDATE), и старые значения возвращаются тем же запросом.
+        """
+        old = (
+            select(self.model.id, *(getattr(self.model, name).label(f"previous_{name}") for name in previous_columns))
+            .where(self.model.id == obj_id)
+            .with_for_update()
+            .cte("previous")
+        )
+        statement = (
+            update(self.model)
+            .where(self.model.id == old.c.id)
+            .values(values)
+            .returning(*self.model.__table__.columns, *(old.c[f"previous_{name}"] for name in previous_columns))
+            .execution_options(synchronize_session=False)
+        )
+        try:
+            update_result = await self._session.execute(statement)
+        except IntegrityError as e:
+            self._raise_constraint_violation(e)
+        row = update_result.one_or_none()
+        if row is None:
+            return None
+        previous = {name: row._mapping[f"previous_{name}"] for name in previous_columns}
+        return self.schema.model_validate(row, from_attributes=True), previous
+
+    def _batches(self, rows: Sequence[Any], batch_size: Optional[int]) -> List[Sequence[Any]]:
+        size = batch_size or self.bulk_batch_size
+        return [rows[start:start + size] for start in range(0, len(rows), size)]
+
+    async def insert_many(
+        self, objs: Sequence[Schema], batch_size: Optional[int] = None, use_copy: Optional[bool] = None
+    ) -> List[int]:
+        """
+        Массовая вставка; возвращает id в порядке objs
+
+        Пачки по batch_size строк уходят одним multi-row INSERT ... VALUES ... RETURNING
+        (insertmanyvalues с sort_by_parameter_order гарантирует порядок id).
+        Начиная с copy_threshold строк (или при use_copy=True) используется COPY.
+        """
+        if not objs:
+            return []
+        if use_copy is None:
+            use_copy = len(objs) >= self.copy_threshold
+        if use_copy:
+            return await self.copy_many(objs)
+
+        statement = insert(self.model.__table__).returning(self.model.id, sort_by_parameter_order=True)
+        ids: List[int] = []
+        for batch in self._batches(objs, batch_size):
+            try:
+                insertion_result = await self._session.execute(statement, [obj.model_dump() for obj in batch])
+            except IntegrityError as e:
+                self._raise_constraint_violation(e)
+            ids.extend(insertion_result.scalars().all())
+        return ids
+
+    async def upsert_many(
+        self,
+        objs: Sequence[Schema],
+        conflict_target: Sequence[Any],
+        update_columns: Optional[Sequence[str]] = None,
+        batch_size: Optional[int] = None,
+    ) -> List[int]:
+        """
+        Массовый INSERT ... ON CONFLICT DO UPDATE; id вставленных и обновлённых строк в порядке objs
+
+        conflict_target - колонки или выражения уникального индекса, например
+        [func.lower(Animal.name)]; update_columns по умолчанию - все переданные поля.
+        """
+        if not objs:
+            return []
+        dumps = [obj.model_dump() for obj in objs]
+        columns = update_columns or [name for name in dumps[0] if name not in ("id", "created_at")]
+        statement = postgresql.insert(self.model.__table__)
+        set_ = {name: statement.excluded[name] for name in columns}
+        if "updated_at" in self.model.__table__.c and "updated_at" not in set_:
+            set_["updated_at"] = func.now()
+        statement = statement.on_conflict_do_update(index_elements=conflict_target, set_=set_).returning(
+            self.model.id, sort_by_parameter_order=True
+        )
+
+        ids: List[int] = []
+        for batch in self._batches(dumps, batch_size):
+            try:
+                upsert_result = await self._session.execute(statement, list(batch))
+            except IntegrityError as e:
+                self._raise_constraint_violation(e)
+            ids.extend(upsert_result.scalars().all())
+        return ids
+
+    async def update_many(self, values: Sequence[dict], batch_size: Optional[int] = None) -> int:
+        """
+        Массовое обновление по id (executemany); возвращает число обновлённых строк
+
+        Каждый элемент values - {"id": ..., "колонка": значение, ...} с одинаковым набором ключей.
+        """
+        if not values:
+            return 0
+        table = self.model.__table__
+        columns = [name for name in values[0] if name != "id"]
+        statement = (
+            update(table)
+            .where(table.c.id == bindparam("_id"))
+            .values({name: bindparam(f"_{name}") for name in columns})
+        )
+        if "updated_at" in table.c and "updated_at" not in columns:
+            statement = statement.values(updated_at=func.now())
+
+        updated = 0
+        for batch in self._batches(values, batch_size):
+            params = [{"_id": row["id"], **{f"_{name}": row[name] for name in columns}} for row in batch]
+            try:
+                update_result = await self._session.execute(statement, params)
+            except IntegrityError as e:
+                self._raise_constraint_violation(e)
+            updated += update_result.rowcount
+        return updated
+
+    async def copy_many(self, objs: Sequence[Schema]) -> List[int]:
+        """
+        Вставка через COPY (asyncpg copy_records_to_table) для очень больших пачек
+
+        COPY не умеет RETURNING, поэтому id заранее берутся из последовательности
+        таблицы (один запрос) и передаются явно - порядок совпадает с objs.
+        Python-умолчания колонок (created_at и т.п.) заполняются здесь же.
+        """
+        if not objs:
+            return []
+        table = self.model.__table__
+        id_result = await self._session.execute(
+            text("SELECT nextval(pg_get_serial_sequence(:table, 'id')) FROM generate_series(1, :count) ORDER BY 1"),
+            {"table": table.name, "count": len(objs)},
+        )
+        ids = list(id_result.scalars().all())
+
+        columns = [column for column in table.columns if column.computed is None]
+        records = []
+        for obj_id, obj in zip(ids, objs):
+            dump = obj.model_dump()
+            dump["id"] = obj_id
+            records.append(tuple(_copy_value(column, dump) for column in columns))
+
+        connection = await self._session.connection() if self._orm else self._session
+        raw_connection = await connection.get_raw_connection()
+        try:
+            await raw_connection.driver_connection.copy_records_to_table(
+                table.name, records=records, columns=[column.name for column in columns]
+            )
+        except Exception as e:
+            logging.error(f"Error copying rows into {table.name}: {e}")
+            raise DBException("Error while copying objects to database")
+        return ids
+
     async def update_by_id(self, obj_id: int, obj: Schema) -> Schema:
         try:
             obj_dump = obj.model_dump()
@@ -49,19 +321,110 @@ class BaseRepository(Generic[Schema, Model], ABC):
         return self.schema.model_validate(updated_obj, from_attributes=True)
 
     async def find_by_id(self, obj_id: int) -> Optional[Schema]:
-        query_result = await self._session.execute(select(self.model).where(self.model.id == obj_id))
-        try:
-            obj = query_result.scalars().one()
-        except NoResultFound:
+        query_result = await self._session.execute(self._select().where(self.model.id == obj_id))
+        obj = self._one_or_none(query_result)
+        if obj is None:
             return None
         return self.schema.model_validate(obj, from_attributes=True)
 
+    async def find_page(
+        self, cursor: Optional[str] = None, limit: int = 50, filters: Sequence = (), mappings: bool = False
+    ) -> KeysetPage[Schema]:
+        """Страница записей по курсору (keyset-пагинация по cursor_keys); mappings - см. _select"""
+        keys = [getattr(self.model, name) for name in self.cursor_keys]
+        query = paginate_keyset(
+            self._select(mappings=mappings).where(*filters), keys, cursor, limit, self.cursor_descending
+        )
+        query_result = await self._session.execute(query)
+        rows = self._page_items(query_result.all(), mappings)
+        return build_page(rows, self.cursor_keys, limit)
+
+    async def find_page_counted(
+        self, cursor: Optional[str] = None, limit: int = 50, filters: Sequence = (), mappings: bool = False
+    ) -> Tuple[KeysetPage[Schema], TotalCount]:
+        """
+        Страница по курсору вместе с общим количеством записей
+
+        Количество выбирается как в count(). Если с фильтрами выборка небольшая,
+        на первой странице оно считается COUNT(*) OVER() в том же запросе, что и страница.
+        """
+        if not filters or cursor:
+            page = await self.find_page(cursor, limit, filters, mappings)
+            return page, await self.count(filters)
+
+        estimate = await self.estimate_count(filters)
+        if estimate >= self.exact_count_threshold:
+            page = await self.find_page(cursor, limit, filters, mappings)
+            return page, TotalCount(value=estimate, exact=False)
+
+        keys = [getattr(self.model, name) for name in self.cursor_keys]
+        query = paginate_keyset(
+            self._select(func.count().over().label("total"), mappings=mappings).where(*filters),
+            keys, None, limit, self.cursor_descending,
+        )
+        query_result = (await self._session.execute(query)).all()
+        total = query_result[0].total if query_result else 0
+        return build_page(self._page_items(query_result, mappings), self.cursor_keys, limit), TotalCount(value=total)
+
+    async def estimate_count(self, filters: Sequence = ()) -> int:
+        """
+        Оценка числа строк по статистике планировщика, -1 если статистики нет
+
+        Без фильтров - pg_class.reltuples (с учётом партиций), с фильтрами -
+        число строк из EXPLAIN: запрос только планируется, но не выполняется.
+        """
+        if filters:
+            query_result = await self._session.execute(Explain(select(self.model.id).where(*filters)))
+            plan = query_result.scalar_one()
+            if isinstance(plan, str):
+                plan = json.loads(plan)
+            return int(plan[0]["Plan"]["Plan Rows"])
+
+        query_result = await self._session.execute(
+            text(
+                """
+                SELECT coalesce(sum(c.reltuples) FILTER (WHERE c.reltuples >= 0), -1)::bigint
+                FROM pg_class c
+                LEFT JOIN pg_inherits i ON i.inhrelid = c.oid
+                WHERE c.oid = CAST(:table AS regclass) OR i.inhparent = CAST(:table AS regclass)
+                """
+            ),
+            {"table": self.model.__tablename__},
+        )
+        return int(query_result.scalar_one())
+
+    async def count(self, filters: Sequence = ()) -> TotalCount:
+        """
+        Количество записей с выбором стратегии
+
+        Если по оценке планировщика записей меньше exact_count_threshold - точный
+        COUNT(*), иначе - сама оценка (exact=False).
+        """
+        estimate = await self.estimate_count(filters)
+        if estimate >= self.exact_count_threshold:
+            return TotalCount(value=estimate, exact=False)
+        query_result = await self._session.execute(select(func.count()).select_from(self.model).where(*filters))
+        return TotalCount(value=query_result.scalar_one())
+
     async def delete_by_id(self, obj_id: int) -> Schema:
-        row = await self.find_by_id(obj_id)
+        """DELETE ... RETURNING * одним запросом; записи нет - DoesNotExist"""
+        statement = (
+            delete(self.model)
+            .where(self.model.id == obj_id)
+            .returning(*self.model.__table__.columns)
+            .execution_options(synchronize_session=False)
+        )
+        try:
+            deletion_result = await self._session.execute(statement)
+        except IntegrityError as e:
+            self._raise_constraint_violation(e)
+        row = deletion_result.one_or_none()
         if row is None:
             raise DoesNotExist("Unable to delete row that does not exist")
-        await self._session.execute(update(self.model).where(self.model.id == obj_id).values(is_deleted=True))
-        return row
+        return self.schema.model_validate(row, from_attributes=True)
 
     async def commit(self):
         await self._session.commit()
+
+
+trace_methods(BaseRepository)
@@ -0,0 +1,108 @@
+import asyncio
+import logging
+from pathlib import Path
+from typing import Optional
+
+from sqlalchemy import text
+
+from db.postgres.postgres_client import engine, sync_engine
+
+logger = logging.getLogger(__name__)
+
+# Схема БД управляется миграциями Alembic (backend/alembic). При старте воркер
+# только сверяет версию схемы с head - один SELECT, без DDL. Если схема отстала,
+# миграции применяет первый воркер под advisory lock, остальные ждут его.
+#
+# До миграций схема пересоздавалась create_all при каждом старте: в такой БД таблицы
+# есть, а alembic_version нет, и миграция 0001 упала бы на CREATE TABLE. Такую схему
+# воркер не мигрирует - либо пересоздаёт (POSTGRES_RESET_UNVERSIONED_SCHEMA, dev only),
+# либо не стартует с инструкцией (см. README).
+
+ALEMBIC_INI = Path(__file__).resolve().parents[3] / "alembic.ini"
+MIGRATION_LOCK_KEY = 4_217_406_001  # pg_advisory_xact_lock: одна миграция на кластер воркеров
+# Таблица, по которой распознаётся схема, созданная create_all без Alembic
+LEGACY_SCHEMA_MARKER = "animals"
+
+def _alembic_config():
+    # Alembic импортируется только при старте/миграции, не при импорте приложения
+    from alembic.config import Config
+
+    config = Config(str(ALEMBIC_INI))
+    config.attributes["configure_logger"] = False
+    return config
+
+
+def head_revision() -> str:
+    from alembic.script import ScriptDirectory
+
+    return ScriptDirectory.from_config(_alembic_config()).get_current_head()
+
+
+async def current_revision() -> Optional[str]:
+    """Версия схемы в БД; None - миграции ещё не применялись"""
+    async with engine.connect() as conn:
+        if (await conn.execute(text("SELECT to_regclass('alembic_version')"))).scalar() is None:
+            return None
+        return (await conn.execute(text("SELECT version_num FROM alembic_version"))).scalar_one_or_none()
+
+
+async def has_unversioned_schema() -> bool:
+    """Таблицы приложения есть, а версии схемы нет - схема создана create_all до миграций"""
+    async with engine.connect() as conn:
+        return (
+            await conn.execute(text("SELECT to_regclass(:table)"), {"table": LEGACY_SCHEMA_MARKER})
+        ).scalar() is not None
+
+
+def reset_schema() -> None:
+    """Каскадное удаление и пересоздание схемы public, как при старте до миграций (dev only)"""
+    with sync_engine.begin() as connection:
+        connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        connection.execute(text("DROP SCHEMA IF EXISTS public CASCADE"))
+        connection.execute(text("CREATE SCHEMA public"))
+
+
+def upgrade_to_head() -> None:
+    """alembic upgrade head под advisory lock (синхронно, вызывать в пуле потоков)"""
+    from alembic import command
+
+    config = _alembic_config()
+    with sync_engine.begin() as connection:
+        connection.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+        config.attributes["connection"] = connection
+        command.upgrade(config, "head")
+
+
+async def ensure_schema_current(migrate: bool, reset_unversioned: bool = False) -> None:
+    """
+    Проверка версии схемы при старте
+
+    Схема актуальна - ничего не делается. Отстала: при migrate применяются миграции,
+    иначе старт прерывается (миграции запускаются отдельным шагом деплоя). Схема без
+    версии (create_all до миграций) пересоздаётся при reset_unversioned, иначе старт
+    прерывается.
+    """
+    head = head_revision()
+    current = await current_revision()
+    if current == head:
+        logger.info(f"Database schema is up to date ({head})")
+        return
+
+    if current is None and await has_unversioned_schema():
+        if not reset_unversioned:
+            raise RuntimeError(
+                "Database schema was created without Alembic (no alembic_version table): drop it "
+                "(DROP SCHEMA public CASCADE; CREATE SCHEMA public;) or set "
+                "POSTGRES_RESET_UNVERSIONED_SCHEMA=true to recreate it on startup; if it already "
+                f"matches revision {head}, run `alembic stamp {head}` instead"
+            )
+        logger.warning("Dropping unversioned database schema created before migrations")
+        await asyncio.to_thread(reset_schema)
+
+    if not migrate:
+        raise RuntimeError(
+            f"Database schema is at revision {current}, expected {head}: run `alembic upgrade head`"
+        )
+
+    logger.info(f"Migrating database schema {current} -> {head}")
+    await asyncio.to_thread(upgrade_to_head)
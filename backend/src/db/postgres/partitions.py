@@ -0,0 +1,179 @@
+import asyncio
+import logging
+import re
+from datetime import date, datetime, timezone
+from typing import Dict, List, Optional
+
+from pydantic import BaseModel
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from common_models import AnimalTranscription
+from db.postgres.postgres_client import engine
+
+logger = logging.getLogger(__name__)
+
+# Месячные партиции animal_transcriptions: <таблица>_YYYY_MM с границами
+# [первое число месяца, первое число следующего) по UTC.
+# DDL выполняется с lock_timeout: если таблица занята долгим запросом, попытка
+# откладывается до следующего раза, а не выстраивает за собой очередь запросов.
+
+PARENT_TABLE = AnimalTranscription.__tablename__
+ARCHIVE_SCHEMA = "archive"
+
+PARTITIONS_QUERY = text(
+    "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) AS bound, i.inhdetachpending"
+    " FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid"
+    " WHERE i.inhparent = CAST(:parent AS regclass)"
+)
+_BOUND_RE = re.compile(r"FROM \('(\d{4}-\d{2}-\d{2})[^']*'\) TO \('(\d{4}-\d{2}-\d{2})")
+
+
+class MonthPartition(BaseModel):
+    name: str
+    start: date
+    end: date
+    detach_pending: bool = False
+
+
+def month_start(value: date) -> date:
+    return value.replace(day=1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def month_partition(month: date) -> MonthPartition:
+    start = month_start(month)
+    return MonthPartition(name=f"{PARENT_TABLE}_{start:%Y_%m}", start=start, end=add_months(start, 1))
+
+
+def partitions_between(first: date, last: date) -> List[MonthPartition]:
+    """Партиции всех месяцев от first до last включительно"""
+    partitions, month = [], month_start(first)
+    while month <= last:
+        partitions.append(month_partition(month))
+        month = add_months(month, 1)
+    return partitions
+
+
+def create_partition_sql(partition: MonthPartition) -> str:
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition.name} PARTITION OF {PARENT_TABLE} "
+        f"FOR VALUES FROM ('{partition.start.isoformat()} 00:00:00+00') "
+        f"TO ('{partition.end.isoformat()} 00:00:00+00')"
+    )
+
+
+def _utc_today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+def _lock_timeout_ms(seconds: float) -> int:
+    return max(int(seconds * 1000), 1)
+
+
+async def attached_partitions(conn: AsyncConnection) -> Dict[str, MonthPartition]:
+    """Партиции таблицы с границами (включая незавершённо отсоединяемые)"""
+    partitions = {}
+    for row in (await conn.execute(PARTITIONS_QUERY, {"parent": PARENT_TABLE})).all():
+        match = _BOUND_RE.search(row.bound or "")
+        if match is None:
+            continue  # DEFAULT-партиция или чужая схема границ
+        partitions[row.relname] = MonthPartition(
+            name=row.relname,
+            start=date.fromisoformat(match.group(1)),
+            end=date.fromisoformat(match.group(2)),
+            detach_pending=bool(row.inhdetachpending),
+        )
+    return partitions
+
+
+async def ensure_partitions(first: date, last: date, lock_timeout: float) -> List[str]:
+    """
+    Создаёт недостающие партиции месяцев от first до last
+
+    Существующие не трогаются: если все партиции на месте, DDL не выполняется.
+    Партиция, которую не удалось создать (занята таблица, параллельный воркер),
+    пропускается с предупреждением. Возвращает имена созданных партиций.
+    """
+    created = []
+    async with engine.connect() as conn:
+        existing = await attached_partitions(conn)
+        await conn.commit()
+        for partition in partitions_between(first, last):
+            if partition.name in existing:
+                continue
+            try:
+                async with conn.begin():
+                    await conn.execute(text(f"SET LOCAL lock_timeout = {_lock_timeout_ms(lock_timeout)}"))
+                    await conn.execute(text(create_partition_sql(partition)))
+                created.append(partition.name)
+            except DBAPIError as e:
+                logger.warning(f"Failed to create partition {partition.name}: {e}")
+    if created:
+        logger.info(f"Created partitions: {', '.join(created)}")
+    return created
+
+
+async def ensure_upcoming_partitions(
+    months_ahead: int, lock_timeout: float, today: Optional[date] = None
+) -> List[str]:
+    """Партиции текущего месяца и months_ahead следующих"""
+    current = month_start(today or _utc_today())
+    return await ensure_partitions(current, add_months(current, months_ahead), lock_timeout)
+
+
+async def partition_maintenance(interval: float, months_ahead: int, lock_timeout: float) -> None:
+    """Фоновая задача воркера: раз в interval секунд досоздаёт будущие партиции"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await ensure_upcoming_partitions(months_ahead, lock_timeout)
+        except Exception as e:
+            logger.warning(f"Partition maintenance failed: {e}")
+
+
+async def archive_partitions(older_than_months: int, lock_timeout: float, today: Optional[date] = None) -> List[str]:
+    """
+    Отсоединяет партиции месяцев старше older_than_months и переносит их в схему archive
+
+    DETACH PARTITION CONCURRENTLY не блокирует чтение и запись в таблицу (PostgreSQL 14+);
+    он выполняется вне транзакции, поэтому соединение в AUTOCOMMIT. Если отсоединение
+    прервалось, при следующем запуске оно завершается через FINALIZE.
+    Возвращает имена перенесённых таблиц.
+    """
+    cutoff = add_months(month_start(today or _utc_today()), -older_than_months)
+    archived = []
+    async with engine.connect() as conn:
+        await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text(f"SET lock_timeout = {_lock_timeout_ms(lock_timeout)}"))
+        try:
+            await conn.execute(text(f"CREATE SCHEMA IF NOT EXISTS {ARCHIVE_SCHEMA}"))
+            partitions = sorted((await attached_partitions(conn)).values(), key=lambda p: p.start)
+            for partition in partitions:
+                if partition.end > cutoff:
+                    continue
+                mode = "FINALIZE" if partition.detach_pending else "CONCURRENTLY"
+                await conn.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {partition.name} {mode}"))
+                await conn.execute(text(f"ALTER TABLE {partition.name} SET SCHEMA {ARCHIVE_SCHEMA}"))
+                archived.append(partition.name)
+                logger.info(f"Partition {partition.name} moved to {ARCHIVE_SCHEMA}")
+        finally:
+            await conn.execute(text("RESET lock_timeout"))
+    return archived
+
+
+async def export_archived_partition(name: str, path: str, drop: bool = False) -> int:
+    """Выгрузка отсоединённой партиции в CSV (COPY) и, если drop, удаление таблицы"""
+    async with engine.begin() as conn:
+        raw_connection = await conn.get_raw_connection()
+        status = await raw_connection.driver_connection.copy_from_table(
+            name, schema_name=ARCHIVE_SCHEMA, output=path, format="csv", header=True
+        )
+        if drop:
+            await conn.execute(text(f"DROP TABLE {ARCHIVE_SCHEMA}.{name}"))
+    return int(status.split()[-1]) if status else 0
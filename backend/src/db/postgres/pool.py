@@ -0,0 +1,121 @@
+import time
+import uuid
+from typing import Any, Dict
+from urllib.parse import quote_plus
+
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool
+
+from config import DatabaseConfig
+from core.metrics import REGISTRY
+
+# Телеметрия пула соединений: по ней подбираются POSTGRES_POOL_SIZE и
+# POSTGRES_MAX_OVERFLOW. Пулы различаются по pool_logging_name движка.
+
+POOL_CHECKOUT_SECONDS = REGISTRY.histogram(
+    "db_pool_checkout_seconds",
+    "Time spent waiting for a connection from the pool (including connect and pre-ping)",
+    labelnames=("pool",),
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 30.0),
+)
+POOL_CHECKOUT_TIMEOUTS = REGISTRY.counter(
+    "db_pool_checkout_timeouts_total",
+    "Checkouts that failed after waiting pool_timeout",
+    labelnames=("pool",),
+)
+
+_POOLS: Dict[str, Pool] = {}
+
+
+def _pool_stats(stat: str) -> Dict[tuple, float]:
+    return {(name,): float(getattr(pool, stat)()) for name, pool in list(_POOLS.items())}
+
+
+REGISTRY.gauge(
+    "db_pool_connections_in_use",
+    "Connections currently checked out of the pool",
+    labelnames=("pool",),
+    callback=lambda: _pool_stats("checkedout"),
+)
+REGISTRY.gauge(
+    "db_pool_connections_idle",
+    "Connections idle in the pool",
+    labelnames=("pool",),
+    callback=lambda: _pool_stats("checkedin"),
+)
+REGISTRY.gauge(
+    "db_pool_overflow",
+    "Connections opened above pool_size (negative - pool not yet filled)",
+    labelnames=("pool",),
+    callback=lambda: _pool_stats("overflow"),
+)
+REGISTRY.gauge(
+    "db_pool_size",
+    "Configured pool_size",
+    labelnames=("pool",),
+    callback=lambda: _pool_stats("size"),
+)
+
+
+class InstrumentedPoolMixin:
+    """Замеряет ожидание соединения и регистрирует пул для gauge-метрик"""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        # recreate() (например, при engine.dispose()) создаёт новый пул с тем же именем
+        _POOLS[self.pool_name] = self
+
+    @property
+    def pool_name(self) -> str:
+        return self._orig_logging_name or "default"
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            POOL_CHECKOUT_TIMEOUTS.inc(pool=self.pool_name)
+            raise
+        finally:
+            POOL_CHECKOUT_SECONDS.observe(time.perf_counter() - start, pool=self.pool_name)
+
+
+class InstrumentedAsyncPool(InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def async_engine_options(config: DatabaseConfig, pool_name: str) -> Dict[str, Any]:
+    """
+    Параметры create_async_engine из DatabaseConfig
+
+    В режиме PgBouncer (transaction pooling) серверное соединение меняется между
+    транзакциями, поэтому кэш подготовленных выражений asyncpg отключается,
+    а выражения получают уникальные имена. Размер кэша диалекта SQLAlchemy
+    задаётся в URL (см. async_database_url).
+    """
+    connect_args: Dict[str, Any] = {"statement_cache_size": statement_cache_size(config)}
+    if config.POSTGRES_PGBOUNCER_MODE:
+        connect_args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid.uuid4()}__"
+
+    return {
+        "poolclass": InstrumentedAsyncPool,
+        "pool_logging_name": pool_name,
+        "pool_size": config.POSTGRES_POOL_SIZE,
+        "max_overflow": config.POSTGRES_MAX_OVERFLOW,
+        "pool_timeout": config.POSTGRES_POOL_TIMEOUT,
+        "pool_recycle": config.POSTGRES_POOL_RECYCLE,
+        "pool_pre_ping": config.POSTGRES_POOL_PRE_PING,
+        "connect_args": connect_args,
+    }
+
+
+def statement_cache_size(config: DatabaseConfig) -> int:
+    return 0 if config.POSTGRES_PGBOUNCER_MODE else config.POSTGRES_STATEMENT_CACHE_SIZE
+
+
+def async_database_url(config: DatabaseConfig, host: str, port: int) -> str:
+    return (
+        f"postgresql+asyncpg://{quote_plus(config.POSTGRES_USER)}:{quote_plus(config.POSTGRES_PASSWORD)}"
+        f"@{host}:{port}/{config.POSTGRES_DB}"
+        f"?prepared_statement_cache_size={statement_cache_size(config)}"
+    )
@@ -1,8 +1,11 @@
 from sqlalchemy import create_engine
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 
 from config import DatabaseConfig
+from db.postgres.pool import async_database_url, async_engine_options
+from db.postgres.replicas import ReplicaRouter
+from db.postgres.tracing import instrument_engine
 from urllib.parse import quote_plus
 
 settings = DatabaseConfig()
@@ -17,23 +20,51 @@ postgres_db = settings.POSTGRES_DB
 SYNC_DATABASE_URL = (
     f"postgresql://{postgres_user}:{postgres_password}@{postgres_host}:{postgres_port}/{postgres_db}"
 )
-DATABASE_URL = (
-    f"postgresql+asyncpg://{postgres_user}:{postgres_password}@{postgres_host}:{postgres_port}/{postgres_db}"
-)
+DATABASE_URL = async_database_url(settings, postgres_host, postgres_port)
 
 sync_engine = create_engine(SYNC_DATABASE_URL)
-engine = create_async_engine(DATABASE_URL)
+engine = create_async_engine(DATABASE_URL, **async_engine_options(settings, pool_name="primary"))
+instrument_engine(sync_engine, settings)
+instrument_engine(engine.sync_engine, settings)
+# Без expire_on_commit: объекты после коммита не перечитываются из БД
+async_session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+
+def _replica_engines():
+    engines = []
+    for index, address in enumerate(filter(None, map(str.strip, settings.POSTGRES_REPLICA_HOSTS.split(",")))):
+        host, _, port = address.partition(":")
+        replica_engine = create_async_engine(
+            async_database_url(settings, host, int(port or postgres_port)),
+            **async_engine_options(settings, pool_name=f"replica_{index}"),
+        )
+        instrument_engine(replica_engine.sync_engine, settings)
+        engines.append(replica_engine)
+    return engines
+
+
+replica_router = ReplicaRouter(
+    _replica_engines(),
+    health_check_interval=settings.POSTGRES_REPLICA_HEALTH_CHECK_INTERVAL,
+    health_check_timeout=settings.POSTGRES_REPLICA_HEALTH_CHECK_TIMEOUT,
+    max_lag_seconds=settings.POSTGRES_REPLICA_MAX_LAG_SECONDS,
+    read_your_writes_seconds=settings.POSTGRES_READ_YOUR_WRITES_SECONDS,
+)
 
 
 class Base(DeclarativeBase):
     pass
 
 
-async def session_maker() -> AsyncSession:
-    async_session = AsyncSession(engine)
+async def session_maker(read_only: bool = False) -> AsyncSession:
+    if read_only:
+        replica_engine = await replica_router.pick()
+        if replica_engine is not None:
+            return async_session_factory(bind=replica_engine)
+    async_session = async_session_factory()
     return async_session
 
 
 async def sync_session_maker():
-    sync_session = AsyncSession(engine)
+    sync_session = async_session_factory()
     return sync_session
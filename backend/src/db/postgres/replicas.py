@@ -0,0 +1,110 @@
+import asyncio
+import itertools
+import logging
+import time
+from contextvars import ContextVar
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+# Ключ клиента для read-your-writes (выставляется middleware на запрос)
+read_your_writes_key: ContextVar[Optional[str]] = ContextVar("read_your_writes_key", default=None)
+
+# Лаг реплики по времени последней применённой транзакции (0 - не в режиме восстановления).
+# На простаивающем primary лаг растёт без реальных отставаний, поэтому проверка опциональна.
+REPLICA_LAG_QUERY = text(
+    "SELECT CASE WHEN pg_is_in_recovery()"
+    " THEN coalesce(extract(epoch FROM now() - pg_last_xact_replay_timestamp()), 0)"
+    " ELSE 0 END"
+)
+
+
+class _Replica:
+    def __init__(self, engine: AsyncEngine) -> None:
+        self.engine = engine
+        self.healthy = True
+        self.checked_at = float("-inf")
+
+
+class ReplicaRouter:
+    """
+    Выбор движка для read-only UnitOfWork
+
+    Реплики перебираются по кругу, недоступные или отставшие больше
+    max_lag_seconds пропускаются до следующей проверки (не чаще раза в
+    health_check_interval секунд; max_lag_seconds <= 0 отключает проверку
+    лага). Если здоровых реплик нет - чтение идёт
+    на primary. После коммита клиент read_your_writes_seconds читает
+    с primary, чтобы видеть свои изменения несмотря на лаг репликации.
+    """
+
+    MAX_TRACKED_CLIENTS = 10_000
+
+    def __init__(
+        self,
+        engines: List[AsyncEngine],
+        health_check_interval: float = 5.0,
+        health_check_timeout: float = 1.0,
+        max_lag_seconds: float = 0.0,
+        read_your_writes_seconds: float = 5.0,
+    ) -> None:
+        self._replicas = [_Replica(engine) for engine in engines]
+        self._round_robin = itertools.cycle(range(len(self._replicas))) if engines else None
+        self.health_check_interval = health_check_interval
+        self.health_check_timeout = health_check_timeout
+        self.max_lag_seconds = max_lag_seconds
+        self.read_your_writes_seconds = read_your_writes_seconds
+        self._primary_until: Dict[str, float] = {}
+
+    @property
+    def engines(self) -> List[AsyncEngine]:
+        return [replica.engine for replica in self._replicas]
+
+    def mark_write(self) -> None:
+        """Запомнить, что текущий клиент только что записал данные"""
+        key = read_your_writes_key.get()
+        if key is None or self.read_your_writes_seconds <= 0:
+            return
+        now = time.monotonic()
+        if len(self._primary_until) >= self.MAX_TRACKED_CLIENTS:
+            self._primary_until = {k: until for k, until in self._primary_until.items() if until > now}
+        self._primary_until[key] = now + self.read_your_writes_seconds
+
+    def _needs_primary(self) -> bool:
+        key = read_your_writes_key.get()
+        if key is None:
+            return False
+        until = self._primary_until.get(key)
+        return until is not None and until > time.monotonic()
+
+    async def pick(self) -> Optional[AsyncEngine]:
+        """Движок реплики для чтения или None, если читать нужно с primary"""
+        if self._round_robin is None or self._needs_primary():
+            return None
+        for _ in range(len(self._replicas)):
+            replica = self._replicas[next(self._round_robin)]
+            if await self._is_healthy(replica):
+                return replica.engine
+        return None
+
+    async def _is_healthy(self, replica: _Replica) -> bool:
+        now = time.monotonic()
+        if now - replica.checked_at < self.health_check_interval:
+            return replica.healthy
+        # Проверку выполняет один запрос, остальные до её конца видят прошлый статус
+        replica.checked_at = now
+        try:
+            async with replica.engine.connect() as conn:
+                result = await asyncio.wait_for(conn.execute(REPLICA_LAG_QUERY), self.health_check_timeout)
+                lag = float(result.scalar())
+            healthy = self.max_lag_seconds <= 0 or lag <= self.max_lag_seconds
+            if not healthy:
+                logger.warning(f"Replica {replica.engine.url.host} is not usable (lag: {lag})")
+        except Exception as e:
+            logger.warning(f"Replica {replica.engine.url.host} health check failed: {e}")
+            healthy = False
+        replica.healthy = healthy
+        return healthy
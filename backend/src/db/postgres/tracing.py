@@ -0,0 +1,115 @@
+import functools
+import inspect
+import logging
+import random
+import time
+from contextvars import ContextVar
+from typing import Callable
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from config import DatabaseConfig
+from core.metrics import REGISTRY
+
+# Трассировка запросов: каждое выражение замеряется событиями движка и
+# приписывается методу репозитория, из которого оно выполнено. Медленные
+# выражения (дольше POSTGRES_SLOW_QUERY_SECONDS) пишутся в лог с сэмплированием,
+# вместо INFO-эха sqlalchemy.engine для каждого запроса.
+
+logger = logging.getLogger(__name__)
+
+QUERY_SECONDS = REGISTRY.histogram(
+    "db_query_seconds",
+    "SQL statement execution time by repository method",
+    labelnames=("source", "statement"),
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 30.0),
+)
+SLOW_QUERIES = REGISTRY.counter(
+    "db_slow_queries_total",
+    "Statements slower than POSTGRES_SLOW_QUERY_SECONDS (logged or not)",
+    labelnames=("source",),
+)
+
+# Метод репозитория, выполняющий запрос ("AnimalRepository.find_page").
+# Контекст наследуется greenlet'ом, в котором асинхронный движок выполняет выражения
+query_source: ContextVar[str] = ContextVar("db_query_source", default="other")
+
+_STATEMENT_LOG_LENGTH = 2000
+
+
+def traced(method: Callable) -> Callable:
+    """
+    Помечает запросы корутины-метода репозитория её именем
+
+    Вложенные вызовы (find_page_counted -> count) остаются за внешним методом:
+    так видно, какой вызов сервиса стоит за запросом.
+    """
+
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        if query_source.get() != "other":
+            return await method(self, *args, **kwargs)
+        token = query_source.set(f"{type(self).__name__}.{method.__name__}")
+        try:
+            return await method(self, *args, **kwargs)
+        finally:
+            query_source.reset(token)
+
+    wrapper.__traced__ = True
+    return wrapper
+
+
+def trace_methods(cls: type) -> None:
+    """Оборачивает traced публичные корутины, объявленные в самом классе"""
+    for name, attribute in list(vars(cls).items()):
+        if name.startswith("_") or not inspect.iscoroutinefunction(attribute):
+            continue
+        if not getattr(attribute, "__traced__", False):
+            setattr(cls, name, traced(attribute))
+
+
+def _statement_kind(statement: str) -> str:
+    words = statement.split(None, 1)
+    return words[0].upper() if words else ""
+
+
+class QueryTracer:
+    """Слушатели событий движка: гистограмма времени и лог медленных выражений"""
+
+    def __init__(self, slow_query_seconds: float, sample_rate: float) -> None:
+        self.slow_query_seconds = slow_query_seconds
+        self.sample_rate = sample_rate
+
+    def before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        if context is not None:
+            context._trace_start = time.perf_counter()
+
+    def after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        start = getattr(context, "_trace_start", None)
+        if start is None:
+            return
+        elapsed = time.perf_counter() - start
+        source = query_source.get()
+        QUERY_SECONDS.observe(elapsed, source=source, statement=_statement_kind(statement))
+
+        if self.slow_query_seconds <= 0 or elapsed < self.slow_query_seconds:
+            return
+        SLOW_QUERIES.inc(source=source)
+        if self.sample_rate >= 1.0 or random.random() < self.sample_rate:
+            # Параметры не логируются: в них персональные данные
+            logger.warning(
+                "Slow query %.3fs in %s%s: %s",
+                elapsed,
+                source,
+                " (executemany)" if executemany else "",
+                statement[:_STATEMENT_LOG_LENGTH],
+            )
+
+
+def instrument_engine(engine: Engine, config: DatabaseConfig) -> QueryTracer:
+    """Подключает трассировку к движку (для асинхронного - к engine.sync_engine)"""
+    tracer = QueryTracer(config.POSTGRES_SLOW_QUERY_SECONDS, config.POSTGRES_SLOW_QUERY_SAMPLE_RATE)
+    event.listen(engine, "before_cursor_execute", tracer.before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", tracer.after_cursor_execute)
+    return tracer
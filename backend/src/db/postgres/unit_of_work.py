@@ -1,20 +1,29 @@
 from db.postgres.user.user_repository import UserRepository
 from db.postgres.animal.animal_repository import AnimalRepository
 from db.postgres.animal.transcription_repository import AnimalTranscriptionRepository
+from db.postgres.animal.daily_stats_repository import AnimalDailyStatsRepository
 
-from db.postgres.postgres_client import session_maker
+from typing import Union
+
+from db.postgres.postgres_client import engine, replica_router, session_maker, settings
 
 
 class UnitOfWork:
     users = UserRepository
     animals = AnimalRepository
     animal_transcriptions = AnimalTranscriptionRepository
+    animal_daily_stats = AnimalDailyStatsRepository
+
+    def __init__(self, read_only: bool = False) -> None:
+        # read_only: сессия на реплике (если есть здоровая и клиент недавно не писал)
+        self.read_only = read_only
 
     async def __aenter__(self) -> "UnitOfWork":
-        self._session = await session_maker()
+        self._session = await session_maker(read_only=self.read_only)
         self.users = UserRepository(self._session)
         self.animals = AnimalRepository(self._session)
         self.animal_transcriptions = AnimalTranscriptionRepository(self._session)
+        self.animal_daily_stats = AnimalDailyStatsRepository(self._session)
         return self
 
     async def __aexit__(self, exc_type, exc_value, traceback):
@@ -23,6 +32,42 @@ class UnitOfWork:
 
     async def commit(self):
         await self._session.commit()
+        replica_router.mark_write()
 
     async def rollback(self):
         await self._session.rollback()
+
+
+class ReadOnlyUnitOfWork:
+    """
+    Облегчённый UnitOfWork только для чтения
+
+    Запросы выполняются на соединении из пула (реплики, если есть) в режиме
+    AUTOCOMMIT: без BEGIN/ROLLBACK вокруг каждого запроса, без сессии,
+    identity map и ORM-объектов - репозитории возвращают строки таблиц.
+    """
+
+    users = UserRepository
+    animals = AnimalRepository
+    animal_transcriptions = AnimalTranscriptionRepository
+    animal_daily_stats = AnimalDailyStatsRepository
+
+    async def __aenter__(self) -> "ReadOnlyUnitOfWork":
+        read_engine = await replica_router.pick() or engine
+        self._connection = await read_engine.connect()
+        await self._connection.execution_options(isolation_level="AUTOCOMMIT")
+        self.users = UserRepository(self._connection)
+        self.animals = AnimalRepository(self._connection)
+        self.animal_transcriptions = AnimalTranscriptionRepository(self._connection)
+        self.animal_daily_stats = AnimalDailyStatsRepository(self._connection)
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self._connection.close()
+
+
+def read_unit_of_work() -> Union[ReadOnlyUnitOfWork, UnitOfWork]:
+    """UnitOfWork для чтения: облегчённый путь или обычная сессия (POSTGRES_LIGHTWEIGHT_READS)"""
+    if settings.POSTGRES_LIGHTWEIGHT_READS:
+        return ReadOnlyUnitOfWork()
+    return UnitOfWork(read_only=True)
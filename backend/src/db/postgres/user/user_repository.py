@@ -17,9 +17,9 @@ class UserRepository(BaseRepository[UserSchema, User]):
         """Check if a user exists by email."""
         try:
             result = await self._session.execute(
-                select(self.model).where(self.model.email == email)
+                self._select().where(self.model.email == email)
             )
-            return result.scalars().one_or_none()
+            return self._one_or_none(result)
         except IntegrityError:
             raise DBException("Error while querying the database")
 
@@ -27,9 +27,9 @@ class UserRepository(BaseRepository[UserSchema, User]):
         """Check if a user exists by username."""
         try:
             result = await self._session.execute(
-                select(self.model).where(self.model.username == username)
+                self._select().where(self.model.username == username)
             )
-            return result.scalars().one_or_none()
+            return self._one_or_none(result)
         except IntegrityError:
             raise DBException("Error while querying the database")
 
@@ -37,9 +37,9 @@ class UserRepository(BaseRepository[UserSchema, User]):
         """Check if a user exists by id."""
         try:
             result = await self._session.execute(
-                select(self.model).where(self.model.id == user_id)
+                self._select().where(self.model.id == user_id)
             )
-            return result.scalars().one_or_none()
+            return self._one_or_none(result)
         except IntegrityError:
             raise DBException("Error while querying the database")
 
@@ -1,5 +1,5 @@
 import json
-from typing import Any, AnyStr
+from typing import Any, AnyStr, Dict, Optional
 
 import redis.asyncio as aioredis
 
@@ -102,6 +102,54 @@ class RedisClient:
         """Установить TTL для ключа"""
         return await self.redis.expire(key.encode(), ttl)
 
+    # Методы для учёта квот инференса
+    # TTL ставится атомарно, только ключу без TTL (EXPIRE ... NX - лишь с Redis 7)
+    _INCRBYFLOAT_WITH_TTL = """
+    local value = redis.call('INCRBYFLOAT', KEYS[1], ARGV[1])
+    if redis.call('TTL', KEYS[1]) == -1 then
+        redis.call('EXPIRE', KEYS[1], ARGV[2])
+    end
+    return value
+    """
+
+    async def incr_float_with_ttl(self, key: str, amount: float, ttl: int) -> float:
+        """Увеличить счётчик на дробное значение; TTL ставится при создании ключа"""
+        value = await self.redis.eval(self._INCRBYFLOAT_WITH_TTL, 1, key.encode(), amount, ttl)
+        return float(value)
+
+    async def get_float(self, key: str) -> float:
+        """Получить числовое значение счётчика (0, если ключа нет)"""
+        result = await self.redis.get(key.encode())
+        return float(result) if result else 0.0
+
+    # Методы для счётчиков в hash (фасеты)
+    _HINCRBY_IF_EXISTS = """
+    if redis.call('EXISTS', KEYS[1]) == 1 then
+        return redis.call('HINCRBY', KEYS[1], ARGV[1], ARGV[2])
+    end
+    return nil
+    """
+
+    async def hincrby_if_exists(self, key: str, field: str, amount: int) -> Optional[int]:
+        """Увеличить поле hash, только если hash уже существует (None, если его нет)"""
+        return await self.redis.eval(self._HINCRBY_IF_EXISTS, 1, key.encode(), field.encode(), amount)
+
+    async def get_int_hash(self, key: str) -> Optional[Dict[str, int]]:
+        """Получить hash целых чисел (None, если ключа нет)"""
+        result = await self.redis.hgetall(key.encode())
+        if not result:
+            return None
+        return {field.decode(): int(value) for field, value in result.items()}
+
+    async def replace_hash(self, key: str, mapping: Dict[str, Any]) -> None:
+        """Атомарно заменить hash целиком: запись во временный ключ и RENAME"""
+        tmp_key = f"{key}:rebuild".encode()
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.delete(tmp_key)
+            pipe.hset(tmp_key, mapping={field.encode(): value for field, value in mapping.items()})
+            pipe.rename(tmp_key, key.encode())
+            await pipe.execute()
+
     async def ping(self) -> bool:
         """Проверить подключение к Redis"""
         try:
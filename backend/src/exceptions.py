@@ -13,3 +13,24 @@ class DoesNotExist(HTTPException):
 
     def __init__(self, detail: str = "Object not found"):
         super().__init__(status_code=status.HTTP_404_NOT_FOUND, detail=detail)
+
+
+class AlreadyExists(HTTPException):
+    """Exception for a unique constraint violation"""
+
+    def __init__(self, detail: str = "Object already exists"):
+        super().__init__(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+
+
+class InvalidCursor(HTTPException):
+    """Exception for a malformed or foreign pagination cursor"""
+
+    def __init__(self, detail: str = "Invalid pagination cursor"):
+        super().__init__(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+
+
+class InvalidImportFile(HTTPException):
+    """Exception for an import file that does not match the target table"""
+
+    def __init__(self, detail: str = "Invalid import file"):
+        super().__init__(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
@@ -2,6 +2,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from core.lifespan import lifespan
+from core.metrics import metrics_router
 from core.middlewares import setup_middlewares
 from core.routers import main_router
 from config import FastAPIConfig
@@ -21,6 +22,7 @@ app = FastAPI(
 
 setup_middlewares(app)
 app.include_router(main_router)
+app.include_router(metrics_router)
 
 
 def create_app() -> FastAPI:
@@ -53,6 +55,7 @@ def create_app() -> FastAPI:
 
     setup_middlewares(app)
     app.include_router(main_router)
+    app.include_router(metrics_router)
     return app
 
 
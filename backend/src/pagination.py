@@ -0,0 +1,109 @@
+import base64
+import binascii
+import json
+from collections.abc import Mapping
+from datetime import datetime
+from typing import Any, Generic, List, Optional, Sequence, TypeVar
+
+from pydantic import BaseModel
+from sqlalchemy import Select, tuple_
+from sqlalchemy.orm import InstrumentedAttribute
+
+from exceptions import InvalidCursor
+
+T = TypeVar("T")
+
+# Keyset (cursor) пагинация: вместо OFFSET следующая страница начинается
+# строго после ключа последней строки предыдущей, поэтому стоимость запроса
+# не зависит от глубины страницы (при индексе по ключевым колонкам).
+
+
+class KeysetPage(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None
+
+
+class TotalCount(BaseModel):
+    value: int
+    exact: bool = True  # False - оценка по статистике планировщика
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict) and "dt" in value:
+        return datetime.fromisoformat(value["dt"])
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Кодирует значения ключа последней строки в непрозрачный курсор"""
+    payload = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, key_count: int) -> List[Any]:
+    """Декодирует курсор; InvalidCursor, если он повреждён или от другого ключа"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError, ValueError):
+        raise InvalidCursor()
+    if not isinstance(values, list) or len(values) != key_count:
+        raise InvalidCursor()
+    try:
+        return [_decode_value(v) for v in values]
+    except (TypeError, ValueError):
+        raise InvalidCursor()
+
+
+def paginate_keyset(
+    query: Select,
+    keys: Sequence[InstrumentedAttribute],
+    cursor: Optional[str],
+    limit: int,
+    descending: bool = False,
+) -> Select:
+    """
+    Добавляет к запросу условие после курсора, сортировку по ключу и LIMIT
+
+    Запрашивается limit + 1 строка: лишняя строка говорит о наличии следующей страницы.
+
+    Args:
+        query: исходный SELECT (с фильтрами)
+        keys: уникальный ключ сортировки, например (created_at, id) или (id,)
+        cursor: курсор из предыдущей страницы
+        limit: размер страницы
+        descending: сортировка по убыванию ключа
+    """
+    if cursor:
+        values = decode_cursor(cursor, len(keys))
+        # Сравнение row-value: (a, b) < (x, y) использует составной индекс
+        key, bound = (keys[0], values[0]) if len(keys) == 1 else (tuple_(*keys), tuple_(*values))
+        query = query.where(key < bound if descending else key > bound)
+        if len(keys) > 1:
+            # Избыточное условие на первую колонку: по row-value PostgreSQL не отсекает
+            # партиции, а по created_at <= x - отсекает
+            query = query.where(keys[0] <= values[0] if descending else keys[0] >= values[0])
+    order_by = [key.desc() if descending else key.asc() for key in keys]
+    return query.order_by(*order_by).limit(limit + 1)
+
+
+def build_page(rows: Sequence[T], key_names: Sequence[str], limit: int) -> KeysetPage[T]:
+    """Обрезает лишнюю строку и формирует курсор следующей страницы"""
+    items = list(rows[:limit])
+    next_cursor = None
+    if len(rows) > limit and items:
+        last = items[-1]
+        next_cursor = encode_cursor([_get_key(last, name) for name in key_names])
+    return KeysetPage[T](items=items, next_cursor=next_cursor)
+
+
+def _get_key(row: Any, name: str) -> Any:
+    if isinstance(row, Mapping):
+        return row[name]
+    return getattr(row, name)
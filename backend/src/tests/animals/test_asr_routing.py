@@ -0,0 +1,57 @@
+import pytest
+
+from v1.animals.asr_routing import ASRTier, CascadePolicy, TranscriptionResult
+from v1.animals.config import AnimalsServiceConfig
+
+
+def _result(tier: ASRTier, confidence: float, text: str = "корова спокойна") -> TranscriptionResult:
+    return TranscriptionResult(
+        text=text,
+        confidence=confidence,
+        tier=tier,
+        model_name="test-model",
+        audio_seconds=10.0,
+        elapsed_seconds=0.5,
+    )
+
+
+@pytest.fixture
+def policy():
+    return CascadePolicy(enabled=True, max_fast_duration=30.0, min_confidence=0.85)
+
+
+@pytest.mark.parametrize("audio_seconds, expected", [(5.0, ASRTier.FAST), (30.0, ASRTier.FAST), (31.0, ASRTier.LARGE)])
+def test_initial_tier_by_duration(policy, audio_seconds, expected):
+    """✅ Короткие клипы идут в быструю модель, длинные - сразу в большую"""
+    assert policy.initial_tier(audio_seconds) == expected
+
+
+def test_disabled_cascade_always_uses_large_model():
+    """✅ При выключенном каскаде используется только большая модель"""
+    policy = CascadePolicy(enabled=False, max_fast_duration=30.0, min_confidence=0.85)
+    assert policy.initial_tier(5.0) == ASRTier.LARGE
+
+
+@pytest.mark.parametrize(
+    "fast_model, enabled",
+    [("", False), ("bond005/wav2vec2-large-ru-golos", False), ("example/wav2vec2-base-ru", True)],
+)
+def test_cascade_needs_separate_fast_model(fast_model, enabled):
+    """✅ Без отдельной быстрой модели каскад выключен: вторая копия большой модели не грузится"""
+    config = AnimalsServiceConfig(ASR_LARGE_MODEL="bond005/wav2vec2-large-ru-golos", ASR_FAST_MODEL=fast_model)
+
+    assert CascadePolicy.from_config(config).enabled is enabled
+
+
+@pytest.mark.parametrize(
+    "result, expected",
+    [
+        (_result(ASRTier.FAST, 0.95), False),
+        (_result(ASRTier.FAST, 0.60), True),
+        (_result(ASRTier.FAST, 0.95, text="  "), True),
+        (_result(ASRTier.LARGE, 0.10), False),
+    ],
+)
+def test_should_escalate(policy, result, expected):
+    """✅ Эскалация только для неуверенного результата быстрой модели"""
+    assert policy.should_escalate(result) == expected
@@ -0,0 +1,84 @@
+import io
+import wave
+
+import pytest
+
+from v1.animals.audio_formats import (
+    DECODER_BY_CONTAINER,
+    AudioContainer,
+    AudioDecoder,
+    probe_audio_duration,
+    sniff_audio_container,
+    sniff_audio_file,
+)
+
+
+def _wav_bytes() -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(16000)
+        wav_file.writeframes(b"\x00\x00" * 160)
+    return buffer.getvalue()
+
+
+OGG_OPUS_HEADER = b"OggS\x00\x02" + b"\x00" * 20 + b"\x01\x13" + b"OpusHead\x01\x01"
+OGG_VORBIS_HEADER = b"OggS\x00\x02" + b"\x00" * 20 + b"\x01\x1e" + b"\x01vorbis\x00\x00"
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        (_wav_bytes(), AudioContainer.WAV),
+        (b"fLaC\x00\x00\x00\x22", AudioContainer.FLAC),
+        (OGG_OPUS_HEADER, AudioContainer.OPUS),
+        (OGG_VORBIS_HEADER, AudioContainer.OGG),
+        (b"ID3\x04\x00\x00\x00\x00\x00\x00", AudioContainer.MP3),
+        (b"\xff\xfb\x90\x64", AudioContainer.MP3),
+        (b"\xff\xf1\x50\x80", AudioContainer.AAC),
+        (b"\x00\x00\x00\x20ftypM4A \x00\x00\x00\x00", AudioContainer.M4A),
+        (b"\x1a\x45\xdf\xa3\x9f\x42\x86\x81", AudioContainer.WEBM),
+        (bytes.fromhex("3026b2758e66cf11a6d900aa0062ce6c"), AudioContainer.WMA),
+        (b"not an audio file", AudioContainer.UNKNOWN),
+        (b"", AudioContainer.UNKNOWN),
+    ],
+)
+def test_sniff_audio_container(header, expected):
+    """✅ Контейнер определяется по магическим байтам"""
+    assert sniff_audio_container(header) == expected
+
+
+def test_sniff_ignores_file_extension(tmp_path):
+    """✅ Расширение файла не влияет на выбор декодера"""
+    audio_path = tmp_path / "recording.mp3"
+    audio_path.write_bytes(_wav_bytes())
+
+    container = sniff_audio_file(str(audio_path))
+
+    assert container == AudioContainer.WAV
+    assert DECODER_BY_CONTAINER[container] == AudioDecoder.WAVE
+
+
+def test_every_container_has_decoder():
+    """✅ Для каждого контейнера задан декодер"""
+    assert set(DECODER_BY_CONTAINER) == set(AudioContainer)
+
+
+def test_probe_wav_duration(tmp_path):
+    """✅ Длительность WAV берётся из заголовка"""
+    audio_path = tmp_path / "note.wav"
+    audio_path.write_bytes(_wav_bytes())
+
+    assert probe_audio_duration(str(audio_path)) == pytest.approx(0.01)
+
+
+def test_probe_flac_duration_from_streaminfo(tmp_path):
+    """✅ Длительность FLAC берётся из STREAMINFO без декодирования"""
+    sample_rate, total_samples = 44100, 44100 * 12
+    packed = (sample_rate << 44) | (1 << 41) | (15 << 36) | total_samples
+    header = b"fLaC" + b"\x80\x00\x00\x22" + b"\x00" * 10 + packed.to_bytes(8, "big") + b"\x00" * 16
+    audio_path = tmp_path / "note.flac"
+    audio_path.write_bytes(header)
+
+    assert probe_audio_duration(str(audio_path)) == pytest.approx(12.0)
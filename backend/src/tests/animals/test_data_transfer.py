@@ -0,0 +1,150 @@
+from contextlib import asynccontextmanager
+
+import pytest
+
+from exceptions import AlreadyExists, DBException, InvalidImportFile
+from v1.animals import data_transfer
+from v1.animals.data_transfer import (
+    TABLES,
+    DataFormat,
+    DataTable,
+    TransferStats,
+    _copied_rows,
+    _copy_columns,
+    export_table,
+    import_table,
+)
+
+
+class FakeCopyDriver:
+    """Запоминает, какой формой COPY выгружалась таблица"""
+
+    def __init__(self) -> None:
+        self.calls = []
+        self.import_error = None
+
+    async def copy_from_table(self, table_name, **kwargs):
+        self.calls.append(("table", table_name, kwargs))
+        return "COPY 3"
+
+    async def copy_from_query(self, query, **kwargs):
+        self.calls.append(("query", query, kwargs))
+        return "COPY 5"
+
+    async def copy_to_table(self, table_name, **kwargs):
+        if self.import_error is not None:
+            raise self.import_error
+        return "COPY 2"
+
+
+class DriverError(Exception):
+    """Ошибка asyncpg с SQLSTATE"""
+
+    def __init__(self, sqlstate: str) -> None:
+        super().__init__(f'duplicate key value violates unique constraint "uq_animals_name_lower" ({sqlstate})')
+        self.sqlstate = sqlstate
+
+
+@pytest.fixture
+def copy_driver(monkeypatch):
+    driver = FakeCopyDriver()
+    driver.writes = []
+    monkeypatch.setattr(data_transfer.replica_router, "mark_write", lambda: driver.writes.append(True))
+
+    @asynccontextmanager
+    async def fake_copy_connection():
+        yield None, driver
+
+    monkeypatch.setattr(data_transfer, "_copy_connection", fake_copy_connection)
+    return driver
+
+
+def test_copied_rows_from_copy_status():
+    """✅ Количество строк берётся из статуса команды COPY"""
+    assert _copied_rows("COPY 12345") == 12345
+    assert _copied_rows("") == 0
+
+
+def test_copy_columns_match_table_columns():
+    """✅ COPY идёт по колонкам таблицы, включая id и даты"""
+    columns = _copy_columns(TABLES[DataTable.ANIMALS])
+
+    assert columns[0] == "id"
+    assert {"animal", "name", "created_at", "updated_at"} <= set(columns)
+
+
+def test_rows_per_second():
+    """✅ Скорость в строках в секунду; при нулевом времени - 0"""
+    assert TransferStats(table="animals", format="csv", rows=1000, seconds=0.5).rows_per_second == 2000.0
+    assert TransferStats(table="animals", format="csv", rows=0, seconds=0).rows_per_second == 0.0
+
+
+async def test_import_rejects_unknown_columns(tmp_path):
+    """❌ Колонки, которых нет в таблице, отклоняются до обращения к БД"""
+    path = tmp_path / "animals.csv"
+    path.write_text("name,animal,color\nЗорька,корова,рыжая\n", encoding="utf-8")
+
+    with pytest.raises(InvalidImportFile) as error:
+        await import_table(DataTable.ANIMALS, DataFormat.CSV, str(path), chunk_rows=100)
+
+    assert "color" in error.value.detail
+
+
+async def test_import_rejects_empty_file(tmp_path):
+    """❌ Пустой CSV без заголовка отклоняется"""
+    path = tmp_path / "animals.csv"
+    path.write_text("", encoding="utf-8")
+
+    with pytest.raises(InvalidImportFile):
+        await import_table(DataTable.ANIMALS, DataFormat.CSV, str(path), chunk_rows=100)
+
+
+async def test_export_of_partitioned_table_uses_copy_from_query(copy_driver, tmp_path):
+    """✅ Секционированные транскрипции выгружаются COPY (SELECT ...) TO: COPY таблицы не поддерживается"""
+    stats = await export_table(DataTable.TRANSCRIPTIONS, DataFormat.CSV, str(tmp_path / "t.csv"), chunk_rows=100)
+
+    kind, query, options = copy_driver.calls[0]
+    assert kind == "query"
+    assert query.startswith("SELECT id, animal_id,") and query.endswith(" FROM animal_transcriptions")
+    assert "weight_kg" not in query
+    assert options["header"] is True and stats.rows == 5
+
+
+async def test_export_of_plain_table_uses_copy_from_table(copy_driver, tmp_path):
+    """✅ Обычная таблица выгружается COPY таблицы по колонкам"""
+    stats = await export_table(DataTable.ANIMALS, DataFormat.CSV, str(tmp_path / "a.csv"), chunk_rows=100)
+
+    kind, table_name, options = copy_driver.calls[0]
+    assert (kind, table_name) == ("table", "animals")
+    assert options["columns"] == _copy_columns(TABLES[DataTable.ANIMALS])
+    assert stats.rows == 3
+
+
+def _animals_csv(tmp_path) -> str:
+    path = tmp_path / "animals.csv"
+    path.write_text("name,animal\nЗорька,корова\nБорька,свинья\n", encoding="utf-8")
+    return str(path)
+
+
+async def test_import_marks_write_for_read_your_writes(copy_driver, tmp_path):
+    """✅ После COPY чтения идут с primary: импорт отмечается как запись"""
+    stats = await import_table(DataTable.ANIMALS, DataFormat.CSV, _animals_csv(tmp_path), chunk_rows=100)
+
+    assert stats.rows == 2
+    assert copy_driver.writes == [True]
+
+
+@pytest.mark.parametrize(
+    "sqlstate, error_type",
+    [("23505", AlreadyExists), ("23503", InvalidImportFile), ("22P02", InvalidImportFile), ("53100", DBException)],
+)
+async def test_import_constraint_errors_hide_driver_message(copy_driver, tmp_path, sqlstate, error_type):
+    """❌ Нарушение ограничения или неверные данные - 400 без текста драйвера; прочее - 500"""
+    copy_driver.import_error = DriverError(sqlstate)
+
+    with pytest.raises(error_type) as error:
+        await import_table(DataTable.ANIMALS, DataFormat.CSV, _animals_csv(tmp_path), chunk_rows=100)
+
+    assert error.value.status_code == (500 if error_type is DBException else 400)
+    assert "uq_animals_name_lower" not in error.value.detail
+    assert copy_driver.writes == []
@@ -0,0 +1,164 @@
+import pytest
+from fastapi import HTTPException
+
+from db.postgres.animal.animal_repository import AnimalRepository
+from db.postgres.animal.transcription_repository import AnimalTranscriptionRepository
+from tests.db.conftest import FakeConnection, FakeResult, FakeRow
+from v1.animals import service as service_module
+from v1.animals.config import AnimalsServiceConfig
+from v1.animals.facets import AnimalTypeFacets
+
+
+class InMemoryHashRedis:
+    """Заглушка RedisClient с hash-операциями"""
+
+    def __init__(self) -> None:
+        self.hashes = {}
+
+    async def hincrby_if_exists(self, key, field, amount):
+        if key not in self.hashes:
+            return None
+        self.hashes[key][field] = self.hashes[key].get(field, 0) + amount
+        return self.hashes[key][field]
+
+    async def get_int_hash(self, key):
+        return dict(self.hashes[key]) if key in self.hashes else None
+
+    async def replace_hash(self, key, mapping):
+        self.hashes[key] = dict(mapping)
+
+
+class BrokenRedis:
+    async def hincrby_if_exists(self, key, field, amount):
+        raise ConnectionError("redis is down")
+
+    async def get_int_hash(self, key):
+        raise ConnectionError("redis is down")
+
+
+async def test_facets_are_not_built_until_rebuild():
+    """✅ Инкременты без собранных фасетов не создают частичных данных"""
+    facets = AnimalTypeFacets(InMemoryHashRedis())
+
+    await facets.apply({"корова": 1})
+
+    assert await facets.get() is None
+
+
+async def test_incremental_changes_after_rebuild():
+    """✅ Создание, смена типа и удаление меняют счётчики, нулевые типы скрыты"""
+    facets = AnimalTypeFacets(InMemoryHashRedis())
+    await facets.rebuild({"корова": 2, "коза": 1})
+
+    await facets.apply({"свинья": 1})               # создание
+    await facets.apply({"корова": -1, "коза": 1})   # смена типа
+    await facets.apply({"свинья": -1})              # удаление
+
+    assert await facets.get() == {"корова": 1, "коза": 2}
+
+
+async def test_empty_rebuild_is_still_built():
+    """✅ Пустая БД - собранные пустые фасеты, а не повторная пересборка"""
+    facets = AnimalTypeFacets(InMemoryHashRedis())
+
+    await facets.rebuild({})
+
+    assert await facets.get() == {}
+
+
+async def test_redis_errors_do_not_propagate():
+    """✅ Недоступный Redis не ломает запись, чтение уходит в пересборку"""
+    facets = AnimalTypeFacets(BrokenRedis())
+
+    await facets.apply({"корова": 1})
+
+    assert await facets.get() is None
+
+
+class PrimaryUnitOfWork:
+    """UnitOfWork на primary с заранее известными счётчиками"""
+
+    def __init__(self, read_only: bool = False) -> None:
+        assert not read_only, "facet rebuild must not read from a replica"
+        self.animals = self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return None
+
+    async def count_by_animal_types(self):
+        return {"корова": 3, "коза": 1}
+
+
+async def test_rebuild_reads_counts_from_primary(monkeypatch):
+    """✅ Полная пересборка читает счётчики с primary, не через read-only путь/реплику"""
+    def replica_read():
+        raise AssertionError("facet rebuild must not use read_unit_of_work")
+
+    monkeypatch.setattr(service_module, "UnitOfWork", PrimaryUnitOfWork)
+    monkeypatch.setattr(service_module, "read_unit_of_work", replica_read)
+    redis = InMemoryHashRedis()
+    service = service_module.AnimalsService(AnimalsServiceConfig(), scheduler=None, facets=AnimalTypeFacets(redis))
+
+    counts = await service.rebuild_animal_type_facets()
+
+    assert counts == {"корова": 3, "коза": 1}
+    assert await AnimalTypeFacets(redis).get() == counts
+
+
+class FakeUnitOfWork:
+    """UnitOfWork с настоящими репозиториями поверх заготовленных результатов"""
+
+    def __init__(self, connection: FakeConnection) -> None:
+        self.animals = AnimalRepository(connection)
+        self.animal_transcriptions = AnimalTranscriptionRepository(connection)
+        self.committed = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return None
+
+    async def commit(self):
+        self.committed = True
+
+
+def _delete_service(monkeypatch, connection: FakeConnection, redis: InMemoryHashRedis):
+    uow = FakeUnitOfWork(connection)
+    monkeypatch.setattr(service_module, "UnitOfWork", lambda read_only=False: uow)
+    service = service_module.AnimalsService(AnimalsServiceConfig(), scheduler=None, facets=AnimalTypeFacets(redis))
+    return service, uow
+
+
+async def test_delete_animal_removes_row_and_decrements_facets(monkeypatch):
+    """✅ Удаление: транскрипции и строка животного удаляются DELETE, счётчик типа уменьшается"""
+    redis = InMemoryHashRedis()
+    await AnimalTypeFacets(redis).rebuild({"корова": 2})
+    connection = FakeConnection(FakeResult(rowcount=3), [FakeRow(id=7, animal="корова", name="Зорька")])
+    service, uow = _delete_service(monkeypatch, connection, redis)
+
+    result = await service.delete_animal(7)
+
+    transcriptions, animal = (str(statement) for statement in connection.statements)
+    assert transcriptions.startswith("DELETE FROM animal_transcriptions WHERE animal_transcriptions.animal_id")
+    assert animal.startswith("DELETE FROM animals WHERE animals.id") and "RETURNING" in animal
+    assert uow.committed
+    assert result["deleted_animal_id"] == 7
+    assert await AnimalTypeFacets(redis).get() == {"корова": 1}
+
+
+async def test_delete_missing_animal_is_404(monkeypatch):
+    """❌ Животного нет - 404 без коммита и без изменения фасетов"""
+    redis = InMemoryHashRedis()
+    await AnimalTypeFacets(redis).rebuild({"корова": 2})
+    service, uow = _delete_service(monkeypatch, FakeConnection(FakeResult(), []), redis)
+
+    with pytest.raises(HTTPException) as error:
+        await service.delete_animal(7)
+
+    assert error.value.status_code == 404
+    assert not uow.committed
+    assert await AnimalTypeFacets(redis).get() == {"корова": 2}
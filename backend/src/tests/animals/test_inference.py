@@ -0,0 +1,145 @@
+import pytest
+
+torch = pytest.importorskip("torch")
+pytest.importorskip("transformers")
+
+from v1.animals import inference  # noqa: E402
+from v1.animals.asr_routing import ASRTier, CascadePolicy, TranscriptionResult  # noqa: E402
+
+BLANK = 0
+
+
+class StubBackend(inference.ASRBackend):
+    """Бэкенд с заранее заданным результатом, без модели"""
+
+    def __init__(self, tier: ASRTier, text: str, confidence: float) -> None:
+        self.tier = tier
+        self.model_name = f"stub-{tier.value}"
+        self.text = text
+        self.confidence = confidence
+        self.calls = 0
+
+    def transcribe(self, wav) -> TranscriptionResult:
+        self.calls += 1
+        return TranscriptionResult(
+            text=self.text,
+            confidence=self.confidence,
+            tier=self.tier,
+            model_name=self.model_name,
+            audio_seconds=wav.shape[-1] / inference.TARGET_SAMPLE_RATE,
+            elapsed_seconds=0.5,
+        )
+
+
+@pytest.fixture
+def policy():
+    return CascadePolicy(enabled=True, max_fast_duration=30.0, min_confidence=0.85)
+
+
+@pytest.fixture
+def backends(monkeypatch):
+    stubs = {
+        ASRTier.FAST: StubBackend(ASRTier.FAST, "корова спокойна", 0.95),
+        ASRTier.LARGE: StubBackend(ASRTier.LARGE, "корова спокойно ест", 0.9),
+    }
+    monkeypatch.setattr(inference, "get_asr_backend", lambda tier: stubs[tier])
+    return stubs
+
+
+def _seconds(seconds: float):
+    return torch.zeros(1, int(seconds * inference.TARGET_SAMPLE_RATE))
+
+
+def test_ctc_confidence_ignores_blank_frames():
+    """✅ Уверенность - средняя вероятность выбранного токена только по фреймам речи"""
+    logits = torch.log(torch.tensor([[0.9, 0.05, 0.05], [0.2, 0.7, 0.1], [0.1, 0.4, 0.5]]))
+    predicted_ids = logits.argmax(dim=-1)
+
+    confidence = inference._ctc_confidence(logits, predicted_ids, BLANK)
+
+    assert confidence == pytest.approx((0.7 + 0.5) / 2)
+
+
+def test_ctc_confidence_of_silence_is_zero():
+    """❌ Только blank-фреймы - нулевая уверенность (клип уйдёт в большую модель)"""
+    logits = torch.log(torch.tensor([[0.9, 0.1], [0.8, 0.2]]))
+
+    assert inference._ctc_confidence(logits, logits.argmax(dim=-1), BLANK) == 0.0
+
+
+def test_confident_fast_result_is_kept(policy, backends):
+    """✅ Уверенный результат быстрой модели не перераспознаётся"""
+    result = inference.transcribe_waveform(_seconds(5), policy)
+
+    assert result.tier == ASRTier.FAST and not result.escalated
+    assert backends[ASRTier.LARGE].calls == 0
+
+
+def test_unsure_fast_result_escalates(policy, backends):
+    """✅ Неуверенная быстрая модель - перераспознавание большой, время обоих проходов суммируется"""
+    backends[ASRTier.FAST].confidence = 0.5
+    before = inference.ASR_ESCALATIONS.value()
+
+    result = inference.transcribe_waveform(_seconds(5), policy)
+
+    assert result.tier == ASRTier.LARGE and result.escalated
+    assert result.text == "корова спокойно ест"
+    assert result.elapsed_seconds == pytest.approx(1.0)
+    assert inference.ASR_ESCALATIONS.value() == before + 1
+
+
+def test_long_clip_goes_straight_to_large_model(policy, backends):
+    """✅ Длинный клип - сразу большая модель, быстрая не вызывается"""
+    result = inference.transcribe_waveform(_seconds(40), policy)
+
+    assert result.tier == ASRTier.LARGE and not result.escalated
+    assert backends[ASRTier.FAST].calls == 0
+
+
+def test_preselected_tier_overrides_clip_length(policy, backends):
+    """✅ Чанк длинной записи идёт в модель, выбранную по длине всей записи"""
+    result = inference.transcribe_waveform(_seconds(5), policy, tier=ASRTier.LARGE)
+
+    assert result.tier == ASRTier.LARGE
+    assert backends[ASRTier.FAST].calls == 0
+
+
+def _loud(seconds: float, quiet_at: tuple = ()):
+    """Громкий сигнал [1, time] с тихими 20-мс фреймами, начинающимися в quiet_at секунд"""
+    wav = torch.ones(1, int(seconds * inference.TARGET_SAMPLE_RATE))
+    for second in quiet_at:
+        start = int(second * inference.TARGET_SAMPLE_RATE)
+        wav[0, start:start + inference.TARGET_SAMPLE_RATE // 50] = 0
+    return wav
+
+
+def test_split_cuts_in_quietest_frame():
+    """✅ Граница чанка - середина самого тихого фрейма в последней секунде окна"""
+    # окна поиска: [1 с, 2 с] и [2.51 с, 3.51 с] (от начала второго чанка)
+    wav = _loud(6.0, quiet_at=(1.5, 3.01))
+
+    chunks = inference.split_waveform(wav, chunk_seconds=2.0)
+
+    # середины тихих фреймов: 1.51 с и 3.02 с; последние 2.98 с - хвостом в один чанк
+    assert [chunk.shape[-1] for chunk in chunks] == [24160, 24160, 47680]
+    assert torch.equal(torch.cat(chunks, dim=-1), wav)
+
+
+def test_split_keeps_short_audio_whole():
+    """✅ Запись не длиннее чанка плюс секунда - один чанк, хвост не отрезается"""
+    wav = _loud(2.9)
+
+    chunks = inference.split_waveform(wav, chunk_seconds=2.0)
+
+    assert len(chunks) == 1 and torch.equal(chunks[0], wav)
+
+
+def test_split_of_silence_keeps_chunks_near_target():
+    """✅ В тишине короткие чанки не вырождаются: не короче половины заданной длины"""
+    wav = torch.zeros(1, 3 * inference.TARGET_SAMPLE_RATE)
+    chunk_samples = inference.TARGET_SAMPLE_RATE // 2
+
+    chunks = inference.split_waveform(wav, chunk_seconds=0.5)
+
+    assert all(chunk_samples // 2 <= chunk.shape[-1] <= chunk_samples for chunk in chunks[:-1])
+    assert torch.equal(torch.cat(chunks, dim=-1), wav)
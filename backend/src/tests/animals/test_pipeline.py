@@ -0,0 +1,135 @@
+import threading
+
+import pytest
+
+from v1.animals.asr_routing import ASRTier, TranscriptionResult
+from v1.animals.pipeline import run_transcription_pipeline
+from v1.animals.utils import merge_analyses
+
+
+def _chunk(text: str, confidence: float = 0.9, audio_seconds: float = 30.0) -> TranscriptionResult:
+    return TranscriptionResult(
+        text=text,
+        confidence=confidence,
+        tier=ASRTier.FAST,
+        model_name="test-model",
+        audio_seconds=audio_seconds,
+        elapsed_seconds=0.1,
+    )
+
+
+def _analysis(behavior: str, weight=None, food=None) -> dict:
+    return {
+        "behavior_state": behavior,
+        "measurements": {"weight": weight, "temperature": None},
+        "feeding_details": {"food_type": food},
+        "relationships": {},
+    }
+
+
+async def test_analysis_starts_before_transcription_finishes():
+    """✅ Анализ первого чанка идёт параллельно с распознаванием второго"""
+    first_chunk_analyzed = threading.Event()
+
+    def transcribe_chunks():
+        yield _chunk("корова ест сено")
+        # Второй чанк «декодируется» только после того, как LLM получила первый
+        assert first_chunk_analyzed.wait(timeout=5), "analysis did not overlap with ASR"
+        yield _chunk("вес четыреста пятьдесят")
+
+    def analyze(text):
+        first_chunk_analyzed.set()
+        return _analysis(text)
+
+    result = await run_transcription_pipeline(transcribe_chunks, analyze)
+
+    assert result.text == "корова ест сено вес четыреста пятьдесят"
+    assert result.analysis["behavior_state"] == "корова ест сено вес четыреста пятьдесят"
+
+
+async def test_empty_chunks_are_not_analyzed():
+    """✅ Пустые чанки не отправляются в LLM"""
+    analyzed = []
+
+    def analyze(text):
+        analyzed.append(text)
+        return _analysis(text)
+
+    result = await run_transcription_pipeline(lambda: iter([_chunk(""), _chunk("спит")]), analyze)
+
+    assert analyzed == ["спит"]
+    assert len(result.chunks) == 2
+
+
+async def test_confidence_is_weighted_by_duration():
+    """✅ Уверенность усредняется с весом по длительности чанков"""
+    chunks = [_chunk("а", confidence=1.0, audio_seconds=30.0), _chunk("б", confidence=0.5, audio_seconds=10.0)]
+
+    result = await run_transcription_pipeline(lambda: iter(chunks), lambda text: _analysis(text))
+
+    assert result.confidence == pytest.approx(0.875)
+    assert result.audio_seconds == 40.0
+
+
+async def test_transcription_error_is_raised():
+    """❌ Ошибка ASR пробрасывается из конвейера"""
+    def transcribe_chunks():
+        yield _chunk("начало")
+        raise RuntimeError("decoder crashed")
+
+    with pytest.raises(RuntimeError, match="decoder crashed"):
+        await run_transcription_pipeline(transcribe_chunks, lambda text: _analysis(text))
+
+
+def test_merge_analyses_combines_sections():
+    """✅ Поля из разных чанков объединяются, строки - без повторов"""
+    merged = merge_analyses([
+        _analysis("спокойна", weight="450 кг", food="сено"),
+        _analysis("спокойна", weight=None, food="комбикорм"),
+        _analysis("Не удалось проанализировать поведение", weight="450 кг"),
+    ])
+
+    assert merged["behavior_state"] == "спокойна"
+    assert merged["measurements"]["weight"] == "450 кг"
+    assert merged["measurements"]["temperature"] is None
+    assert merged["feeding_details"]["food_type"] == "сено; комбикорм"
+    assert merged["relationships"]["dominance"] is None
+
+
+def test_merge_single_analysis_is_unchanged():
+    """✅ Единственный чанк возвращается как есть"""
+    analysis = _analysis("лежит")
+    assert merge_analyses([analysis]) is analysis
+
+
+def test_merge_analyses_numbers_take_last_chunk():
+    """✅ Нестроковые значения не склеиваются: берётся значение последнего чанка, где оно есть"""
+    first, second, third = _analysis("стоит"), _analysis("стоит"), _analysis("стоит")
+    first["measurements"]["weight"] = 440
+    second["measurements"]["weight"] = 450
+    third["measurements"]["weight"] = None
+
+    assert merge_analyses([first, second, third])["measurements"]["weight"] == 450
+
+
+def test_merge_analyses_keeps_extra_fields_and_strips_duplicates():
+    """✅ Поля вне шаблона сохраняются, одинаковые строки с пробелами не дублируются"""
+    first, second = _analysis("ест"), _analysis("ест", food=" сено ")
+    first["feeding_details"]["food_type"] = "сено"
+    first["relationships"]["herd"] = "стадо 2"
+
+    merged = merge_analyses([first, second])
+
+    assert merged["feeding_details"]["food_type"] == "сено"
+    assert merged["relationships"]["herd"] == "стадо 2"
+
+
+def test_merge_failed_analyses_is_default():
+    """❌ Ни один чанк не проанализирован - ответ по умолчанию, без склейки заглушек"""
+    failed = "Не удалось проанализировать поведение"
+
+    merged = merge_analyses([_analysis(failed), _analysis(failed)])
+
+    assert merged["behavior_state"] == failed
+    assert merged["measurements"]["weight"] is None
+    assert merge_analyses([])["behavior_state"] == failed
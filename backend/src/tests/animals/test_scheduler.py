@@ -0,0 +1,105 @@
+import asyncio
+
+from core.metrics import REGISTRY
+from v1.animals.scheduler import InferenceScheduler, PriorityClass, priority_class
+
+
+class InMemoryFairShare:
+    """Заглушка FairShareTracker без Redis"""
+
+    def __init__(self, quota_seconds: float, usage: dict = None) -> None:
+        self.quota_seconds = quota_seconds
+        self.used = dict(usage or {})
+
+    async def usage(self, client_id: str) -> float:
+        return self.used.get(client_id, 0.0)
+
+    async def charge(self, client_id: str, seconds: float) -> None:
+        self.used[client_id] = self.used.get(client_id, 0.0) + seconds
+
+
+async def _run_jobs(scheduler: InferenceScheduler, jobs: list) -> list:
+    """Занимает единственный слот, ставит задачи в очередь и возвращает порядок их запуска"""
+    order = []
+    blocker_entered = asyncio.Event()
+    release_blocker = asyncio.Event()
+
+    async def blocker():
+        async with scheduler.slot("blocker", 1.0):
+            blocker_entered.set()
+            await release_blocker.wait()
+
+    async def job(name, client_id, seconds):
+        async with scheduler.slot(client_id, seconds):
+            order.append(name)
+
+    blocker_task = asyncio.create_task(blocker())
+    await blocker_entered.wait()
+    tasks = [asyncio.create_task(job(*spec)) for spec in jobs]
+    await asyncio.sleep(0)  # все задачи встали в очередь
+    release_blocker.set()
+    await asyncio.gather(blocker_task, *tasks)
+    return order
+
+
+async def test_shortest_job_first():
+    """✅ Короткие записи обслуживаются раньше длинных, независимо от порядка прихода"""
+    scheduler = InferenceScheduler(1, InMemoryFairShare(quota_seconds=10_000), aging_factor=0.0)
+
+    order = await _run_jobs(scheduler, [
+        ("long", "alice", 1800.0),
+        ("medium", "alice", 120.0),
+        ("short", "bob", 10.0),
+    ])
+
+    assert order == ["short", "medium", "long"]
+
+
+async def test_over_quota_client_is_served_last():
+    """✅ Клиент, превысивший квоту, не вытесняет остальных даже короткими задачами"""
+    fair_share = InMemoryFairShare(quota_seconds=600, usage={"greedy": 900})
+    scheduler = InferenceScheduler(1, fair_share, aging_factor=0.0)
+
+    order = await _run_jobs(scheduler, [
+        ("greedy-short", "greedy", 5.0),
+        ("polite-long", "polite", 300.0),
+    ])
+
+    assert order == ["polite-long", "greedy-short"]
+
+
+async def test_cancelled_waiter_leaves_queue():
+    """✅ Отменённая задача не занимает слот"""
+    scheduler = InferenceScheduler(1, InMemoryFairShare(quota_seconds=10_000))
+
+    async with scheduler.slot("a", 1.0):
+        waiter = asyncio.create_task(scheduler.slot("b", 1.0).__aenter__())
+        await asyncio.sleep(0)
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+
+    async with scheduler.slot("c", 1.0):
+        assert scheduler._running == 1
+
+
+def test_priority_classes():
+    """✅ Классы приоритета по оценке длительности"""
+    assert priority_class(10) == PriorityClass.SHORT
+    assert priority_class(120) == PriorityClass.MEDIUM
+    assert priority_class(1800) == PriorityClass.LONG
+
+
+async def test_queue_depth_metric_follows_latest_scheduler():
+    """✅ Глубину очереди отдаёт последний созданный планировщик, а не первый"""
+    InferenceScheduler(1, InMemoryFairShare(quota_seconds=10_000))
+    scheduler = InferenceScheduler(1, InMemoryFairShare(quota_seconds=10_000))
+    short_depth = 'inference_queue_depth{priority_class="short"}'
+
+    async with scheduler.slot("a", 1.0):
+        waiter = asyncio.create_task(scheduler.slot("b", 10.0).__aenter__())
+        await asyncio.sleep(0)
+        assert f"{short_depth} 1.0" in REGISTRY.render()
+        waiter.cancel()
+        await asyncio.gather(waiter, return_exceptions=True)
+
+    assert f"{short_depth} 0.0" in REGISTRY.render()
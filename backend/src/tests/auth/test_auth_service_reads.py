@@ -0,0 +1,42 @@
+import email_validator
+import pytest
+from fastapi import HTTPException
+
+from v1.auth import service as service_module
+from v1.auth.config import AuthServiceConfig
+from v1.auth.schemas import UserRegisterSchema
+
+
+class RecordingUnitOfWork:
+    """UnitOfWork, запоминающий режим открытия; пользователь с email уже есть"""
+
+    opened = []
+
+    def __init__(self, read_only: bool = False) -> None:
+        self.opened.append(read_only)
+        self.users = self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return None
+
+    async def select_user_by_email(self, email):
+        return {"email": email}
+
+
+async def test_registration_checks_read_from_replica(monkeypatch):
+    """✅ Проверка занятости email при регистрации - read-only UnitOfWork (реплика)"""
+    monkeypatch.setattr(email_validator, "CHECK_DELIVERABILITY", False)
+    monkeypatch.setattr(service_module, "UnitOfWork", RecordingUnitOfWork)
+    RecordingUnitOfWork.opened.clear()
+    service = service_module.AuthService(AuthServiceConfig(), redis_client=object())
+
+    with pytest.raises(HTTPException) as error:
+        await service.register_user(
+            UserRegisterSchema(email="taken@example.com", username="taken", password="secret-password")
+        )
+
+    assert error.value.status_code == 400
+    assert RecordingUnitOfWork.opened == [True]
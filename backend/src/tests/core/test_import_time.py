@@ -0,0 +1,60 @@
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+
+SRC_DIR = Path(__file__).resolve().parents[2]
+
+# Бюджет на импорт main (мс). Переопределяется через окружение для медленных CI-машин
+IMPORT_TIME_BUDGET_MS = int(os.getenv("IMPORT_TIME_BUDGET_MS", "3000"))
+
+# Модули ML-стека, которые не должны загружаться при старте API
+HEAVY_MODULES = ("torch", "torchaudio", "transformers", "gigachat")
+
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+
+def _profile_import(module: str) -> dict[str, int]:
+    """Запускает `python -X importtime -c 'import <module>'` и возвращает cumulative-время (мкс) по модулям"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=SRC_DIR,
+        capture_output=True,
+        text=True,
+        timeout=120,
+    )
+    if result.returncode != 0:
+        pytest.skip(f"Cannot import {module} in this environment: {result.stderr.strip().splitlines()[-1:]}")
+
+    timings = {}
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        if match:
+            timings[match.group(4)] = int(match.group(2))
+    return timings
+
+
+@pytest.fixture(scope="module")
+def main_import_timings():
+    return _profile_import("main")
+
+
+def test_main_does_not_import_ml_stack(main_import_timings):
+    """✅ Старт API не тянет torch/transformers/gigachat"""
+    loaded = sorted(
+        name for name in main_import_timings
+        if name.split(".")[0] in HEAVY_MODULES
+    )
+    assert not loaded, f"Heavy modules imported at API startup: {loaded}"
+
+
+def test_main_import_time_within_budget(main_import_timings):
+    """✅ Импорт main укладывается в бюджет"""
+    total_ms = main_import_timings["main"] / 1000
+    assert total_ms <= IMPORT_TIME_BUDGET_MS, (
+        f"Importing main took {total_ms:.0f} ms, budget is {IMPORT_TIME_BUDGET_MS} ms"
+    )
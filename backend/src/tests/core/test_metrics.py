@@ -0,0 +1,23 @@
+import pytest
+
+from core.metrics import MetricsRegistry, _Metric
+
+
+def test_label_values_are_escaped():
+    """✅ Обратная косая черта, кавычка и перевод строки в значении метки экранируются"""
+    registry = MetricsRegistry()
+    counter = registry.counter("test_requests_total", "Requests", labelnames=("path",))
+
+    counter.inc(path='C:\\logs "main"\nnext')
+
+    assert 'test_requests_total{path="C:\\\\logs \\"main\\"\\nnext"} 1.0' in registry.render()
+
+
+def test_metric_without_samples_cannot_be_created():
+    """❌ Базовый класс метрики абстрактный: samples() обязан реализовать наследник"""
+
+    class Incomplete(_Metric):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete("incomplete", "Incomplete metric")
@@ -0,0 +1,48 @@
+import json
+from datetime import datetime, timezone
+
+from fastapi.encoders import jsonable_encoder
+
+from common_schemas import ResponseSchema
+from core.responses import EnvelopeResponse
+from v1.animals.data_transfer import TransferStats
+from v1.animals.schemas import AnimalWithTranscriptionsResponse, TranscriptionResponse
+
+NOW = datetime(2026, 5, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+
+
+def _animal() -> AnimalWithTranscriptionsResponse:
+    transcription = TranscriptionResponse(
+        id=1, animal_id=7, measurements={"weight": "450 кг", "history": [1, 2, {"a": None}]},
+        weight_kg=450.0, created_at=NOW, updated_at=NOW,
+    )
+    return AnimalWithTranscriptionsResponse(
+        id=7, animal="корова", name="Зорька", created_at=NOW, updated_at=NOW, transcriptions=[transcription]
+    )
+
+
+def test_envelope_matches_response_schema():
+    """✅ Байты ответа совпадают по содержимому с прежним ResponseSchema(data=model_dump())"""
+    animal = _animal()
+
+    fast = json.loads(EnvelopeResponse(animal).body)
+    legacy = jsonable_encoder(ResponseSchema(exception=0, data=animal.model_dump()))
+
+    assert fast == legacy
+    assert fast["data"]["transcriptions"][0]["created_at"] == "2026-05-01T12:30:15.123456Z"
+
+
+def test_envelope_keeps_message_and_plain_data():
+    """✅ Конверт с message и обычным dict вместо модели"""
+    body = json.loads(EnvelopeResponse({"deleted": True}, message="ok").body)
+
+    assert body == {"exception": 0, "data": {"deleted": True}, "message": "ok"}
+
+
+def test_computed_fields_are_serialized():
+    """✅ Модели с computed_field сериализуются через model_dump"""
+    stats = TransferStats(table="animals", format="csv", rows=10, seconds=2)
+
+    data = json.loads(EnvelopeResponse(stats).body)["data"]
+
+    assert data == {"table": "animals", "format": "csv", "rows": 10, "seconds": 2.0, "rows_per_second": 5.0}
@@ -0,0 +1,63 @@
+"""Общие заглушки результатов и соединений для тестов репозиториев без базы"""
+
+
+class FakeRow:
+    """Строка Core-результата: доступ по атрибутам и _mapping"""
+
+    def __init__(self, **values) -> None:
+        self._mapping = values
+        self.__dict__.update(values)
+
+
+class FakeResult:
+    """
+    Результат execute: строки, rowcount и скалярное значение
+
+    scalars() есть только у результата с ids (RETURNING id в сессии); на голом
+    соединении репозиторий не должен его вызывать.
+    """
+
+    def __init__(self, rows=(), rowcount: int = 0, scalar=None, ids=None) -> None:
+        self._rows = list(rows)
+        self.rowcount = rowcount
+        self._scalar = scalar
+        self._ids = ids
+
+    def all(self):
+        return list(self._rows)
+
+    def one(self):
+        return self._rows[0]
+
+    def one_or_none(self):
+        return self._rows[0] if self._rows else None
+
+    def scalar_one(self):
+        return self._scalar
+
+    def scalars(self):
+        if self._ids is None:
+            raise AssertionError("ORM scalars() must not be used on a connection")
+        return FakeResult(self._ids)
+
+
+class FakeConnection:
+    """
+    Голое соединение (не AsyncSession): отдаёт заготовленные результаты по очереди
+
+    Результат - FakeResult или список строк; выполненные выражения и параметры
+    сохраняются в calls.
+    """
+
+    def __init__(self, *results) -> None:
+        self.results = list(results)
+        self.calls = []
+
+    @property
+    def statements(self) -> list:
+        return [statement for statement, _ in self.calls]
+
+    async def execute(self, statement, params=None):
+        self.calls.append((statement, params))
+        result = self.results.pop(0)
+        return result if isinstance(result, FakeResult) else FakeResult(result)
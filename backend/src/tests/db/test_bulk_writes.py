@@ -0,0 +1,75 @@
+import itertools
+from datetime import datetime
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import asyncpg
+
+from common_models import Animal, AnimalTranscription
+from common_schemas import AnimalCreate, AnimalTranscriptionCreate
+from db.postgres.animal.animal_repository import AnimalRepository
+from db.postgres.base import _copy_value
+from tests.db.conftest import FakeResult
+
+
+class BatchRecordingSession:
+    """Запоминает пачки параметров и выдаёт последовательные id"""
+
+    def __init__(self) -> None:
+        self.batches = []
+        self.statements = []
+        self._ids = itertools.count(1)
+
+    async def execute(self, statement, params=None):
+        self.statements.append(str(statement.compile(dialect=asyncpg.dialect())))
+        self.batches.append(params)
+        return FakeResult(ids=[next(self._ids) for _ in params], rowcount=len(params))
+
+
+def _animals(count: int):
+    return [AnimalCreate(animal="корова", name=f"Животное {i}") for i in range(count)]
+
+
+async def test_insert_many_batches_and_keeps_id_order():
+    """✅ Пачки по batch_size, id возвращаются в порядке входных объектов"""
+    session = BatchRecordingSession()
+
+    ids = await AnimalRepository(session).insert_many(_animals(2500), batch_size=1000)
+
+    assert [len(batch) for batch in session.batches] == [1000, 1000, 500]
+    assert ids == list(range(1, 2501))
+    assert session.batches[2][0]["name"] == "Животное 2000"
+
+
+async def test_upsert_many_targets_unique_index_expression():
+    """✅ Upsert по уникальному индексу lower(name) обновляет переданные поля"""
+    session = BatchRecordingSession()
+
+    ids = await AnimalRepository(session).upsert_many(
+        _animals(3), conflict_target=[func.lower(Animal.name)], update_columns=["animal"]
+    )
+
+    assert ids == [1, 2, 3]
+    assert "ON CONFLICT (lower(name)) DO UPDATE SET animal = excluded.animal, updated_at = now()" in session.statements[0]
+
+
+async def test_update_many_is_one_executemany_per_batch():
+    """✅ Обновление по id - executemany, счётчик обновлённых строк"""
+    session = BatchRecordingSession()
+    values = [{"id": i, "animal": "коза"} for i in range(1, 6)]
+
+    updated = await AnimalRepository(session).update_many(values, batch_size=2)
+
+    assert updated == 5
+    assert [len(batch) for batch in session.batches] == [2, 2, 1]
+    assert session.batches[0][0] == {"_id": 1, "_animal": "коза"}
+    assert "WHERE animals.id = $" in session.statements[0]
+
+
+def test_copy_values_fill_python_defaults_and_serialize_json():
+    """✅ Для COPY заполняются умолчания колонок, JSONB передаётся строкой"""
+    dump = AnimalTranscriptionCreate(animal_id=1, measurements={"вес": "450 кг"}).model_dump()
+    columns = AnimalTranscription.__table__.c
+
+    assert _copy_value(columns.measurements, dump) == '{"вес": "450 кг"}'
+    assert isinstance(_copy_value(columns.created_at, dump), datetime)
+    assert _copy_value(columns.feeding_details, dump) is None
@@ -0,0 +1,74 @@
+from sqlalchemy.dialects.postgresql import asyncpg
+
+from db.postgres.animal.animal_repository import AnimalRepository
+from tests.db.conftest import FakeResult
+
+
+class FakeSession:
+    """Отвечает оценкой планировщика на pg_class/EXPLAIN и точным числом на COUNT(*)"""
+
+    def __init__(self, estimate: int, exact: int) -> None:
+        self.estimate = estimate
+        self.exact = exact
+        self.statements = []
+
+    async def execute(self, statement, params=None):
+        sql = str(statement)
+        self.statements.append(sql)
+        self.compiled = statement.compile(dialect=asyncpg.dialect())
+        if sql.startswith("EXPLAIN"):
+            return FakeResult(scalar=[{"Plan": {"Plan Rows": self.estimate}}])
+        return FakeResult(scalar=self.estimate if "pg_class" in sql else self.exact)
+
+
+async def test_small_table_is_counted_exactly():
+    """✅ Небольшая таблица - точный COUNT(*)"""
+    session = FakeSession(estimate=1_000, exact=1_003)
+
+    total = await AnimalRepository(session).count()
+
+    assert (total.value, total.exact) == (1_003, True)
+    assert len(session.statements) == 2
+
+
+async def test_large_table_uses_planner_estimate():
+    """✅ Большая таблица - оценка планировщика без сканирования"""
+    session = FakeSession(estimate=5_000_000, exact=0)
+
+    total = await AnimalRepository(session).count()
+
+    assert (total.value, total.exact) == (5_000_000, False)
+    assert len(session.statements) == 1
+
+
+async def test_small_filtered_selection_is_counted_exactly():
+    """✅ Небольшая выборка по типу - точный COUNT(*) после оценки через EXPLAIN"""
+    session = FakeSession(estimate=120, exact=118)
+
+    total = await AnimalRepository(session).count_by_animal_type("корова")
+
+    assert (total.value, total.exact) == (118, True)
+    assert session.statements[0].startswith("EXPLAIN (FORMAT JSON) SELECT animals.id")
+    assert "pg_class" not in session.statements[0]
+
+
+async def test_large_filtered_selection_uses_explain_estimate():
+    """✅ Большая выборка по типу - оценка из плана, без подсчёта строк"""
+    session = FakeSession(estimate=200_000, exact=0)
+
+    total = await AnimalRepository(session).count_by_animal_type("корова")
+
+    assert (total.value, total.exact) == (200_000, False)
+    assert len(session.statements) == 1
+
+
+async def test_filter_values_stay_bind_parameters_in_explain():
+    """❌ Двоеточие и кавычка в типе не становятся частью текста EXPLAIN"""
+    session = FakeSession(estimate=200_000, exact=0)
+    animal_type = "cow :x' OR '1'='1"
+
+    await AnimalRepository(session).count_by_animal_type(animal_type)
+
+    compiled = session.compiled
+    assert animal_type not in compiled.string and ":x" not in compiled.string
+    assert list(compiled.params.values()) == [animal_type]
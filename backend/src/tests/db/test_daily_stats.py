@@ -0,0 +1,84 @@
+from datetime import date, datetime, timezone
+from pathlib import Path
+
+from sqlalchemy.dialects import postgresql
+
+from db.postgres.animal.daily_stats_repository import AnimalDailyStatsRepository
+from tests.db.conftest import FakeConnection, FakeResult, FakeRow
+
+MIGRATIONS_DIR = Path(__file__).resolve().parents[3] / "alembic" / "versions"
+
+
+def _sql(statement) -> str:
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+async def test_range_reads_averages_from_sums():
+    """✅ Средние считаются из сумм и количеств, без чтения транскрипций"""
+    row = FakeRow(
+        animal_id=1, day=date(2026, 5, 1), notes_count=3, weight_min=440.0, weight_max=460.0, weight_avg=450.0,
+        temperature_min=None, temperature_max=None, temperature_avg=None, feed_quantity=12.5,
+    )
+    connection = FakeConnection(FakeResult([row]))
+
+    days = await AnimalDailyStatsRepository(connection).find_range(1, date(2026, 4, 1), date(2026, 5, 1))
+
+    assert days[0].weight_avg == 450.0 and days[0].temperature_avg is None
+    sql = _sql(connection.calls[0][0])
+    assert "animal_daily_stats.weight_sum / CAST(nullif(animal_daily_stats.weight_count" in sql
+    assert "animal_transcriptions" not in sql
+
+
+def _partition(name: str, start: str, end: str, detach_pending: bool = False) -> FakeRow:
+    bound = f"FOR VALUES FROM ('{start} 00:00:00+00') TO ('{end} 00:00:00+00')"
+    return FakeRow(relname=name, bound=bound, inhdetachpending=detach_pending)
+
+
+async def test_rebuild_one_animal():
+    """✅ Пересборка одного животного удаляет и пересчитывает только его дни"""
+    partitions = [_partition("animal_transcriptions_2026_05", "2026-05-01", "2026-06-01")]
+    connection = FakeConnection(partitions, FakeResult(), FakeResult(rowcount=5))
+
+    days = await AnimalDailyStatsRepository(connection).rebuild(animal_id=7)
+
+    _, deletion, insertion = connection.calls
+    assert days == 5
+    assert "animal_daily_stats.animal_id = %(animal_id_1)s" in _sql(deletion[0])
+    assert "WHERE animal_id = :animal_id AND" in insertion[0].text
+    assert insertion[1]["animal_id"] == 7
+
+
+async def test_rebuild_keeps_archived_months():
+    """✅ Удаляются и пересчитываются только дни подключённых партиций, архивные месяцы остаются"""
+    partitions = [
+        _partition("animal_transcriptions_2026_05", "2026-05-01", "2026-06-01"),
+        _partition("animal_transcriptions_2026_04", "2026-04-01", "2026-05-01", detach_pending=True),
+    ]
+    connection = FakeConnection(partitions, FakeResult(), FakeResult(rowcount=31))
+
+    await AnimalDailyStatsRepository(connection).rebuild()
+
+    _, deletion, insertion = connection.calls
+    compiled = deletion[0].compile(dialect=postgresql.dialect())
+    assert "animal_daily_stats.day >= %(day_1)s AND animal_daily_stats.day < %(day_2)s" in str(compiled)
+    assert (compiled.params["day_1"], compiled.params["day_2"]) == (date(2026, 5, 1), date(2026, 6, 1))
+    assert insertion[1] == {
+        "start_0": datetime(2026, 5, 1, tzinfo=timezone.utc),
+        "end_0": datetime(2026, 6, 1, tzinfo=timezone.utc),
+    }
+
+
+async def test_rebuild_without_partitions_keeps_stats():
+    """❌ Нет подключённых партиций - сводки не удаляются"""
+    connection = FakeConnection([])
+
+    assert await AnimalDailyStatsRepository(connection).rebuild() == 0
+    assert len(connection.calls) == 1
+
+
+def test_trigger_aggregates_per_statement():
+    """✅ Триггер срабатывает один раз на оператор и читает переходную таблицу"""
+    migration = (MIGRATIONS_DIR / "0001_initial_schema.py").read_text(encoding="utf-8")
+
+    assert "REFERENCING NEW TABLE AS inserted_transcriptions" in migration
+    assert "FOR EACH STATEMENT EXECUTE FUNCTION animal_daily_stats_on_insert()" in migration
@@ -0,0 +1,59 @@
+import re
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateTable
+
+from common_models import MEASUREMENT_NUMBER_PATTERN, AnimalTranscription
+from db.postgres.animal.transcription_repository import AnimalTranscriptionRepository
+
+
+def _normalize(value: str):
+    """То же, что выражение генерируемой колонки, на Python"""
+    match = re.search(MEASUREMENT_NUMBER_PATTERN, value)
+    return float(match.group().replace(",", ".")) if match else None
+
+
+def test_measurement_strings_are_normalized():
+    """✅ Из строк LLM извлекается первое число, десятичная запятая допускается"""
+    assert _normalize("450 кг") == 450.0
+    assert _normalize("38,5 °C") == 38.5
+    assert _normalize("около 39.2 градусов") == 39.2
+    assert _normalize("-3") == -3.0
+
+
+def test_measurement_without_number_is_null():
+    """❌ Строка без числа даёт NULL"""
+    assert _normalize("не указан") is None
+
+
+def test_generated_columns_are_stored():
+    """✅ weight_kg, temperature_c и feed_quantity - STORED-колонки, вычисляемые из JSONB"""
+    ddl = str(CreateTable(AnimalTranscription.__table__).compile(dialect=postgresql.dialect()))
+
+    assert "weight_kg NUMERIC GENERATED ALWAYS AS (replace(substring(measurements ->> 'weight'" in ddl
+    assert "temperature_c NUMERIC GENERATED ALWAYS AS (replace(substring(measurements ->> 'temperature'" in ddl
+    assert "feed_quantity NUMERIC GENERATED ALWAYS AS (replace(substring(feeding_details ->> 'quantity'" in ddl
+    assert ddl.count("STORED") == 3
+
+
+def test_range_filters_match_partial_index():
+    """✅ Диапазон по весу: границы включительно и условие частичного индекса"""
+    repository = AnimalTranscriptionRepository(None)
+
+    filters = repository._range_filters(AnimalTranscription.weight_kg, 400, 500, animal_id=None)
+    sql = [str(f.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})) for f in filters]
+
+    assert sql == [
+        "animal_transcriptions.weight_kg IS NOT NULL",
+        "animal_transcriptions.weight_kg >= 400",
+        "animal_transcriptions.weight_kg <= 500",
+    ]
+
+
+def test_open_range_filters_by_animal():
+    """✅ Без верхней границы - только нижняя, плюс фильтр по животному"""
+    repository = AnimalTranscriptionRepository(None)
+
+    filters = repository._range_filters(AnimalTranscription.temperature_c, 39.5, None, animal_id=7)
+
+    assert len(filters) == 3
@@ -0,0 +1,74 @@
+import pytest
+
+from db.postgres import migrations
+
+
+@pytest.fixture
+def schema(monkeypatch):
+    """Версии схемы без БД: head, текущая ревизия и учёт вызовов upgrade"""
+    state = {"head": "0001", "current": "0001", "unversioned": False, "upgrades": 0, "resets": 0}
+
+    async def current_revision():
+        return state["current"]
+
+    async def has_unversioned_schema():
+        return state["unversioned"]
+
+    def reset_schema():
+        state["resets"] += 1
+        state["unversioned"] = False
+
+    def upgrade_to_head():
+        state["upgrades"] += 1
+
+    monkeypatch.setattr(migrations, "head_revision", lambda: state["head"])
+    monkeypatch.setattr(migrations, "current_revision", current_revision)
+    monkeypatch.setattr(migrations, "upgrade_to_head", upgrade_to_head)
+    monkeypatch.setattr(migrations, "has_unversioned_schema", has_unversioned_schema)
+    monkeypatch.setattr(migrations, "reset_schema", reset_schema)
+    return state
+
+
+async def test_current_schema_starts_without_ddl(schema):
+    """✅ Схема на head - миграции не запускаются"""
+    await migrations.ensure_schema_current(migrate=True)
+
+    assert schema["upgrades"] == 0
+
+
+async def test_outdated_schema_is_migrated(schema):
+    """✅ Пустая БД или старая ревизия - upgrade head"""
+    schema["current"] = None
+
+    await migrations.ensure_schema_current(migrate=True)
+
+    assert schema["upgrades"] == 1
+
+
+async def test_outdated_schema_without_migrate_fails(schema):
+    """❌ Без разрешения мигрировать воркер не стартует на старой схеме"""
+    schema["current"] = None
+
+    with pytest.raises(RuntimeError, match="alembic upgrade head"):
+        await migrations.ensure_schema_current(migrate=False)
+    assert schema["upgrades"] == 0
+
+
+async def test_unversioned_schema_refuses_to_start(schema):
+    """❌ Таблицы от create_all без alembic_version - не мигрируем поверх, а останавливаемся"""
+    schema.update(current=None, unversioned=True)
+
+    with pytest.raises(RuntimeError, match="alembic stamp 0001"):
+        await migrations.ensure_schema_current(migrate=True)
+    assert schema["upgrades"] == 0
+    assert schema["resets"] == 0
+
+
+async def test_unversioned_schema_is_recreated_when_allowed(schema):
+    """✅ С POSTGRES_RESET_UNVERSIONED_SCHEMA схема пересоздаётся и мигрируется до head"""
+    schema.update(current=None, unversioned=True)
+
+    await migrations.ensure_schema_current(migrate=True, reset_unversioned=True)
+
+    assert schema["resets"] == 1
+    assert schema["upgrades"] == 1
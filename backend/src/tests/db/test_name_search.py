@@ -0,0 +1,72 @@
+from datetime import datetime, timezone
+
+from sqlalchemy.dialects.postgresql import asyncpg
+
+from db.postgres.animal.animal_repository import AnimalRepository
+from pagination import decode_cursor, encode_cursor
+from tests.db.conftest import FakeResult, FakeRow
+
+
+class CapturingSession:
+    def __init__(self, rows) -> None:
+        self.rows = rows
+        self.statements = []
+
+    async def execute(self, statement, params=None):
+        self.statements.append(
+            str(statement.compile(dialect=asyncpg.dialect(), compile_kwargs={"literal_binds": True}))
+        )
+        return FakeResult(self.rows)
+
+
+def _row(animal_id: int, name: str, score: float) -> FakeRow:
+    """Строка Core-результата: колонки животного и похожесть"""
+    now = datetime(2026, 5, 1, tzinfo=timezone.utc)
+    return FakeRow(id=animal_id, animal="корова", name=name, created_at=now, updated_at=now, score=score)
+
+
+async def test_search_runs_in_sql_ranked_by_similarity():
+    """✅ Поиск - один запрос: ILIKE и % по триграммам, сортировка по похожести"""
+    session = CapturingSession([])
+
+    await AnimalRepository(session).search_ranked_by_name("Бур_ёнка%", limit=20)
+
+    sql = session.statements[0]
+    assert "animals.name ILIKE '%Бур" in sql and "ESCAPE" in sql
+    assert "animals.name % 'Бур_ёнка%'" in sql
+    assert "ORDER BY similarity(animals.name, 'Бур_ёнка%') DESC, animals.id DESC" in sql
+    assert "LIMIT 21" in sql
+
+
+async def test_search_cursor_continues_after_last_score_and_id():
+    """✅ Курсор следующей страницы - (похожесть, id) последней строки"""
+    rows = [_row(i, f"Зорька {i}", 1.0 - i / 10) for i in (1, 2, 3)]
+    session = CapturingSession(rows)
+    repository = AnimalRepository(session)
+
+    page = await repository.search_ranked_by_name("Зорька", limit=2)
+    await repository.search_ranked_by_name("Зорька", cursor=page.next_cursor, limit=2)
+
+    assert [animal.id for animal in page.items] == [1, 2]
+    assert decode_cursor(page.next_cursor, 2) == [0.8, 2]
+    assert "(similarity(animals.name, 'Зорька'), animals.id) < (0.8, 2)" in session.statements[1]
+
+
+async def test_last_search_page_has_no_cursor():
+    """✅ Без лишней строки курсора нет"""
+    session = CapturingSession([_row(1, "Зорька", 1.0)])
+
+    page = await AnimalRepository(session).search_ranked_by_name("Зорька", cursor=encode_cursor([0.9, 5]))
+
+    assert page.next_cursor is None
+
+
+async def test_search_mappings_skip_schema_validation():
+    """✅ mappings=True - строки отдаются как есть (колонки без схем), курсор тот же"""
+    rows = [_row(i, f"Зорька {i}", 1.0 - i / 10) for i in (1, 2, 3)]
+    session = CapturingSession(rows)
+
+    page = await AnimalRepository(session).search_ranked_by_name("Зорька", limit=2, mappings=True)
+
+    assert page.items == [rows[0]._mapping, rows[1]._mapping]
+    assert decode_cursor(page.next_cursor, 2) == [0.8, 2]
@@ -0,0 +1,73 @@
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from common_models import Animal, AnimalTranscription
+from exceptions import InvalidCursor
+from pagination import build_page, decode_cursor, encode_cursor, paginate_keyset
+
+
+def _sql(query) -> str:
+    return str(query.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+def test_cursor_roundtrip_keeps_datetime():
+    """✅ Курсор восстанавливает значения ключа, включая datetime"""
+    created_at = datetime(2026, 5, 1, 12, 30, tzinfo=timezone.utc)
+
+    cursor = encode_cursor([created_at, 42])
+
+    assert decode_cursor(cursor, 2) == [created_at, 42]
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!!", encode_cursor([1, 2]), "e30"])
+def test_invalid_cursor_is_rejected(cursor):
+    """❌ Повреждённый курсор или курсор от другого ключа - 400"""
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor, 1)
+
+
+def test_keyset_query_uses_row_comparison():
+    """✅ Следующая страница выбирается сравнением (created_at, id), без OFFSET"""
+    cursor = encode_cursor([datetime(2026, 5, 1, tzinfo=timezone.utc), 10])
+    keys = [AnimalTranscription.created_at, AnimalTranscription.id]
+
+    sql = _sql(paginate_keyset(select(AnimalTranscription), keys, cursor, 20, descending=True))
+
+    assert "(animal_transcriptions.created_at, animal_transcriptions.id) < (" in sql
+    assert "ORDER BY animal_transcriptions.created_at DESC, animal_transcriptions.id DESC" in sql
+    assert "LIMIT 21" in sql
+    assert "OFFSET" not in sql
+
+
+def test_keyset_query_bounds_partition_key():
+    """✅ Для отсечения партиций к row-value добавляется условие на created_at"""
+    cursor = encode_cursor([datetime(2026, 5, 1, tzinfo=timezone.utc), 10])
+    keys = [AnimalTranscription.created_at, AnimalTranscription.id]
+
+    sql = _sql(paginate_keyset(select(AnimalTranscription), keys, cursor, 20, descending=True))
+
+    assert "AND animal_transcriptions.created_at <= " in sql
+
+
+def test_first_page_has_no_cursor_condition():
+    """✅ Первая страница - просто сортировка и LIMIT"""
+    sql = _sql(paginate_keyset(select(Animal), [Animal.id], None, 50))
+
+    assert "WHERE" not in sql
+    assert "ORDER BY animals.id ASC" in sql
+    assert "LIMIT 51" in sql
+
+
+def test_build_page_sets_next_cursor_only_when_more_rows():
+    """✅ next_cursor есть, только если была лишняя строка"""
+    rows = [{"id": i} for i in range(1, 4)]
+
+    page = build_page(rows, ("id",), limit=2)
+    last_page = build_page(rows, ("id",), limit=3)
+
+    assert [row["id"] for row in page.items] == [1, 2]
+    assert decode_cursor(page.next_cursor, 1) == [2]
+    assert last_page.next_cursor is None
@@ -0,0 +1,61 @@
+from datetime import date
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateTable
+
+from common_models import AnimalTranscription
+from db.postgres.partitions import add_months, attached_partitions, month_partition, partitions_between
+from tests.db.conftest import FakeConnection, FakeRow
+
+
+def test_table_is_partitioned_by_created_at():
+    """✅ Таблица секционирована по created_at, ключ секционирования входит в PK"""
+    ddl = str(CreateTable(AnimalTranscription.__table__).compile(dialect=postgresql.dialect()))
+
+    assert "PARTITION BY RANGE (created_at)" in ddl
+    assert "PRIMARY KEY (id, created_at)" in ddl
+    assert "id BIGSERIAL" in ddl
+
+
+def test_month_arithmetic_crosses_years():
+    """✅ Сдвиг месяцев через границу года в обе стороны"""
+    assert add_months(date(2026, 11, 1), 3) == date(2027, 2, 1)
+    assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+
+
+def test_month_partition_bounds():
+    """✅ Партиция месяца: имя по году и месяцу, границы [1-е число, 1-е число следующего)"""
+    partition = month_partition(date(2026, 12, 17))
+
+    assert partition.name == "animal_transcriptions_2026_12"
+    assert (partition.start, partition.end) == (date(2026, 12, 1), date(2027, 1, 1))
+
+
+def test_partitions_between_includes_both_months():
+    """✅ Диапазон месяцев включает первый и последний"""
+    names = [p.name for p in partitions_between(date(2026, 10, 19), date(2027, 1, 1))]
+
+    assert names == [
+        "animal_transcriptions_2026_10",
+        "animal_transcriptions_2026_11",
+        "animal_transcriptions_2026_12",
+        "animal_transcriptions_2027_01",
+    ]
+
+
+async def test_attached_partitions_parse_bounds():
+    """✅ Границы партиций читаются из pg_get_expr, DEFAULT-партиция пропускается"""
+    rows = [
+        FakeRow(
+            relname="animal_transcriptions_2026_05",
+            bound="FOR VALUES FROM ('2026-05-01 00:00:00+00') TO ('2026-06-01 00:00:00+00')",
+            inhdetachpending=True,
+        ),
+        FakeRow(relname="animal_transcriptions_default", bound="DEFAULT", inhdetachpending=False),
+    ]
+
+    partitions = await attached_partitions(FakeConnection(rows))
+
+    assert list(partitions) == ["animal_transcriptions_2026_05"]
+    partition = partitions["animal_transcriptions_2026_05"]
+    assert partition.end == date(2026, 6, 1) and partition.detach_pending
@@ -0,0 +1,77 @@
+import sqlite3
+
+import pytest
+from sqlalchemy import exc
+from sqlalchemy.pool import QueuePool
+
+from config import DatabaseConfig
+from core.metrics import REGISTRY
+from db.postgres.pool import (
+    POOL_CHECKOUT_SECONDS,
+    POOL_CHECKOUT_TIMEOUTS,
+    InstrumentedPoolMixin,
+    async_database_url,
+    async_engine_options,
+)
+
+
+class InstrumentedQueuePool(InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+def _pool(name: str, **kwargs) -> InstrumentedQueuePool:
+    return InstrumentedQueuePool(lambda: sqlite3.connect(":memory:"), logging_name=name, **kwargs)
+
+
+def test_pool_settings_come_from_config():
+    """✅ Размер пула, overflow, timeout, recycle и pre-ping задаются в DatabaseConfig"""
+    config = DatabaseConfig(
+        POSTGRES_POOL_SIZE=20, POSTGRES_MAX_OVERFLOW=5, POSTGRES_POOL_TIMEOUT=2.5,
+        POSTGRES_POOL_RECYCLE=600, POSTGRES_POOL_PRE_PING=False, POSTGRES_STATEMENT_CACHE_SIZE=500,
+    )
+
+    options = async_engine_options(config, pool_name="primary")
+
+    assert (options["pool_size"], options["max_overflow"], options["pool_timeout"]) == (20, 5, 2.5)
+    assert (options["pool_recycle"], options["pool_pre_ping"]) == (600, False)
+    assert options["connect_args"] == {"statement_cache_size": 500}
+    assert async_database_url(config, "db", 5432).endswith("@db:5432/postgres?prepared_statement_cache_size=500")
+
+
+def test_pgbouncer_mode_disables_prepared_statement_caches():
+    """✅ Режим PgBouncer: без кэшей подготовленных выражений, уникальные имена выражений"""
+    config = DatabaseConfig(POSTGRES_PGBOUNCER_MODE=True, POSTGRES_STATEMENT_CACHE_SIZE=500)
+
+    options = async_engine_options(config, pool_name="primary")
+    name_func = options["connect_args"]["prepared_statement_name_func"]
+
+    assert options["connect_args"]["statement_cache_size"] == 0
+    assert name_func() != name_func()
+    assert async_database_url(config, "db", 6432).endswith("?prepared_statement_cache_size=0")
+
+
+def test_pool_usage_is_exported():
+    """✅ Ожидание соединения, занятые соединения и overflow видны в /metrics"""
+    pool = _pool("test_usage", pool_size=1, max_overflow=1)
+    checkouts_before = POOL_CHECKOUT_SECONDS.count(pool="test_usage")
+
+    first, second = pool.connect(), pool.connect()
+    rendered = REGISTRY.render()
+
+    assert POOL_CHECKOUT_SECONDS.count(pool="test_usage") == checkouts_before + 2
+    assert 'db_pool_connections_in_use{pool="test_usage"} 2.0' in rendered
+    assert 'db_pool_overflow{pool="test_usage"} 1.0' in rendered
+    first.close()
+    second.close()
+
+
+def test_checkout_timeout_is_counted():
+    """❌ Исчерпанный пул - TimeoutError и счётчик таймаутов"""
+    pool = _pool("test_timeout", pool_size=1, max_overflow=0, timeout=0.01)
+    held = pool.connect()
+
+    with pytest.raises(exc.TimeoutError):
+        pool.connect()
+
+    assert POOL_CHECKOUT_TIMEOUTS.value(pool="test_timeout") == 1
+    held.close()
@@ -0,0 +1,63 @@
+from datetime import datetime, timezone
+
+from db.postgres.animal.animal_repository import AnimalRepository
+from db.postgres.animal.transcription_repository import AnimalTranscriptionRepository
+from tests.db.conftest import FakeConnection, FakeRow
+
+NOW = datetime(2026, 5, 1, tzinfo=timezone.utc)
+
+
+def _animal_row(animal_id: int = 1) -> FakeRow:
+    return FakeRow(id=animal_id, animal="корова", name="Зорька", created_at=NOW, updated_at=NOW)
+
+
+def _transcription_row(transcription_id: int) -> FakeRow:
+    return FakeRow(
+        id=transcription_id, animal_id=1, behavior_state="спокойна", measurements={"weight": "450 кг"},
+        feeding_details=None, relationships=None, created_at=NOW, updated_at=NOW,
+    )
+
+
+async def test_rows_are_validated_without_orm_objects():
+    """✅ На соединении запрос выбирает колонки таблицы, ответ - схема из строки"""
+    connection = FakeConnection([_animal_row(7)])
+
+    animal = await AnimalRepository(connection).find_by_id(7)
+
+    assert animal.id == 7 and animal.name == "Зорька"
+    assert [column.name for column in connection.statements[0].selected_columns] == [
+        "id", "animal", "name", "created_at", "updated_at"
+    ]
+
+
+async def test_missing_row_returns_none():
+    """✅ Нет строки - None, как и в ORM-режиме"""
+    assert await AnimalRepository(FakeConnection([])).find_by_id(404) is None
+
+
+async def test_recent_transcriptions_with_details():
+    """✅ Транскрипции животного для карточки - один запрос по курсору, без selectinload"""
+    connection = FakeConnection([_transcription_row(1), _transcription_row(2)])
+
+    page = await AnimalTranscriptionRepository(connection).find_recent_by_animal_id(1, limit=5)
+
+    assert [t.id for t in page.items] == [1, 2]
+    assert page.items[0].measurements == {"weight": "450 кг"}
+    assert page.next_cursor is None
+    assert len(connection.statements) == 1
+
+
+async def test_recent_transcriptions_without_details():
+    """✅ Краткий режим не выбирает JSONB-колонки и отдаёт курсор следующей страницы"""
+    summary_row = FakeRow(id=1, animal_id=1, behavior_state="спокойна", created_at=NOW, updated_at=NOW)
+    connection = FakeConnection([summary_row, FakeRow(**{**summary_row._mapping, "id": 2})])
+
+    page = await AnimalTranscriptionRepository(connection).find_recent_by_animal_id(
+        1, limit=1, include_details=False
+    )
+
+    selected = [column.name for column in connection.statements[0].selected_columns]
+    assert not {"measurements", "feeding_details", "relationships"} & set(selected)
+    assert [t.id for t in page.items] == [1]
+    assert page.items[0].measurements is None
+    assert page.next_cursor is not None
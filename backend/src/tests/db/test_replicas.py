@@ -0,0 +1,85 @@
+from types import SimpleNamespace
+
+from db.postgres.replicas import ReplicaRouter, read_your_writes_key
+
+
+class FakeEngine:
+    """Движок реплики: отвечает лагом или падает при проверке здоровья"""
+
+    def __init__(self, host: str, lag: float = 0.0, down: bool = False) -> None:
+        self.url = SimpleNamespace(host=host)
+        self.lag = lag
+        self.down = down
+        self.checks = 0
+
+    def connect(self):
+        engine = self
+
+        class _Connection:
+            async def __aenter__(self):
+                engine.checks += 1
+                if engine.down:
+                    raise ConnectionRefusedError(engine.url.host)
+                return self
+
+            async def __aexit__(self, *exc):
+                return False
+
+            async def execute(self, statement):
+                return SimpleNamespace(scalar=lambda: engine.lag)
+
+        return _Connection()
+
+
+async def _picks(router: ReplicaRouter, count: int) -> list:
+    return [getattr(await router.pick(), "url", SimpleNamespace(host="primary")).host for _ in range(count)]
+
+
+async def test_reads_are_spread_round_robin():
+    """✅ Чтения распределяются по репликам по кругу"""
+    router = ReplicaRouter([FakeEngine("r1"), FakeEngine("r2")])
+
+    assert await _picks(router, 4) == ["r1", "r2", "r1", "r2"]
+
+
+async def test_unhealthy_replica_is_skipped_until_next_check():
+    """✅ Упавшая реплика пропускается и не проверяется чаще интервала"""
+    broken = FakeEngine("r1", down=True)
+    router = ReplicaRouter([broken, FakeEngine("r2")], health_check_interval=60)
+
+    assert await _picks(router, 3) == ["r2", "r2", "r2"]
+    assert broken.checks == 1
+
+
+async def test_lagging_replica_is_skipped_when_lag_limit_set():
+    """✅ Отставшая реплика не используется, если задан max_lag_seconds"""
+    router = ReplicaRouter([FakeEngine("r1", lag=30.0), FakeEngine("r2", lag=0.5)], max_lag_seconds=10.0)
+
+    assert await _picks(router, 2) == ["r2", "r2"]
+
+
+async def test_all_replicas_down_falls_back_to_primary():
+    """✅ Без здоровых реплик чтение идёт на primary"""
+    router = ReplicaRouter([FakeEngine("r1", down=True)])
+
+    assert await router.pick() is None
+
+
+async def test_client_reads_own_writes_from_primary():
+    """✅ После коммита клиент читает с primary, остальные - с реплик"""
+    router = ReplicaRouter([FakeEngine("r1")], read_your_writes_seconds=60)
+
+    token = read_your_writes_key.set("writer")
+    try:
+        router.mark_write()
+        writer_pick = await router.pick()
+    finally:
+        read_your_writes_key.reset(token)
+    token = read_your_writes_key.set("reader")
+    try:
+        reader_pick = await router.pick()
+    finally:
+        read_your_writes_key.reset(token)
+
+    assert writer_pick is None
+    assert reader_pick.url.host == "r1"
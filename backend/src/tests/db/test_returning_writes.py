@@ -0,0 +1,84 @@
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects.postgresql import asyncpg
+from sqlalchemy.exc import IntegrityError
+
+from common_schemas import AnimalCreate, AnimalTranscriptionCreate
+from db.postgres.animal.animal_repository import AnimalRepository
+from db.postgres.animal.transcription_repository import AnimalTranscriptionRepository
+from exceptions import AlreadyExists, DoesNotExist
+from tests.db.conftest import FakeResult, FakeRow
+
+NOW = datetime(2026, 5, 1, tzinfo=timezone.utc)
+
+
+class OneStatementSession:
+    """Выполняет ровно один запрос: возвращает строку или падает с ошибкой ограничения"""
+
+    def __init__(self, row=None, sqlstate: str = None) -> None:
+        self.row = row
+        self.sqlstate = sqlstate
+        self.statements = []
+
+    async def execute(self, statement, params=None):
+        self.statements.append(str(statement.compile(dialect=asyncpg.dialect())))
+        assert len(self.statements) == 1, "write must be a single statement"
+        if self.sqlstate:
+            raise IntegrityError("INSERT", {}, SimpleNamespace(pgcode=self.sqlstate))
+        return FakeResult([self.row] if self.row is not None else [])
+
+
+def _animal_row(**overrides) -> FakeRow:
+    values = dict(id=1, animal="корова", name="Зорька", created_at=NOW, updated_at=NOW)
+    values.update(overrides)
+    return FakeRow(**values)
+
+
+async def test_insert_returns_created_row_in_one_statement():
+    """✅ Создание - один INSERT ... RETURNING без повторного SELECT"""
+    session = OneStatementSession(row=_animal_row())
+
+    animal = await AnimalRepository(session).insert_returning(AnimalCreate(animal="корова", name="Зорька"))
+
+    assert animal.id == 1 and animal.created_at == NOW
+    assert session.statements[0].startswith("INSERT INTO animals")
+    assert "RETURNING animals.id, animals.animal, animals.name" in session.statements[0]
+
+
+async def test_duplicate_name_is_reported_by_unique_constraint():
+    """❌ Дубликат имени - AlreadyExists из нарушения unique, без предварительного поиска"""
+    session = OneStatementSession(sqlstate="23505")
+
+    with pytest.raises(AlreadyExists):
+        await AnimalRepository(session).insert_returning(AnimalCreate(animal="корова", name="Зорька"))
+
+
+async def test_missing_animal_is_reported_by_foreign_key():
+    """❌ Транскрипция несуществующего животного - 404 из нарушения внешнего ключа"""
+    session = OneStatementSession(sqlstate="23503")
+
+    with pytest.raises(DoesNotExist) as error:
+        await AnimalTranscriptionRepository(session).insert_returning(AnimalTranscriptionCreate(animal_id=404))
+
+    assert error.value.detail == "Animal not found"
+
+
+async def test_update_returns_new_row_and_previous_values():
+    """✅ Обновление - один UPDATE с прежним типом животного в RETURNING"""
+    row = _animal_row(animal="коза", previous_animal="корова")
+    session = OneStatementSession(row=row)
+
+    updated, previous = await AnimalRepository(session).update_returning(
+        1, {"animal": "коза"}, previous_columns=("animal",)
+    )
+
+    assert (updated.animal, previous) == ("коза", {"animal": "корова"})
+    assert "FOR UPDATE" in session.statements[0]
+    assert "previous.previous_animal" in session.statements[0]
+
+
+async def test_update_of_missing_row_returns_none():
+    """✅ Нет строки - None (404 в сервисе) без отдельной проверки существования"""
+    assert await AnimalRepository(OneStatementSession(row=None)).update_returning(404, {"name": "x"}) is None
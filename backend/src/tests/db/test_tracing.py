@@ -0,0 +1,87 @@
+import logging
+from types import SimpleNamespace
+
+from sqlalchemy import create_engine, text
+
+from config import DatabaseConfig
+from db.postgres.animal.animal_repository import AnimalRepository
+from db.postgres.tracing import QUERY_SECONDS, SLOW_QUERIES, QueryTracer, instrument_engine, query_source
+from tests.db.conftest import FakeResult
+
+
+class SourceCapturingSession:
+    """Сессия, запоминающая метод репозитория, из которого выполнен каждый запрос"""
+
+    def __init__(self) -> None:
+        self.sources = []
+
+    async def execute(self, statement, params=None):
+        self.sources.append(query_source.get())
+        return FakeResult(scalar=0)
+
+
+def _slow_context(tracer: QueryTracer, seconds: float) -> SimpleNamespace:
+    context = SimpleNamespace()
+    tracer.before_cursor_execute(None, None, "SELECT 1", {}, context, False)
+    context._trace_start -= seconds
+    return context
+
+
+async def test_queries_are_attributed_to_repository_method():
+    """✅ Запрос приписывается публичному методу репозитория, вложенные - внешнему"""
+    session = SourceCapturingSession()
+    repository = AnimalRepository(session)
+
+    await repository.count_by_animal_types()
+    await repository.search_ranked_by_name("Зорька")
+    # страница, затем оценка и точный COUNT(*) внутри count()
+    await repository.find_page_by_animal_type(limit=10)
+
+    assert session.sources == [
+        "AnimalRepository.count_by_animal_types",
+        "AnimalRepository.search_ranked_by_name",
+    ] + ["AnimalRepository.find_page_by_animal_type"] * 3
+    assert query_source.get() == "other"
+
+
+def test_engine_events_feed_histogram():
+    """✅ Каждое выражение движка попадает в db_query_seconds с источником и типом"""
+    engine = create_engine("sqlite://")
+    instrument_engine(engine, DatabaseConfig(POSTGRES_SLOW_QUERY_SECONDS=0))
+    before = QUERY_SECONDS.count(source="bench.sqlite", statement="SELECT")
+
+    token = query_source.set("bench.sqlite")
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("select 2"))
+    finally:
+        query_source.reset(token)
+
+    assert QUERY_SECONDS.count(source="bench.sqlite", statement="SELECT") == before + 2
+
+
+def test_slow_query_is_logged_without_parameters(caplog):
+    """✅ Выражение дольше порога - в лог (текст без параметров) и в счётчик"""
+    tracer = QueryTracer(slow_query_seconds=0.5, sample_rate=1.0)
+    before = SLOW_QUERIES.value(source="other")
+
+    with caplog.at_level(logging.WARNING, logger="db.postgres.tracing"):
+        tracer.after_cursor_execute(None, None, "SELECT 1", {"secret": "x"}, _slow_context(tracer, 1.0), False)
+        tracer.after_cursor_execute(None, None, "SELECT 1", {}, _slow_context(tracer, 0.1), False)
+
+    assert SLOW_QUERIES.value(source="other") == before + 1
+    assert len(caplog.records) == 1
+    assert "Slow query" in caplog.text and "SELECT 1" in caplog.text and "secret" not in caplog.text
+
+
+def test_slow_query_log_is_sampled(caplog):
+    """❌ При нулевой доле сэмплирования медленные выражения считаются, но не логируются"""
+    tracer = QueryTracer(slow_query_seconds=0.5, sample_rate=0.0)
+    before = SLOW_QUERIES.value(source="other")
+
+    with caplog.at_level(logging.WARNING, logger="db.postgres.tracing"):
+        tracer.after_cursor_execute(None, None, "SELECT 1", {}, _slow_context(tracer, 1.0), False)
+
+    assert SLOW_QUERIES.value(source="other") == before + 1
+    assert caplog.records == []
@@ -0,0 +1,286 @@
+"""
+Регрессионный стенд запросов: число round trip'ов и планы горячих запросов
+
+Запускается против отдельной (одноразовой) базы из POSTGRES_* в .env, в обычном
+прогоне тесты пропускаются:
+
+    PERF_TESTS=1 python -m pytest -q src/tests/perf
+
+База мигрируется до head и догенерируется синтетическими данными (PERF_ROWS
+животных и транскрипций, пользователей - в 10 раз меньше). Для каждого метода
+сервиса считаются SQL-выражения, отправленные в базу, а каждый SELECT
+перевыполняется под EXPLAIN (ANALYZE, BUFFERS): Seq Scan по засеянным таблицам
+или отклонение от сохранённого базового плана (plan_baselines.json) - падение.
+План без базового тоже падает; PERF_UPDATE_BASELINES=1 записывает текущие планы
+как базовые (перезаписывает файл целиком). Форма плана и буферы зависят от
+мажорной версии сервера: она хранится вместе с базовыми планами, и на другой
+версии сравнение с ними пропускается (skip) - перезапишите их на своей.
+"""
+import json
+import os
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+
+from db.postgres.migrations import upgrade_to_head
+from db.postgres.partitions import create_partition_sql, partitions_between
+from db.postgres.postgres_client import engine, sync_engine
+from db.postgres.tracing import query_source
+from v1.auth.utils import hash_password
+
+PERF_ENABLED = os.getenv("PERF_TESTS") == "1"
+PERF_ROWS = int(os.getenv("PERF_ROWS", "200000"))
+UPDATE_BASELINES = os.getenv("PERF_UPDATE_BASELINES") == "1"
+
+# Базовые планы сняты при PERF_ROWS=200000: при другом объёме данных их нужно
+# перезаписать (PERF_UPDATE_BASELINES=1)
+BASELINES_PATH = Path(__file__).with_name("plan_baselines.json")
+# Во сколько раз (плюс запас в блоках) план может прочитать больше буферов, чем базовый
+BUFFERS_TOLERANCE = 1.5
+BUFFERS_SLACK = 16
+
+SEEDED_TABLES = ("animals", "animal_transcriptions", "animal_daily_stats", "users")
+ANIMAL_TYPES = ("корова", "свинья", "курица", "овца", "коза", "лошадь", "кролик", "утка")
+PERF_USER_EMAIL = "perf-user@example.com"
+PERF_USER_PASSWORD = "perf-password"
+
+
+@dataclass
+class PerfDataset:
+    animal_id: int
+    animal_name: str
+    transcription_id: int
+    user_id: int
+    user_email: str = PERF_USER_EMAIL
+    user_password: str = PERF_USER_PASSWORD
+
+
+def _seed(conn, table: str, target_rows: int, insert_sql: str, params: Dict[str, Any]) -> None:
+    """Догенерирует строки таблицы до target_rows (g - номер строки в generate_series)"""
+    current = conn.execute(text(f"SELECT count(*) FROM {table}")).scalar_one()
+    if current < target_rows:
+        conn.execute(text(insert_sql), {"start": current + 1, "stop": target_rows, **params})
+
+
+def _seed_dataset(rows: int) -> PerfDataset:
+    upgrade_to_head()
+    with sync_engine.begin() as conn:
+        _seed(
+            conn,
+            "animals",
+            rows,
+            """
+            INSERT INTO animals (animal, name, created_at, updated_at)
+            SELECT (:types)[1 + (g % :type_count)], 'Животное-' || md5(g::text),
+                   now() - (g || ' seconds')::interval, now()
+            FROM generate_series(:start, :stop) AS g
+            """,
+            {"types": list(ANIMAL_TYPES), "type_count": len(ANIMAL_TYPES)},
+        )
+        # Транскрипция g создана g минут назад: партиции на весь период
+        now = datetime.now(timezone.utc)
+        for partition in partitions_between((now - timedelta(minutes=rows)).date(), now.date()):
+            conn.execute(text(create_partition_sql(partition)))
+        _seed(
+            conn,
+            "animal_transcriptions",
+            rows,
+            """
+            INSERT INTO animal_transcriptions
+                (animal_id, behavior_state, measurements, feeding_details, relationships, created_at, updated_at)
+            SELECT first.id + (g % 1000), 'Спокойное поведение, запись ' || g,
+                   jsonb_build_object('weight', (400 + g % 100) || ' кг',
+                                      'temperature', (38 + (g % 20) / 10.0)::text || ' °C'),
+                   jsonb_build_object('food_type', 'сено', 'quantity', (g % 15) || ' кг'),
+                   jsonb_build_object('interactions', 'нет'),
+                   now() - (g || ' minutes')::interval, now()
+            FROM generate_series(:start, :stop) AS g
+            CROSS JOIN (SELECT min(id) AS id FROM animals) AS first
+            """,
+            {},
+        )
+        _seed(
+            conn,
+            "users",
+            max(rows // 10, 1),
+            """
+            INSERT INTO users (email, username, password_hash, registered_at, updated_at)
+            SELECT 'user-' || g || '@example.com', 'user-' || g, md5(g::text), now(), now()
+            FROM generate_series(:start, :stop) AS g
+            """,
+            {},
+        )
+        conn.execute(
+            text(
+                """
+                INSERT INTO users (email, username, password_hash, registered_at, updated_at)
+                VALUES (:email, 'perf-user', :password_hash, now(), now())
+                ON CONFLICT (email) DO NOTHING
+                """
+            ),
+            {"email": PERF_USER_EMAIL, "password_hash": hash_password(PERF_USER_PASSWORD)},
+        )
+
+        animal = conn.execute(text("SELECT id, name FROM animals ORDER BY id LIMIT 1")).one()
+        transcription_id = conn.execute(
+            text("SELECT max(id) FROM animal_transcriptions WHERE animal_id = :animal_id"),
+            {"animal_id": animal.id},
+        ).scalar_one()
+        user_id = conn.execute(
+            text("SELECT id FROM users WHERE email = :email"), {"email": PERF_USER_EMAIL}
+        ).scalar_one()
+
+    # VACUUM вне транзакции: карта видимости для index-only scan и свежая статистика
+    with sync_engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        for table in SEEDED_TABLES:
+            conn.execute(text(f"VACUUM ANALYZE {table}"))
+
+    return PerfDataset(
+        animal_id=animal.id, animal_name=animal.name, transcription_id=transcription_id, user_id=user_id
+    )
+
+
+@pytest.fixture(scope="session")
+def perf_dataset() -> PerfDataset:
+    if not PERF_ENABLED:
+        pytest.skip("query regression harness: set PERF_TESTS=1 and point POSTGRES_* at a disposable database")
+    return _seed_dataset(PERF_ROWS)
+
+
+@dataclass
+class Statement:
+    source: str
+    sql: str
+    parameters: Any
+
+
+@dataclass
+class QueryLog:
+    """SQL-выражения, отправленные в базу внутри capture()"""
+
+    statements: List[Statement] = field(default_factory=list)
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany) -> None:
+        self.statements.append(Statement(query_source.get(), statement, parameters))
+
+    @contextmanager
+    def capture(self):
+        self.statements.clear()
+        event.listen(Engine, "before_cursor_execute", self._record)
+        try:
+            yield self
+        finally:
+            event.remove(Engine, "before_cursor_execute", self._record)
+
+    def assert_round_trips(self, budget: int) -> None:
+        listing = "\n".join(f"  {s.source}: {' '.join(s.sql.split())[:200]}" for s in self.statements)
+        assert len(self.statements) <= budget, (
+            f"{len(self.statements)} SQL round trips, budget {budget}:\n{listing}"
+        )
+
+    async def explain_selects(self) -> List[Tuple[str, dict]]:
+        """EXPLAIN (ANALYZE, BUFFERS) каждого захваченного SELECT с теми же параметрами"""
+        plans = []
+        async with engine.connect() as conn:
+            for statement in self.statements:
+                if not statement.sql.lstrip().upper().startswith(("SELECT", "WITH")):
+                    continue
+                result = await conn.exec_driver_sql(
+                    f"EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) {statement.sql}", statement.parameters
+                )
+                plan = result.scalar_one()
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                plans.append((statement.source, plan[0]["Plan"]))
+        return plans
+
+
+def _plan_nodes(node: dict):
+    yield node
+    for child in node.get("Plans", ()):
+        yield from _plan_nodes(child)
+
+
+class PlanBaselines:
+    """Базовые планы горячих запросов: форма плана и прочитанные буферы"""
+
+    def __init__(self, path: Path, server_version: int) -> None:
+        self.path = path
+        self.server_version = server_version
+        stored = {} if UPDATE_BASELINES or not path.exists() else json.loads(path.read_text())
+        self.recorded_version: int = stored.get("server_version", server_version)
+        self.baselines: Dict[str, dict] = stored.get("plans", {})
+        self.changed = False
+
+    def check(self, case: str, plans: List[Tuple[str, dict]]) -> None:
+        problems = []
+        for index, (source, plan) in enumerate(plans):
+            nodes = list(_plan_nodes(plan))
+            seq_scans = sorted(
+                {
+                    node["Relation Name"]
+                    for node in nodes
+                    if node["Node Type"] == "Seq Scan" and node.get("Relation Name", "").startswith(SEEDED_TABLES)
+                }
+            )
+            if seq_scans:
+                problems.append(f"{source}: Seq Scan on {', '.join(seq_scans)}")
+
+            current = {
+                "node_types": [node["Node Type"] for node in nodes],
+                "buffers": plan.get("Shared Hit Blocks", 0) + plan.get("Shared Read Blocks", 0),
+            }
+            key = f"{case}#{index} {source}"
+            if UPDATE_BASELINES:
+                self.baselines[key] = current
+                self.changed = True
+                continue
+            if self.recorded_version != self.server_version:
+                continue
+            baseline = self.baselines.get(key)
+            if baseline is None:
+                problems.append(f"{source}: no baseline for {key!r} (run with PERF_UPDATE_BASELINES=1)")
+                continue
+            if current["node_types"] != baseline["node_types"]:
+                problems.append(f"{source}: plan changed {baseline['node_types']} -> {current['node_types']}")
+            if current["buffers"] > baseline["buffers"] * BUFFERS_TOLERANCE + BUFFERS_SLACK:
+                problems.append(f"{source}: {current['buffers']} buffers, baseline {baseline['buffers']}")
+        assert not problems, f"{case}:\n  " + "\n  ".join(problems)
+        if self.recorded_version != self.server_version:
+            pytest.skip(
+                f"plan baselines were recorded on PostgreSQL {self.recorded_version}, server is "
+                f"{self.server_version}: re-record them with PERF_UPDATE_BASELINES=1"
+            )
+
+    def save(self) -> None:
+        if self.changed:
+            stored = {"server_version": self.server_version, "plans": self.baselines}
+            self.path.write_text(json.dumps(stored, ensure_ascii=False, indent=2, sort_keys=True) + "\n")
+
+
+def _server_major_version() -> int:
+    with sync_engine.connect() as conn:
+        return int(conn.execute(text("SHOW server_version_num")).scalar_one()) // 10000
+
+
+@pytest.fixture(scope="session")
+def plan_baselines(perf_dataset):
+    baselines = PlanBaselines(BASELINES_PATH, _server_major_version())
+    yield baselines
+    baselines.save()
+
+
+@pytest.fixture
+async def query_log(perf_dataset):
+    # Соединения пула привязаны к event loop теста; прогрев - чтобы подключение
+    # и инициализация диалекта не попали в подсчёт
+    async with engine.connect():
+        pass
+    yield QueryLog()
+    await engine.dispose()
@@ -0,0 +1,58 @@
+import pytest
+
+from db.postgres.postgres_client import settings
+from pagination import encode_cursor
+from v1.animals.config import AnimalsServiceConfig
+from v1.animals.schemas import TranscriptionCreateRequest
+from v1.animals.service import AnimalsService
+
+
+@pytest.fixture(params=[False, True], ids=["orm", "lightweight"])
+def service(request, monkeypatch):
+    """Сервис на обоих путях чтения: ORM-сессия и ReadOnlyUnitOfWork"""
+    monkeypatch.setattr(settings, "POSTGRES_LIGHTWEIGHT_READS", request.param)
+    return AnimalsService(AnimalsServiceConfig(), scheduler=None, facets=None)
+
+
+READ_CASES = {
+    # страница + оценка количества (точный COUNT(*) - только для небольших выборок)
+    "list first page": (3, lambda s, d: s.get_all_animals(page_size=50)),
+    "list by type": (3, lambda s, d: s.get_all_animals(page_size=50, animal_type="корова")),
+    "list next page": (3, lambda s, d: s.get_all_animals(page_size=50, cursor=encode_cursor([d.animal_id]))),
+    "list by offset": (3, lambda s, d: s.get_all_animals(page=3, page_size=50, animal_type="корова")),
+    "search by name": (1, lambda s, d: s.search_animals_by_name(d.animal_name[:12], limit=20)),
+    "animal by id": (1, lambda s, d: s.get_animal_by_id(d.animal_id)),
+    "animal with transcriptions": (2, lambda s, d: s.get_animal_with_transcriptions(d.animal_id)),
+    "transcriptions page": (1, lambda s, d: s.get_animal_transcriptions(d.animal_id, limit=50)),
+    "transcriptions without details": (
+        1, lambda s, d: s.get_animal_transcriptions(d.animal_id, limit=50, include_details=False)
+    ),
+    "trends": (1, lambda s, d: s.get_animal_trends(d.animal_id)),
+    "transcription by id": (1, lambda s, d: s.get_transcription_by_id(d.transcription_id)),
+}
+
+
+@pytest.mark.parametrize("case", READ_CASES)
+async def test_read_round_trips_and_plans(case, service, perf_dataset, query_log, plan_baselines):
+    """✅ Чтения укладываются в бюджет запросов, планы без Seq Scan и не хуже базовых"""
+    budget, call = READ_CASES[case]
+
+    with query_log.capture():
+        await call(service, perf_dataset)
+
+    query_log.assert_round_trips(budget)
+    plan_baselines.check(case, await query_log.explain_selects())
+
+
+async def test_create_transcription_is_single_insert(service, perf_dataset, query_log):
+    """✅ Создание транскрипции - один INSERT ... RETURNING (внешний ключ вместо SELECT животного)"""
+    with query_log.capture():
+        await service.create_transcription(
+            TranscriptionCreateRequest(
+                animal_id=perf_dataset.animal_id,
+                behavior_state="Спокойное поведение",
+                measurements={"weight": "450 кг"},
+            )
+        )
+
+    query_log.assert_round_trips(1)
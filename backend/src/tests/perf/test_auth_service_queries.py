@@ -0,0 +1,33 @@
+import uuid
+
+import email_validator
+import pytest
+
+from v1.auth.config import AuthServiceConfig
+from v1.auth.schemas import UserLoginSchema
+from v1.auth.service import AuthService
+
+
+@pytest.fixture
+def service(monkeypatch):
+    # Проверка доставляемости email - DNS-запрос, не относящийся к базе
+    monkeypatch.setattr(email_validator, "CHECK_DELIVERABILITY", False)
+    return AuthService(AuthServiceConfig())
+
+
+async def test_login_round_trips_and_plans(service, perf_dataset, query_log, plan_baselines):
+    """✅ Логин - поиск по email (по уникальному индексу) и запись refresh-токена"""
+    with query_log.capture():
+        await service.login_user(UserLoginSchema(email=perf_dataset.user_email, password=perf_dataset.user_password))
+
+    query_log.assert_round_trips(2)
+    plan_baselines.check("login", await query_log.explain_selects())
+
+
+async def test_update_username_round_trips_and_plans(service, perf_dataset, query_log, plan_baselines):
+    """✅ Смена username - проверка занятости и один UPDATE ... RETURNING"""
+    with query_log.capture():
+        await service.update_username(perf_dataset.user_id, f"perf-user-{uuid.uuid4().hex[:8]}")
+
+    query_log.assert_round_trips(2)
+    plan_baselines.check("update username", await query_log.explain_selects())
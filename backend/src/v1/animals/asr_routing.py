@@ -0,0 +1,54 @@
+from enum import Enum
+
+from pydantic import BaseModel
+
+from v1.animals.config import AnimalsServiceConfig
+
+
+class ASRTier(str, Enum):
+    FAST = "fast"
+    LARGE = "large"
+
+
+class TranscriptionResult(BaseModel):
+    text: str
+    confidence: float  # средняя уверенность CTC по непустым фреймам, 0..1
+    tier: ASRTier
+    model_name: str
+    audio_seconds: float
+    elapsed_seconds: float
+    escalated: bool = False
+
+
+class CascadePolicy:
+    """
+    Политика каскада ASR: короткие клипы сначала идут в быструю модель,
+    длинные и неуверенно распознанные - в большую
+    """
+
+    def __init__(self, enabled: bool, max_fast_duration: float, min_confidence: float) -> None:
+        self.enabled = enabled
+        self.max_fast_duration = max_fast_duration
+        self.min_confidence = min_confidence
+
+    @classmethod
+    def from_config(cls, config: AnimalsServiceConfig) -> "CascadePolicy":
+        # Быстрый уровень имеет смысл только с отдельной (меньшей) моделью
+        has_fast_model = config.ASR_FAST_MODEL not in ("", config.ASR_LARGE_MODEL)
+        return cls(
+            enabled=config.ASR_CASCADE_ENABLED and has_fast_model,
+            max_fast_duration=config.ASR_CASCADE_MAX_FAST_DURATION,
+            min_confidence=config.ASR_CASCADE_MIN_CONFIDENCE,
+        )
+
+    def initial_tier(self, audio_seconds: float) -> ASRTier:
+        """Выбор модели для первого прохода по длительности клипа"""
+        if self.enabled and audio_seconds <= self.max_fast_duration:
+            return ASRTier.FAST
+        return ASRTier.LARGE
+
+    def should_escalate(self, result: TranscriptionResult) -> bool:
+        """Нужно ли перераспознать клип большой моделью"""
+        return result.tier == ASRTier.FAST and (
+            not result.text.strip() or result.confidence < self.min_confidence
+        )
@@ -0,0 +1,144 @@
+import os
+import subprocess
+import wave
+from enum import Enum
+from typing import Optional
+
+
+class AudioContainer(str, Enum):
+    WAV = "wav"
+    FLAC = "flac"
+    OGG = "ogg"
+    OPUS = "opus"
+    MP3 = "mp3"
+    AAC = "aac"
+    M4A = "m4a"
+    WEBM = "webm"
+    WMA = "wma"
+    UNKNOWN = "unknown"
+
+
+class AudioDecoder(str, Enum):
+    WAVE = "wave"          # stdlib wave, PCM WAV без зависимостей
+    SNDFILE = "sndfile"    # libsndfile через soundfile
+    FFMPEG = "ffmpeg"      # ffmpeg с выводом PCM в pipe
+
+
+# Сколько байт заголовка читать для определения контейнера.
+# Для Ogg нужен первый page целиком, чтобы отличить Opus от Vorbis
+SNIFF_BYTES = 64
+
+ASF_GUID = bytes.fromhex("3026b2758e66cf11a6d900aa0062ce6c")
+EBML_MAGIC = b"\x1a\x45\xdf\xa3"
+
+# Самый быстрый декодер для каждого контейнера
+DECODER_BY_CONTAINER = {
+    AudioContainer.WAV: AudioDecoder.WAVE,
+    AudioContainer.FLAC: AudioDecoder.SNDFILE,
+    AudioContainer.OGG: AudioDecoder.SNDFILE,
+    AudioContainer.OPUS: AudioDecoder.FFMPEG,
+    AudioContainer.MP3: AudioDecoder.FFMPEG,
+    AudioContainer.AAC: AudioDecoder.FFMPEG,
+    AudioContainer.M4A: AudioDecoder.FFMPEG,
+    AudioContainer.WEBM: AudioDecoder.FFMPEG,
+    AudioContainer.WMA: AudioDecoder.FFMPEG,
+    AudioContainer.UNKNOWN: AudioDecoder.FFMPEG,
+}
+
+
+def sniff_audio_container(header: bytes) -> AudioContainer:
+    """
+    Определяет контейнер аудио по магическим байтам заголовка
+
+    Args:
+        header (bytes): первые SNIFF_BYTES байт файла
+
+    Returns:
+        AudioContainer: распознанный контейнер или UNKNOWN
+    """
+    if len(header) >= 12 and header[:4] == b"RIFF" and header[8:12] == b"WAVE":
+        return AudioContainer.WAV
+    if header[:4] == b"fLaC":
+        return AudioContainer.FLAC
+    if header[:4] == b"OggS":
+        return AudioContainer.OPUS if b"OpusHead" in header else AudioContainer.OGG
+    if header[:3] == b"ID3":
+        return AudioContainer.MP3
+    if len(header) >= 8 and header[4:8] == b"ftyp":
+        return AudioContainer.M4A
+    if header[:4] == EBML_MAGIC:
+        return AudioContainer.WEBM
+    if header[:16] == ASF_GUID:
+        return AudioContainer.WMA
+    if len(header) >= 2 and header[0] == 0xFF and (header[1] & 0xE0) == 0xE0:
+        # Frame sync: у ADTS (AAC) поле layer равно 00, у MPEG audio - нет
+        if (header[1] & 0x06) == 0:
+            return AudioContainer.AAC
+        return AudioContainer.MP3
+    return AudioContainer.UNKNOWN
+
+
+def sniff_audio_file(audio_path: str) -> AudioContainer:
+    """Читает заголовок файла и определяет контейнер"""
+    with open(audio_path, "rb") as audio_file:
+        return sniff_audio_container(audio_file.read(SNIFF_BYTES))
+
+
+# Грубая оценка для сжатых форматов, если ffprobe недоступен: ~128 kbps
+FALLBACK_BYTES_PER_SECOND = 16000
+
+
+def _probe_wav_duration(audio_path: str) -> Optional[float]:
+    try:
+        with wave.open(audio_path, "rb") as wav_file:
+            return wav_file.getnframes() / wav_file.getframerate()
+    except (wave.Error, EOFError, ZeroDivisionError):
+        return None
+
+
+def _probe_flac_duration(header: bytes) -> Optional[float]:
+    # STREAMINFO идёт сразу за "fLaC": 4 байта заголовка блока, затем
+    # 10 байт размеров блоков/фреймов и 8 байт с sample rate и total samples
+    if len(header) < 26:
+        return None
+    packed = int.from_bytes(header[18:26], "big")
+    sample_rate = packed >> 44
+    total_samples = packed & ((1 << 36) - 1)
+    if not sample_rate or not total_samples:
+        return None
+    return total_samples / sample_rate
+
+
+def _probe_ffprobe_duration(audio_path: str) -> Optional[float]:
+    cmd = ["ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "csv=p=0", audio_path]
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=10)
+        return float(result.stdout.strip()) if result.returncode == 0 else None
+    except (OSError, ValueError, subprocess.TimeoutExpired):
+        return None
+
+
+def probe_audio_duration(audio_path: str) -> float:
+    """
+    Оценивает длительность аудио по заголовку, не декодируя файл
+
+    Args:
+        audio_path (str): путь к аудиофайлу
+
+    Returns:
+        float: длительность в секундах (оценка по размеру файла, если заголовок не помог)
+    """
+    with open(audio_path, "rb") as audio_file:
+        header = audio_file.read(SNIFF_BYTES)
+    container = sniff_audio_container(header)
+
+    duration = None
+    if container == AudioContainer.WAV:
+        duration = _probe_wav_duration(audio_path)
+    elif container == AudioContainer.FLAC:
+        duration = _probe_flac_duration(header)
+    if duration is None:
+        duration = _probe_ffprobe_duration(audio_path)
+    if duration is None:
+        duration = os.path.getsize(audio_path) / FALLBACK_BYTES_PER_SECOND
+    return duration
@@ -29,6 +29,44 @@ class AnimalsServiceConfig(BaseSettings):
     
     # Таймауты для обработки
     AUDIO_PROCESSING_TIMEOUT: int = 600  # 10 минут на обработку
+
+    # Каскад ASR: быстрая модель для коротких клипов, большая - по требованию.
+    # ASR_FAST_MODEL - меньшая CTC-модель с HuggingFace; пусто или та же, что
+    # большая, - каскад выключен и воркер держит в памяти одну модель
+    ASR_LARGE_MODEL: str = "bond005/wav2vec2-large-ru-golos"
+    ASR_FAST_MODEL: str = ""
+    ASR_FAST_QUANTIZED: bool = True
+    ASR_CASCADE_ENABLED: bool = True
+    ASR_CASCADE_MAX_FAST_DURATION: float = 30.0  # секунды; длиннее - сразу большая модель
+    ASR_CASCADE_MIN_CONFIDENCE: float = 0.85  # ниже - перераспознаём большой моделью
+
+    # Конвейер ASR -> LLM: длинные записи режутся на чанки, и анализ каждого
+    # чанка в GigaChat начинается, пока ASR декодирует следующий
+    ASR_CHUNK_SECONDS: float = 30.0
+    LLM_MAX_CONCURRENT_ANALYSES: int = 4
+
+    # Планировщик инференса: сколько аудио-задач воркер обрабатывает одновременно,
+    # и квота секунд инференса на клиента в окне (учёт в Redis, общий для всех воркеров)
+    INFERENCE_MAX_CONCURRENT_JOBS: int = 1
+    INFERENCE_FAIR_SHARE_WINDOW_SECONDS: int = 3600
+    INFERENCE_FAIR_SHARE_QUOTA_SECONDS: float = 900.0
+    INFERENCE_AGING_FACTOR: float = 0.5  # на сколько секунд «короче» становится задача за секунду ожидания
+
+    # Прогрев ML-стека (torch/transformers) в фоне при старте воркера.
+    # Выключено по умолчанию: API-воркеры без обработки аудио не должны его грузить
+    PRELOAD_INFERENCE: bool = False
+
+    # Сколько последних транскрипций отдаётся вместе с животным (остальные - по курсору)
+    ANIMAL_DETAIL_TRANSCRIPTIONS_LIMIT: int = 20
+
+    # Графики трендов: период по умолчанию и максимальный запрашиваемый период (в днях)
+    ANIMAL_TRENDS_DEFAULT_DAYS: int = 90
+    ANIMAL_TRENDS_MAX_DAYS: int = 730
+
+    # Массовый импорт/экспорт (COPY): ключ для admin-эндпоинтов (пусто - эндпоинты выключены)
+    # и размер чанка при конвертации CSV <-> Parquet
+    ADMIN_API_KEY: str = ""
+    DATA_TRANSFER_CHUNK_ROWS: int = 50_000
     
     model_config = ConfigDict(
         env_file=".env",
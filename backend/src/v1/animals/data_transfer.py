@@ -0,0 +1,275 @@
+import asyncio
+import csv
+import io
+import logging
+import os
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from datetime import date, datetime, timezone
+from enum import Enum
+from typing import AsyncIterator, List, Optional, Tuple
+
+from pydantic import BaseModel, computed_field
+from sqlalchemy import BigInteger, DateTime, Integer, Table, text
+
+from common_models import Animal, AnimalTranscription
+from db.postgres.base import FOREIGN_KEY_VIOLATION, UNIQUE_VIOLATION
+from db.postgres.partitions import ensure_partitions
+from db.postgres.postgres_client import engine, replica_router, settings
+from exceptions import AlreadyExists, DBException, InvalidImportFile
+
+logger = logging.getLogger(__name__)
+
+# Массовый импорт/экспорт таблиц через COPY. CSV идёт в COPY/из COPY потоком
+# без промежуточной обработки; Parquet конвертируется чанками по chunk_rows
+# строк (pandas + pyarrow), поэтому память не зависит от размера таблицы.
+# pandas и pyarrow импортируются только для Parquet.
+
+
+class DataTable(str, Enum):
+    ANIMALS = "animals"
+    TRANSCRIPTIONS = "transcriptions"
+
+
+class DataFormat(str, Enum):
+    CSV = "csv"
+    PARQUET = "parquet"
+
+
+TABLES = {
+    DataTable.ANIMALS: Animal.__table__,
+    DataTable.TRANSCRIPTIONS: AnimalTranscription.__table__,
+}
+
+
+class TransferStats(BaseModel):
+    table: DataTable
+    format: DataFormat
+    rows: int
+    seconds: float
+
+    @computed_field
+    @property
+    def rows_per_second(self) -> float:
+        return round(self.rows / self.seconds, 1) if self.seconds > 0 else 0.0
+
+
+def _copy_columns(table: Table) -> List[str]:
+    """Колонки для COPY: генерируемые (computed) не выгружаются и не загружаются"""
+    return [column.name for column in table.columns if column.computed is None]
+
+
+def _copied_rows(status: str) -> int:
+    # asyncpg возвращает статус команды: "COPY 12345"
+    return int(status.split()[-1]) if status else 0
+
+
+@asynccontextmanager
+async def _copy_connection() -> AsyncIterator:
+    """Соединение asyncpg в транзакции: импорт целиком применяется или откатывается"""
+    async with engine.begin() as conn:
+        raw_connection = await conn.get_raw_connection()
+        yield conn, raw_connection.driver_connection
+
+
+async def _copy_out(driver, table: Table, columns: List[str], output: str) -> str:
+    """
+    COPY TO в CSV-файл
+
+    Секционированную таблицу COPY не выгружает напрямую ("cannot copy from
+    partitioned table") - она выгружается запросом по всем партициям.
+    """
+    if table.dialect_options["postgresql"]["partition_by"]:
+        query = f"SELECT {', '.join(columns)} FROM {table.name}"
+        return await driver.copy_from_query(query, output=output, format="csv", header=True)
+    return await driver.copy_from_table(table.name, output=output, columns=columns, format="csv", header=True)
+
+
+async def export_table(table_name: DataTable, data_format: DataFormat, path: str, chunk_rows: int) -> TransferStats:
+    """Выгрузка таблицы в CSV (COPY TO потоком в файл) или Parquet (через CSV чанками)"""
+    table = TABLES[table_name]
+    columns = _copy_columns(table)
+    start = time.perf_counter()
+
+    csv_path = path if data_format == DataFormat.CSV else f"{path}.csv"
+    try:
+        async with _copy_connection() as (_, driver):
+            status = await _copy_out(driver, table, columns, csv_path)
+        if data_format == DataFormat.PARQUET:
+            await asyncio.to_thread(_csv_to_parquet, csv_path, path, table, chunk_rows)
+    finally:
+        if csv_path != path and os.path.exists(csv_path):
+            os.remove(csv_path)
+
+    stats = TransferStats(
+        table=table_name, format=data_format, rows=_copied_rows(status), seconds=time.perf_counter() - start
+    )
+    logger.info(f"Exported {stats.rows} rows from {table.name} ({stats.rows_per_second} rows/s)")
+    return stats
+
+
+async def import_table(table_name: DataTable, data_format: DataFormat, path: str, chunk_rows: int) -> TransferStats:
+    """
+    Загрузка файла в таблицу через COPY FROM в одной транзакции
+
+    Колонки берутся из заголовка CSV или схемы Parquet и должны быть колонками
+    таблицы; не указанные получают значения по умолчанию БД. Если в файле есть id,
+    последовательность таблицы сдвигается за максимальный загруженный id.
+    """
+    table = TABLES[table_name]
+    columns = await asyncio.to_thread(_file_columns, path, data_format)
+    if not columns:
+        raise InvalidImportFile("Import file has no columns")
+    unknown = set(columns) - set(_copy_columns(table))
+    if unknown:
+        raise InvalidImportFile(f"Unknown columns for {table.name}: {', '.join(sorted(unknown))}")
+
+    start = time.perf_counter()
+    if table_name == DataTable.TRANSCRIPTIONS and "created_at" in columns:
+        # Строки вне существующих месячных партиций COPY не примет
+        created_range = await asyncio.to_thread(_created_at_range, path, data_format)
+        if created_range:
+            await ensure_partitions(*created_range, lock_timeout=settings.POSTGRES_PARTITION_LOCK_TIMEOUT)
+
+    rows = 0
+    try:
+        async with _copy_connection() as (conn, driver):
+            if data_format == DataFormat.CSV:
+                status = await driver.copy_to_table(
+                    table.name, source=path, columns=columns, format="csv", header=True
+                )
+                rows = _copied_rows(status)
+            else:
+                async for chunk in _parquet_csv_chunks(path, chunk_rows):
+                    status = await driver.copy_to_table(
+                        table.name, source=io.BytesIO(chunk), columns=columns, format="csv"
+                    )
+                    rows += _copied_rows(status)
+            if "id" in columns:
+                await conn.execute(
+                    text(
+                        "SELECT setval(pg_get_serial_sequence(:table, 'id'), "
+                        "coalesce((SELECT max(id) FROM " + table.name + "), 1))"
+                    ),
+                    {"table": table.name},
+                )
+    except DBException:
+        raise
+    except Exception as e:
+        logger.error(f"Error importing {path} into {table.name}: {e}")
+        raise _import_error(e, table.name)
+    # COPY идёт мимо UnitOfWork: чтения клиента и пересборка фасетов - с primary
+    replica_router.mark_write()
+
+    stats = TransferStats(table=table_name, format=data_format, rows=rows, seconds=time.perf_counter() - start)
+    logger.info(f"Imported {stats.rows} rows into {table.name} ({stats.rows_per_second} rows/s)")
+    return stats
+
+
+def _import_error(error: Exception, table_name: str) -> Exception:
+    """Ошибка импорта для клиента: нарушения ограничений и данных - 400, без текста драйвера"""
+    sqlstate = getattr(error, "sqlstate", None) or getattr(getattr(error, "orig", None), "sqlstate", None) or ""
+    if sqlstate == UNIQUE_VIOLATION:
+        return AlreadyExists(f"Import into {table_name} conflicts with existing rows")
+    if sqlstate == FOREIGN_KEY_VIOLATION:
+        return InvalidImportFile(f"Import into {table_name} references rows that do not exist")
+    # 22xxx - неверные значения, 23xxx - прочие ограничения (NOT NULL, CHECK)
+    if sqlstate[:2] in ("22", "23"):
+        return InvalidImportFile(f"Import file has values not accepted by {table_name}")
+    return DBException(f"Error while importing {table_name}")
+
+
+def _file_columns(path: str, data_format: DataFormat) -> List[str]:
+    if data_format == DataFormat.CSV:
+        with open(path, newline="", encoding="utf-8") as csv_file:
+            return next(csv.reader(csv_file), [])
+    import pyarrow.parquet as pq
+
+    return pq.ParquetFile(path).schema_arrow.names
+
+
+def _created_at_range(path: str, data_format: DataFormat) -> Optional[Tuple[date, date]]:
+    """Первая и последняя дата (UTC) created_at в файле; None - дат нет"""
+    if data_format == DataFormat.PARQUET:
+        import pyarrow.compute as pc
+        import pyarrow.parquet as pq
+
+        bounds = pc.min_max(pq.read_table(path, columns=["created_at"]).column("created_at"))
+        values = [bounds["min"].as_py(), bounds["max"].as_py()]
+    else:
+        low = high = None
+        with open(path, newline="", encoding="utf-8") as csv_file:
+            for row in csv.DictReader(csv_file):
+                if row["created_at"]:
+                    value = _utc_date(datetime.fromisoformat(row["created_at"]))
+                    low = value if low is None or value < low else low
+                    high = value if high is None or value > high else high
+        return (low, high) if low is not None else None
+    if values[0] is None:
+        return None
+    return _utc_date(values[0]), _utc_date(values[1])
+
+
+def _utc_date(value: datetime) -> date:
+    # Без часового пояса - UTC, как и в колонке timestamptz при сессии в UTC
+    if value.tzinfo is None:
+        return value.date()
+    return value.astimezone(timezone.utc).date()
+
+
+async def _parquet_csv_chunks(path: str, chunk_rows: int) -> AsyncIterator[bytes]:
+    """Parquet -> CSV-байты (без заголовка) по chunk_rows строк; конвертация в пуле потоков"""
+    import pyarrow.parquet as pq
+
+    batches = pq.ParquetFile(path).iter_batches(batch_size=chunk_rows)
+    while True:
+        chunk = await asyncio.to_thread(_next_csv_chunk, batches)
+        if chunk is None:
+            return
+        yield chunk
+
+
+def _next_csv_chunk(batches) -> bytes:
+    batch = next(batches, None)
+    if batch is None:
+        return None
+    return batch.to_pandas().to_csv(index=False, header=False).encode("utf-8")
+
+
+def _csv_to_parquet(csv_path: str, parquet_path: str, table: Table, chunk_rows: int) -> None:
+    """CSV из COPY -> Parquet, по row group на чанк; JSONB остаётся JSON-строкой"""
+    import pandas as pd
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    dtypes, dates = {}, []
+    for column in table.columns:
+        if column.computed is not None:
+            continue
+        if isinstance(column.type, DateTime):
+            dates.append(column.name)
+        elif isinstance(column.type, (BigInteger, Integer)):
+            dtypes[column.name] = "Int64"
+        else:
+            dtypes[column.name] = "string"
+
+    writer = None
+    try:
+        for frame in pd.read_csv(csv_path, dtype=dtypes, parse_dates=dates, chunksize=chunk_rows):
+            chunk = pa.Table.from_pandas(frame, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(parquet_path, chunk.schema)
+            writer.write_table(chunk.cast(writer.schema))
+    finally:
+        if writer is not None:
+            writer.close()
+    if writer is None:
+        # Пустая таблица: файл со схемой и без строк
+        pq.write_table(pa.Table.from_pandas(pd.DataFrame({name: [] for name in _copy_columns(table)})), parquet_path)
+
+
+def temp_export_path(table_name: DataTable, data_format: DataFormat) -> str:
+    handle, path = tempfile.mkstemp(prefix=f"{table_name.value}_", suffix=f".{data_format.value}")
+    os.close(handle)
+    return path
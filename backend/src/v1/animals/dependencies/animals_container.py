@@ -1,8 +1,20 @@
 from dependency_injector import containers, providers
 
+from config import RedisConfig
+from db.redis.redis_client import RedisClient
 from v1.animals.config import AnimalsServiceConfig
+from v1.animals.facets import AnimalTypeFacets
+from v1.animals.scheduler import InferenceScheduler
 from v1.animals.service import AnimalsService
 
 
 class AnimalsContainer(containers.DeclarativeContainer):
-    animals_service = providers.Factory(AnimalsService, AnimalsServiceConfig())
+    redis_client = providers.Singleton(RedisClient, RedisConfig())
+    # Один планировщик на воркер: очередь и слоты инференса общие для всех запросов
+    inference_scheduler = providers.Singleton(
+        InferenceScheduler.from_config, AnimalsServiceConfig(), redis_client
+    )
+    animal_type_facets = providers.Singleton(AnimalTypeFacets, redis_client)
+    animals_service = providers.Factory(
+        AnimalsService, AnimalsServiceConfig(), inference_scheduler, animal_type_facets
+    )
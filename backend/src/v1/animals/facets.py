@@ -0,0 +1,55 @@
+import logging
+import time
+from typing import Dict, Optional
+
+from db.redis.redis_client import RedisClient
+
+logger = logging.getLogger(__name__)
+
+
+class AnimalTypeFacets:
+    """
+    Материализованные фасеты "тип животного -> количество" в Redis
+
+    Счётчики меняются инкрементально при создании/изменении/удалении животного.
+    Hash создаётся только полной пересборкой из БД (rebuild), а инкременты
+    применяются лишь к существующему hash: после потери ключа частичные данные
+    не появятся, и следующее чтение пересоберёт фасеты. Ошибки Redis не ломают
+    запись в БД - расхождение лечится пересборкой.
+    """
+
+    KEY = "animal_type_facets"
+    # Служебное поле: hash существует, даже если животных нет
+    BUILT_AT_FIELD = "__built_at__"
+
+    def __init__(self, redis_client: RedisClient) -> None:
+        self.redis_client = redis_client
+
+    async def get(self) -> Optional[Dict[str, int]]:
+        """Текущие счётчики без нулевых типов; None, если фасеты не собраны или Redis недоступен"""
+        try:
+            facets = await self.redis_client.get_int_hash(self.KEY)
+        except Exception as e:
+            logger.warning(f"Failed to read animal type facets: {e}")
+            return None
+        if facets is None:
+            return None
+        return {
+            animal_type: count
+            for animal_type, count in facets.items()
+            if animal_type != self.BUILT_AT_FIELD and count > 0
+        }
+
+    async def apply(self, changes: Dict[str, int]) -> None:
+        """Применить изменения счётчиков, например {"корова": -1, "коза": 1}"""
+        for animal_type, delta in changes.items():
+            if not delta:
+                continue
+            try:
+                await self.redis_client.hincrby_if_exists(self.KEY, animal_type, delta)
+            except Exception as e:
+                logger.warning(f"Failed to update animal type facet {animal_type!r}: {e}")
+
+    async def rebuild(self, counts: Dict[str, int]) -> None:
+        """Заменить фасеты целиком счётчиками, посчитанными по БД"""
+        await self.redis_client.replace_hash(self.KEY, {**counts, self.BUILT_AT_FIELD: int(time.time())})
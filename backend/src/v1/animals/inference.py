@@ -0,0 +1,398 @@
+"""
+Тяжёлая часть аудио-пайплайна: декодирование аудио и распознавание речи.
+
+Модуль тянет torch, torchaudio и transformers, поэтому импортируется только
+по требованию (из AnimalsService при обработке аудио или при прогреве в lifespan).
+API-воркеры, обслуживающие auth/CRUD, его не загружают.
+"""
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Iterator, Optional
+from transformers import Wav2Vec2Processor, Wav2Vec2ForCTC
+import torch
+import torchaudio
+import logging
+import os
+import subprocess
+import time
+import wave
+import numpy as np
+import soundfile
+
+from core.metrics import REGISTRY
+from v1.animals.asr_routing import ASRTier, CascadePolicy, TranscriptionResult
+from v1.animals.config import AnimalsServiceConfig
+from v1.animals.audio_formats import (
+    DECODER_BY_CONTAINER,
+    AudioContainer,
+    AudioDecoder,
+    sniff_audio_file,
+)
+
+
+logger = logging.getLogger(__name__)
+
+config = AnimalsServiceConfig()
+cascade_policy = CascadePolicy.from_config(config)
+
+ASR_MODEL_NAME = config.ASR_LARGE_MODEL
+TARGET_SAMPLE_RATE = 16000
+FFMPEG_TIMEOUT_SECONDS = 60
+
+AUDIO_DECODE_SECONDS = REGISTRY.histogram(
+    "audio_decode_seconds",
+    "Audio decode time by sniffed container format and decoder path",
+    labelnames=("format", "decoder", "outcome"),
+)
+ASR_TRANSCRIBE_SECONDS = REGISTRY.histogram(
+    "asr_transcribe_seconds",
+    "ASR inference time per cascade tier",
+    labelnames=("tier", "model"),
+)
+ASR_ESCALATIONS = REGISTRY.counter(
+    "asr_escalations_total",
+    "Clips re-transcribed by the large model after a low-confidence fast pass",
+)
+
+
+def _decode_with_wave(audio_path: str) -> tuple[np.ndarray, int]:
+    """Декодирует PCM WAV стандартным модулем wave"""
+    with wave.open(audio_path, 'rb') as wav_file:
+        n_channels = wav_file.getnchannels()
+        sample_width = wav_file.getsampwidth()
+        sr = wav_file.getframerate()
+        audio_data = wav_file.readframes(wav_file.getnframes())
+
+    if sample_width == 2:  # 16-bit
+        audio_array = np.frombuffer(audio_data, dtype=np.int16)
+    elif sample_width == 4:  # 32-bit
+        audio_array = np.frombuffer(audio_data, dtype=np.int32)
+    elif sample_width == 1:  # 8-bit unsigned
+        audio_array = np.frombuffer(audio_data, dtype=np.uint8).astype(np.int16) - 128
+    else:
+        raise ValueError(f"Unsupported WAV sample width: {sample_width}")
+
+    # Нормализуем в [-1, 1] и приводим к [channels, time]
+    audio_array = audio_array.astype(np.float32) / (2 ** (sample_width * 8 - 1))
+    return audio_array.reshape(-1, n_channels).T, sr
+
+
+def _decode_with_sndfile(audio_path: str) -> tuple[np.ndarray, int]:
+    """Декодирует FLAC/Ogg Vorbis/WAV через libsndfile"""
+    audio_array, sr = soundfile.read(audio_path, dtype="float32", always_2d=True)
+    return audio_array.T, sr
+
+
+def _decode_with_ffmpeg(audio_path: str) -> tuple[np.ndarray, int]:
+    """
+    Декодирует аудиофайл ffmpeg'ом сразу в 16 kHz mono PCM через pipe
+
+    Args:
+        audio_path (str): путь к исходному аудиофайлу
+
+    Returns:
+        tuple[np.ndarray, int]: (аудио данные [1, time], частота дискретизации)
+    """
+    cmd = [
+        'ffmpeg', '-nostdin', '-v', 'error',
+        '-i', audio_path,
+        '-f', 's16le',           # сырой 16-bit PCM без WAV-заголовка
+        '-acodec', 'pcm_s16le',
+        '-ar', str(TARGET_SAMPLE_RATE),
+        '-ac', '1',              # mono
+        'pipe:1',
+    ]
+
+    try:
+        result = subprocess.run(cmd, capture_output=True, timeout=FFMPEG_TIMEOUT_SECONDS)
+    except subprocess.TimeoutExpired:
+        raise Exception("Audio conversion timed out")
+
+    if result.returncode != 0:
+        stderr = result.stderr.decode(errors="replace")
+        logger.error(f"ffmpeg stderr: {stderr}")
+        raise Exception(f"ffmpeg conversion failed: {stderr}")
+
+    audio_array = np.frombuffer(result.stdout, dtype=np.int16).astype(np.float32) / 32768.0
+    return audio_array[np.newaxis, :], TARGET_SAMPLE_RATE
+
+
+DECODERS = {
+    AudioDecoder.WAVE: _decode_with_wave,
+    AudioDecoder.SNDFILE: _decode_with_sndfile,
+    AudioDecoder.FFMPEG: _decode_with_ffmpeg,
+}
+
+
+def _decode(audio_path: str, container: AudioContainer, decoder: AudioDecoder) -> tuple[np.ndarray, int]:
+    """Запускает декодер и записывает время декодирования по формату и пути"""
+    start = time.perf_counter()
+    outcome = "success"
+    try:
+        return DECODERS[decoder](audio_path)
+    except Exception:
+        outcome = "error"
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        AUDIO_DECODE_SECONDS.observe(elapsed, format=container.value, decoder=decoder.value, outcome=outcome)
+        logger.info(f"Decoded {container.value} via {decoder.value} in {elapsed:.3f}s ({outcome})")
+
+
+def load_audio_file(audio_path: str) -> tuple[torch.Tensor, int]:
+    """
+    Загружает аудиофайл, выбирая декодер по магическим байтам заголовка
+
+    WAV декодируется модулем wave, FLAC/Ogg Vorbis - libsndfile, остальные
+    форматы (MP3, M4A, AAC, Opus, WebM, WMA) - ffmpeg через pipe. ffmpeg
+    используется повторно только если основной декодер не справился.
+
+    Args:
+        audio_path (str): путь к аудиофайлу
+
+    Returns:
+        tuple[torch.Tensor, int]: (аудио данные [channels, time], частота дискретизации)
+    """
+    container = sniff_audio_file(audio_path)
+    decoder = DECODER_BY_CONTAINER[container]
+
+    try:
+        audio_array, sr = _decode(audio_path, container, decoder)
+    except Exception as e:
+        if decoder == AudioDecoder.FFMPEG:
+            raise Exception(f"Failed to load audio file {audio_path}: {e}")
+        logger.warning(f"{decoder.value} failed for {container.value} file, falling back to ffmpeg: {e}")
+        audio_array, sr = _decode(audio_path, container, AudioDecoder.FFMPEG)
+
+    wav = torch.from_numpy(np.ascontiguousarray(audio_array))
+    logger.info(f"Audio loaded: format={container.value}, shape={wav.shape}, sr={sr}")
+    return wav, sr
+
+
+def load_audio_for_asr(audio_path: str) -> torch.Tensor:
+    """
+    Загружает аудиофайл и приводит его к входу модели: mono, 16 kHz, [1, time]
+
+    Args:
+        audio_path (str): путь к аудиофайлу
+
+    Returns:
+        torch.Tensor: аудио данные [1, time] с частотой TARGET_SAMPLE_RATE
+    """
+    # Проверяем что файл существует
+    if not os.path.exists(audio_path):
+        raise Exception(f"Audio file not found: {audio_path}")
+
+    file_size = os.path.getsize(audio_path)
+    logger.info(f"Audio file size: {file_size} bytes")
+
+    if file_size == 0:
+        raise Exception("Audio file is empty")
+
+    wav, sr = load_audio_file(audio_path)
+
+    # Проверяем минимальную длительность (например, 0.5 секунды)
+    duration = wav.shape[-1] / sr
+    if duration < 0.5:
+        raise Exception(f"Audio file too short: {duration:.2f} seconds (minimum 0.5 seconds)")
+
+    logger.info(f"Audio duration: {duration:.2f} seconds")
+
+    # Ресемплинг если необходимо
+    if sr != TARGET_SAMPLE_RATE:
+        logger.info(f"Resampling from {sr}Hz to {TARGET_SAMPLE_RATE}Hz")
+        wav = torchaudio.functional.resample(wav, sr, TARGET_SAMPLE_RATE)
+
+    # Конвертация стерео в моно если необходимо
+    if wav.dim() > 1 and wav.size(0) > 1:
+        logger.info("Converting stereo to mono")
+        wav = wav.mean(dim=0, keepdim=True)
+
+    if wav.dim() == 1:
+        # [time] -> [1, time]
+        wav = wav.unsqueeze(0)
+
+    # Убеждаемся что у нас правильная размерность [channels, time]
+    if wav.dim() != 2:
+        raise Exception(f"Invalid audio tensor shape after processing: {wav.shape}")
+
+    return wav
+
+
+class ASRBackend(ABC):
+    """Интерфейс бэкенда распознавания речи"""
+
+    tier: ASRTier
+    model_name: str
+
+    @abstractmethod
+    def transcribe(self, wav: torch.Tensor) -> TranscriptionResult:
+        """Распознаёт аудио [1, time] с частотой TARGET_SAMPLE_RATE"""
+
+
+class Wav2Vec2Backend(ASRBackend):
+    def __init__(self, tier: ASRTier, model_name: str, quantized: bool = False) -> None:
+        self.tier = tier
+        self.model_name = model_name
+        self.quantized = quantized
+        self.processor, self.model = load_asr_model(model_name, quantized)
+
+    def transcribe(self, wav: torch.Tensor) -> TranscriptionResult:
+        start = time.perf_counter()
+        inputs = self.processor(wav, sampling_rate=TARGET_SAMPLE_RATE, return_tensors="pt", padding=True)
+
+        with torch.no_grad():
+            logits = self.model(**inputs).logits
+
+        predicted_ids = torch.argmax(logits, dim=-1)
+        text = self.processor.batch_decode(predicted_ids)[0]
+        confidence = _ctc_confidence(logits[0], predicted_ids[0], self.processor.tokenizer.pad_token_id)
+        elapsed = time.perf_counter() - start
+
+        ASR_TRANSCRIBE_SECONDS.observe(elapsed, tier=self.tier.value, model=self.model_name)
+        return TranscriptionResult(
+            text=text,
+            confidence=confidence,
+            tier=self.tier,
+            model_name=self.model_name,
+            audio_seconds=wav.shape[-1] / TARGET_SAMPLE_RATE,
+            elapsed_seconds=elapsed,
+        )
+
+
+def _ctc_confidence(logits: torch.Tensor, predicted_ids: torch.Tensor, blank_id: int) -> float:
+    """Средняя вероятность выбранного токена по фреймам, где модель не выдала blank"""
+    frame_probs = torch.softmax(logits, dim=-1).max(dim=-1).values
+    speech_frames = predicted_ids != blank_id
+    if not bool(speech_frames.any()):
+        return 0.0
+    return float(frame_probs[speech_frames].mean())
+
+
+@lru_cache(maxsize=None)
+def load_asr_model(
+    model_name: str = ASR_MODEL_NAME, quantized: bool = False
+) -> tuple[Wav2Vec2Processor, Wav2Vec2ForCTC]:
+    """Загружает процессор и модель Wav2Vec2 один раз на процесс"""
+    logger.info(f"Loading Wav2Vec2 model {model_name} (quantized={quantized})...")
+    processor = Wav2Vec2Processor.from_pretrained(model_name)
+    model = Wav2Vec2ForCTC.from_pretrained(model_name)
+    model.eval()
+    if quantized:
+        # Динамическая int8-квантизация линейных слоёв: в 2-3 раза быстрее на CPU
+        model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    logger.info("Model loaded successfully")
+    return processor, model
+
+
+@lru_cache(maxsize=None)
+def get_asr_backend(tier: ASRTier) -> ASRBackend:
+    """Бэкенд для уровня каскада, создаётся один раз на процесс"""
+    if tier == ASRTier.FAST:
+        return Wav2Vec2Backend(tier, config.ASR_FAST_MODEL, quantized=config.ASR_FAST_QUANTIZED)
+    return Wav2Vec2Backend(tier, config.ASR_LARGE_MODEL)
+
+
+def preload_asr_backends() -> None:
+    """Загружает модели всех уровней каскада, которые может выбрать политика"""
+    if cascade_policy.enabled:
+        get_asr_backend(ASRTier.FAST)
+    get_asr_backend(ASRTier.LARGE)
+
+
+def transcribe_waveform(
+    wav: torch.Tensor, policy: Optional[CascadePolicy] = None, tier: Optional[ASRTier] = None
+) -> TranscriptionResult:
+    """
+    Распознаёт аудио каскадом моделей
+
+    Короткий клип сначала распознаётся быстрой моделью; если уверенность CTC
+    ниже порога, клип перераспознаётся большой моделью. Длинные клипы сразу
+    идут в большую модель. tier - модель первого прохода, выбранная заранее
+    (для чанка - по длительности всей записи, а не самого чанка).
+    """
+    policy = policy or cascade_policy
+    audio_seconds = wav.shape[-1] / TARGET_SAMPLE_RATE
+
+    result = get_asr_backend(tier or policy.initial_tier(audio_seconds)).transcribe(wav)
+    logger.info(
+        f"ASR {result.tier.value} tier: confidence={result.confidence:.3f}, "
+        f"{result.elapsed_seconds:.2f}s for {audio_seconds:.1f}s of audio"
+    )
+
+    if policy.should_escalate(result):
+        ASR_ESCALATIONS.inc()
+        logger.info(f"Escalating to large model: confidence {result.confidence:.3f} < {policy.min_confidence}")
+        large_result = get_asr_backend(ASRTier.LARGE).transcribe(wav)
+        result = large_result.model_copy(
+            update={"escalated": True, "elapsed_seconds": result.elapsed_seconds + large_result.elapsed_seconds}
+        )
+
+    return result
+
+
+def split_waveform(wav: torch.Tensor, chunk_seconds: float) -> list[torch.Tensor]:
+    """
+    Режет аудио [1, time] на чанки примерно по chunk_seconds
+
+    Граница чанка сдвигается на самый тихий 20-мс фрейм в последней секунде
+    окна (для коротких чанков - во второй половине), чтобы не резать слова
+    посередине. Хвост короче секунды присоединяется к предыдущему чанку.
+    """
+    total = wav.shape[-1]
+    frame_samples = TARGET_SAMPLE_RATE // 50  # 20 мс
+    chunk_samples = max(int(chunk_seconds * TARGET_SAMPLE_RATE), frame_samples)
+    # окно поиска паузы - 1 секунда, но не больше половины чанка: иначе в тишине
+    # (первый из равных фреймов) чанки вырождаются в десятки миллисекунд
+    search_samples = max(min(TARGET_SAMPLE_RATE, chunk_samples // 2), frame_samples)
+
+    chunks, start = [], 0
+    while total - start > chunk_samples + TARGET_SAMPLE_RATE:
+        window_start = start + chunk_samples - search_samples
+        window = wav[0, window_start:start + chunk_samples]
+        frames = window[: len(window) // frame_samples * frame_samples].reshape(-1, frame_samples)
+        quietest = int(frames.pow(2).mean(dim=-1).argmin())
+        end = window_start + quietest * frame_samples + frame_samples // 2
+        chunks.append(wav[:, start:end])
+        start = end
+    chunks.append(wav[:, start:])
+    return chunks
+
+
+def iter_transcribed_chunks(audio_path: str, chunk_seconds: float) -> Iterator[TranscriptionResult]:
+    """Распознаёт аудиофайл по чанкам, отдавая каждый сразу после декодирования"""
+    logger.info(f"Starting chunked transcription for file: {audio_path}")
+    wav = load_audio_for_asr(audio_path)
+    # Модель выбирается по длине всей записи: чанки не длиннее порога быстрой модели,
+    # и длинная запись иначе целиком ушла бы в быстрый уровень
+    tier = cascade_policy.initial_tier(wav.shape[-1] / TARGET_SAMPLE_RATE)
+    chunks = split_waveform(wav, chunk_seconds)
+    logger.info(f"Audio split into {len(chunks)} chunk(s) of ~{chunk_seconds:.0f}s, {tier.value} tier")
+    for chunk in chunks:
+        yield transcribe_waveform(chunk, tier=tier)
+
+
+def transcribe_audio(audio_path: str) -> TranscriptionResult:
+    """Загрузка аудиофайла и распознавание каскадом моделей"""
+    logger.info(f"Starting transcription for file: {audio_path}")
+    wav = load_audio_for_asr(audio_path)
+    result = transcribe_waveform(wav)
+    logger.info(f"Transcription completed: {result.text[:100]}...")
+    return result
+
+
+def transcribe_russian_audio(audio_path: str) -> str:
+    """
+    Транскрибация русского аудио в текст
+
+    Args:
+        audio_path (str): путь к аудиофайлу
+
+    Returns:
+        str: распознанный текст
+    """
+    try:
+        return transcribe_audio(audio_path).text
+    except Exception as e:
+        logger.error(f"Error during audio transcription: {e}")
+        return f"Ошибка при транскрибации аудио: {str(e)}"
@@ -0,0 +1,99 @@
+import asyncio
+import logging
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from pydantic import BaseModel
+
+from v1.animals.asr_routing import TranscriptionResult
+from v1.animals.utils import merge_analyses
+
+logger = logging.getLogger(__name__)
+
+# Маркер конца потока чанков от ASR
+_END_OF_STREAM = object()
+
+
+class PipelineResult(BaseModel):
+    chunks: List[TranscriptionResult]
+    analysis: Dict[str, Any]
+
+    @property
+    def text(self) -> str:
+        return " ".join(chunk.text.strip() for chunk in self.chunks if chunk.text.strip())
+
+    @property
+    def audio_seconds(self) -> float:
+        return sum(chunk.audio_seconds for chunk in self.chunks)
+
+    @property
+    def confidence(self) -> float:
+        """Средняя уверенность ASR, взвешенная по длительности чанков"""
+        if not self.audio_seconds:
+            return 0.0
+        return sum(chunk.confidence * chunk.audio_seconds for chunk in self.chunks) / self.audio_seconds
+
+
+async def run_transcription_pipeline(
+    transcribe_chunks: Callable[[], Iterator[TranscriptionResult]],
+    analyze: Callable[[str], dict],
+    max_concurrent_analyses: int = 4,
+) -> PipelineResult:
+    """
+    Конвейер ASR -> LLM для чанкованного аудио
+
+    ASR выполняется в отдельном потоке и отдаёт чанки по мере декодирования;
+    каждый непустой чанк сразу уходит на анализ в LLM, пока ASR декодирует
+    следующий. Результаты анализа сливаются в порядке чанков.
+
+    Args:
+        transcribe_chunks: фабрика синхронного итератора распознанных чанков
+        analyze: синхронный анализ текста (например, parse_text)
+        max_concurrent_analyses: сколько запросов к LLM может идти одновременно
+
+    Returns:
+        PipelineResult: распознанные чанки и объединённый анализ
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    semaphore = asyncio.Semaphore(max_concurrent_analyses)
+
+    def produce() -> None:
+        try:
+            for chunk in transcribe_chunks():
+                loop.call_soon_threadsafe(queue.put_nowait, chunk)
+        except BaseException as e:
+            loop.call_soon_threadsafe(queue.put_nowait, e)
+        finally:
+            loop.call_soon_threadsafe(queue.put_nowait, _END_OF_STREAM)
+
+    async def analyze_chunk(index: int, text: str) -> Optional[dict]:
+        async with semaphore:
+            logger.info(f"Analyzing chunk {index} ({len(text)} chars)")
+            return await asyncio.to_thread(analyze, text)
+
+    producer = loop.run_in_executor(None, produce)
+    chunks: List[TranscriptionResult] = []
+    analyses: List[asyncio.Task] = []
+    error: Optional[BaseException] = None
+
+    try:
+        while True:
+            item = await queue.get()
+            if item is _END_OF_STREAM:
+                break
+            if isinstance(item, BaseException):
+                error = item
+                continue
+            chunks.append(item)
+            if item.text.strip():
+                analyses.append(asyncio.create_task(analyze_chunk(len(chunks) - 1, item.text)))
+        await producer
+        if error is not None:
+            raise error
+        results = await asyncio.gather(*analyses)
+    except BaseException:
+        for task in analyses:
+            task.cancel()
+        raise
+
+    return PipelineResult(chunks=chunks, analysis=merge_analyses([r for r in results if r]))
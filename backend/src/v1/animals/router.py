@@ -1,8 +1,17 @@
+import hmac
+import os
+from datetime import date
+
 from dependency_injector.wiring import Provide, inject
-from fastapi import APIRouter, Depends, File, Form, HTTPException, Query, UploadFile, status
+from fastapi import APIRouter, Depends, File, Form, Header, HTTPException, Query, Request, UploadFile, status
+from fastapi.responses import FileResponse
+from starlette.background import BackgroundTask
 from typing import Optional
 
 from common_schemas import ResponseSchema
+from core.responses import EnvelopeResponse
+from v1.animals.config import AnimalsServiceConfig
+from v1.animals.data_transfer import DataFormat, DataTable
 from v1.animals.dependencies.animals_container import AnimalsContainer
 from v1.animals.schemas import (
     AnimalCreateRequest,
@@ -16,19 +25,40 @@ from v1.animals.schemas import (
     AnimalsListResponse
 )
 from v1.animals.service import AnimalsService
+from v1.auth.utils import verify_jwt_token
 
 router = APIRouter(prefix="/animals", tags=["Animals"])
 
 
+def get_inference_client_id(request: Request) -> str:
+    """Идентификатор клиента для квот инференса: user_id из токена или IP"""
+    authorization = request.headers.get("authorization", "")
+    if authorization.lower().startswith("bearer "):
+        try:
+            user_id = verify_jwt_token(authorization[7:]).get("user_id")
+            if user_id is not None:
+                return f"user:{user_id}"
+        except Exception:
+            pass
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+
+def require_admin_key(x_admin_key: str = Header("", description="Ключ admin-эндпоинтов (ANIMALS_ADMIN_API_KEY)")) -> None:
+    """Доступ к admin-эндпоинтам только по ключу; без настроенного ключа они выключены"""
+    admin_key = AnimalsServiceConfig().ADMIN_API_KEY
+    if not admin_key or not hmac.compare_digest(x_admin_key.encode(), admin_key.encode()):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin key required")
+
+
 @router.post("/", response_model=ResponseSchema)
 @inject
 async def create_animal(
     data: AnimalCreateRequest,
     animals_service: AnimalsService = Depends(Provide[AnimalsContainer.animals_service]),
-) -> ResponseSchema:
+) -> EnvelopeResponse:
     """Создание нового животного"""
     result = await animals_service.create_animal(data)
-    return ResponseSchema(exception=0, data=result.model_dump())
+    return EnvelopeResponse(result)
 
 
 @router.get("/", response_model=ResponseSchema)
@@ -37,15 +67,17 @@ async def get_all_animals(
     page: int = Query(1, ge=1, description="Номер страницы"),
     page_size: int = Query(50, ge=1, le=100, description="Количество животных на странице"),
     animal_type: Optional[str] = Query(None, description="Фильтр по типу животного"),
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы (next_cursor из предыдущего ответа)"),
     animals_service: AnimalsService = Depends(Provide[AnimalsContainer.animals_service]),
-) -> ResponseSchema:
+) -> EnvelopeResponse:
     """Получение списка всех животных с пагинацией и фильтрацией"""
     result = await animals_service.get_all_animals(
         page=page, 
         page_size=page_size, 
-        animal_type=animal_type
+        animal_type=animal_type,
+        cursor=cursor
     )
-    return ResponseSchema(exception=0, data=result.model_dump())
+    return EnvelopeResponse(result)
 
 
 @router.get("/{animal_id}", response_model=ResponseSchema)
@@ -53,21 +85,54 @@ async def get_all_animals(
 async def get_animal_by_id(
     animal_id: int,
     animals_service: AnimalsService = Depends(Provide[AnimalsContainer.animals_service]),
-) -> ResponseSchema:
+) -> EnvelopeResponse:
     """Получение животного по ID"""
     result = await animals_service.get_animal_by_id(animal_id)
-    return ResponseSchema(exception=0, data=result.model_dump())
+    return EnvelopeResponse(result)
 
 
 @router.get("/{animal_id}/transcriptions", response_model=ResponseSchema)
 @inject
 async def get_animal_with_transcriptions(
     animal_id: int,
+    limit: Optional[int] = Query(None, ge=1, le=100, description="Сколько последних транскрипций вернуть"),
+    include_details: bool = Query(True, description="False - без measurements, feeding_details и relationships"),
+    animals_service: AnimalsService = Depends(Provide[AnimalsContainer.animals_service]),
+) -> EnvelopeResponse:
+    """Получение животного с последними транскрипциями; более старые - через /transcriptions/history"""
+    result = await animals_service.get_animal_with_transcriptions(
+        animal_id, limit=limit, include_details=include_details
+    )
+    return EnvelopeResponse(result)
+
+
+@router.get("/{animal_id}/transcriptions/history", response_model=ResponseSchema)
+@inject
+async def get_animal_transcriptions_page(
+    animal_id: int,
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы (next_cursor из предыдущего ответа)"),
+    limit: int = Query(50, ge=1, le=100, description="Количество транскрипций на странице"),
+    include_details: bool = Query(True, description="False - без measurements, feeding_details и relationships"),
+    animals_service: AnimalsService = Depends(Provide[AnimalsContainer.animals_service]),
+) -> EnvelopeResponse:
+    """Транскрипции животного от новых к старым с курсорной пагинацией"""
+    result = await animals_service.get_animal_transcriptions(
+        animal_id, cursor=cursor, limit=limit, include_details=include_details
+    )
+    return EnvelopeResponse(result)
+
+
+@router.get("/{animal_id}/trends", response_model=ResponseSchema)
+@inject
+async def get_animal_trends(
+    animal_id: int,
+    date_from: Optional[date] = Query(None, description="Первый день периода (по умолчанию - 90 дней до date_to)"),
+    date_to: Optional[date] = Query(None, description="Последний день периода (по умолчанию - сегодня, UTC)"),
     animals_service: AnimalsService = Depends(Provide[AnimalsContainer.animals_service]),
-) -> ResponseSchema:
-    """Получение животного со всеми его транскрипциями и данными"""
-    result = await animals_service.get_animal_with_transcriptions(animal_id)
-    return ResponseSchema(exception=0, data=result.model_dump())
+) -> EnvelopeResponse:
+    """Дневные минимум/максимум/среднее веса и температуры, количество корма и записей"""
+    result = await animals_service.get_animal_trends(animal_id, date_from=date_from, date_to=date_to)
+    return EnvelopeResponse(result)
 
 
 @router.put("/{animal_id}", response_model=ResponseSchema)
@@ -76,10 +141,10 @@ async def update_animal(
     animal_id: int,
     data: AnimalUpdateRequest,
     animals_service: AnimalsService = Depends(Provide[AnimalsContainer.animals_service]),
-) -> ResponseSchema:
+) -> EnvelopeResponse:
     """Обновление информации о животном"""
     result = await animals_service.update_animal(animal_id, data)
-    return ResponseSchema(exception=0, data=result.model_dump())
+    return EnvelopeResponse(result)
 
 
 @router.delete("/{animal_id}", response_model=ResponseSchema)
@@ -87,10 +152,10 @@ async def update_animal(
 async def delete_animal(
     animal_id: int,
     animals_service: AnimalsService = Depends(Provide[AnimalsContainer.animals_service]),
-) -> ResponseSchema:
+) -> EnvelopeResponse:
     """Удаление животного"""
     result = await animals_service.delete_animal(animal_id)
-    return ResponseSchema(exception=0, data=result)
+    return EnvelopeResponse(result)
 
 
 @router.post("/transcriptions", response_model=ResponseSchema)
@@ -98,10 +163,10 @@ async def delete_animal(
 async def create_transcription(
     data: TranscriptionCreateRequest,
     animals_service: AnimalsService = Depends(Provide[AnimalsContainer.animals_service]),
-) -> ResponseSchema:
+) -> EnvelopeResponse:
     """Создание новой транскрипции для животного"""
     result = await animals_service.create_transcription(data)
-    return ResponseSchema(exception=0, data=result.model_dump())
+    return EnvelopeResponse(result)
 
 
 @router.post("/audio/process", response_model=ResponseSchema)
@@ -110,8 +175,9 @@ async def process_audio(
     audio_file: UploadFile = File(..., description="Аудио файл для обработки (поддерживаемые форматы: mp3, wav, m4a, flac, aac, ogg, wma, webm, opus)"),
     animal_id: int = Form(..., description="ID животного, к которому относится аудио"),
     description: Optional[str] = Form(None, description="Описание аудиозаписи (опционально)"),
+    client_id: str = Depends(get_inference_client_id),
     animals_service: AnimalsService = Depends(Provide[AnimalsContainer.animals_service]),
-) -> ResponseSchema:
+) -> EnvelopeResponse:
     """
     Обработка аудио файла и создание транскрипции
     
@@ -125,6 +191,9 @@ async def process_audio(
     **Поддерживаемые форматы**: mp3, wav, m4a, flac, aac, ogg, wma, webm, opus
     **Максимальный размер**: 100MB
     **Максимальная длительность**: 30 минут
+
+    Короткие записи обрабатываются раньше длинных; клиенты, исчерпавшие
+    квоту секунд инференса, обслуживаются после остальных.
     """
     # Создаем объект запроса
     processing_request = AudioProcessingRequest(
@@ -132,8 +201,8 @@ async def process_audio(
         description=description
     )
     
-    result = await animals_service.process_audio(audio_file, processing_request)
-    return ResponseSchema(exception=0, data=result.model_dump())
+    result = await animals_service.process_audio(audio_file, processing_request, client_id)
+    return EnvelopeResponse(result)
 
 
 @router.get("/audio/status/{transcription_id}", response_model=ResponseSchema)
@@ -141,7 +210,7 @@ async def process_audio(
 async def get_audio_processing_status(
     transcription_id: int,
     animals_service: AnimalsService = Depends(Provide[AnimalsContainer.animals_service]),
-) -> ResponseSchema:
+) -> EnvelopeResponse:
     """
     Получение статуса обработки аудио и результатов транскрипции
     
@@ -153,7 +222,7 @@ async def get_audio_processing_status(
     """
     try:
         result = await animals_service.get_transcription_by_id(transcription_id)
-        return ResponseSchema(exception=0, data=result.model_dump())
+        return EnvelopeResponse(result)
         
     except HTTPException:
         raise
@@ -173,42 +242,51 @@ async def get_audio_processing_status(
 @inject
 async def get_animal_types(
     animals_service: AnimalsService = Depends(Provide[AnimalsContainer.animals_service]),
-) -> ResponseSchema:
-    """Получение списка всех типов животных в системе"""
-    # Получаем всех животных и извлекаем уникальные типы
-    all_animals = await animals_service.get_all_animals(page=1, page_size=1000)
-    unique_types = list(set(animal.animal for animal in all_animals.animals))
-    
-    return ResponseSchema(
-        exception=0, 
-        data={
-            "animal_types": sorted(unique_types),
-            "total_types": len(unique_types)
-        }
-    )
+) -> EnvelopeResponse:
+    """Получение списка всех типов животных в системе с количеством животных каждого типа"""
+    result = await animals_service.get_animal_types()
+    return EnvelopeResponse(result)
 
 
 @router.get("/search/by-name", response_model=ResponseSchema)
 @inject
 async def search_animals_by_name(
-    name: str = Query(..., description="Часть имени для поиска"),
+    name: str = Query(..., min_length=1, description="Часть имени для поиска"),
+    cursor: Optional[str] = Query(None, description="Курсор следующей страницы из предыдущего ответа"),
+    limit: int = Query(50, ge=1, le=100, description="Размер страницы"),
     animals_service: AnimalsService = Depends(Provide[AnimalsContainer.animals_service]),
-) -> ResponseSchema:
-    """Поиск животных по имени (частичное совпадение)"""
-    # Пока используем простой поиск через получение всех животных
-    # В будущем можно оптимизировать через отдельный метод репозитория
-    all_animals = await animals_service.get_all_animals(page=1, page_size=1000)
-    
-    filtered_animals = [
-        animal for animal in all_animals.animals 
-        if name.lower() in animal.name.lower()
-    ]
-    
-    return ResponseSchema(
-        exception=0, 
-        data={
-            "animals": [animal.model_dump() for animal in filtered_animals],
-            "total": len(filtered_animals),
-            "search_term": name
-        }
+) -> EnvelopeResponse:
+    """Поиск животных по имени (подстрока или похожее имя), самые похожие - первыми"""
+    result = await animals_service.search_animals_by_name(name, cursor=cursor, limit=limit)
+    return EnvelopeResponse(result)
+
+
+# Массовый импорт/экспорт через COPY (только с ключом администратора)
+@router.post("/admin/import/{table}", response_model=ResponseSchema, dependencies=[Depends(require_admin_key)])
+@inject
+async def import_data(
+    table: DataTable,
+    data_format: DataFormat = Query(DataFormat.CSV, alias="format", description="Формат файла: csv или parquet"),
+    data_file: UploadFile = File(..., description="CSV с заголовком или Parquet; колонки - колонки таблицы"),
+    animals_service: AnimalsService = Depends(Provide[AnimalsContainer.animals_service]),
+) -> EnvelopeResponse:
+    """Загрузка животных или транскрипций из файла; в ответе - количество строк и скорость (строк/с)"""
+    result = await animals_service.import_data(table, data_format, data_file)
+    return EnvelopeResponse(result, message="Import completed")
+
+
+@router.get("/admin/export/{table}", dependencies=[Depends(require_admin_key)])
+@inject
+async def export_data(
+    table: DataTable,
+    data_format: DataFormat = Query(DataFormat.CSV, alias="format", description="Формат файла: csv или parquet"),
+    animals_service: AnimalsService = Depends(Provide[AnimalsContainer.animals_service]),
+) -> FileResponse:
+    """Выгрузка таблицы файлом; количество строк и скорость - в заголовках X-Rows и X-Rows-Per-Second"""
+    path, stats = await animals_service.export_data(table, data_format)
+    return FileResponse(
+        path,
+        filename=f"{table.value}.{data_format.value}",
+        headers={"X-Rows": str(stats.rows), "X-Rows-Per-Second": str(stats.rows_per_second)},
+        background=BackgroundTask(os.remove, path),
     )
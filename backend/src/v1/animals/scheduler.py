@@ -0,0 +1,196 @@
+import asyncio
+import itertools
+import logging
+import time
+from contextlib import asynccontextmanager
+from enum import Enum
+from typing import AsyncIterator, Dict, List, Optional
+
+from core.metrics import REGISTRY
+from db.redis.redis_client import RedisClient
+from v1.animals.config import AnimalsServiceConfig
+
+logger = logging.getLogger(__name__)
+
+
+class PriorityClass(str, Enum):
+    SHORT = "short"    # голосовые заметки
+    MEDIUM = "medium"
+    LONG = "long"      # многоминутные записи
+
+
+def priority_class(estimated_seconds: float) -> PriorityClass:
+    if estimated_seconds <= 30:
+        return PriorityClass.SHORT
+    if estimated_seconds <= 300:
+        return PriorityClass.MEDIUM
+    return PriorityClass.LONG
+
+
+INFERENCE_QUEUE_WAIT_SECONDS = REGISTRY.histogram(
+    "inference_queue_wait_seconds",
+    "Time audio jobs spend waiting for an inference slot",
+    labelnames=("priority_class",),
+    buckets=(0.1, 0.5, 1.0, 5.0, 15.0, 30.0, 60.0, 120.0, 300.0, 600.0, 1800.0),
+)
+INFERENCE_JOBS = REGISTRY.counter(
+    "inference_jobs_total",
+    "Audio jobs dispatched to inference",
+    labelnames=("priority_class", "over_quota"),
+)
+
+# Глубину очереди экспортирует последний созданный планировщик (один на воркер):
+# gauge регистрируется один раз, а callback читает текущий экземпляр
+_active_scheduler: Optional["InferenceScheduler"] = None
+
+
+def _queue_depth() -> Dict[tuple, float]:
+    depth = {(cls.value,): 0.0 for cls in PriorityClass}
+    if _active_scheduler is not None:
+        for job in _active_scheduler._queue:
+            depth[(job.priority_class.value,)] += 1
+    return depth
+
+
+REGISTRY.gauge(
+    "inference_queue_depth",
+    "Audio jobs waiting for an inference slot",
+    labelnames=("priority_class",),
+    callback=_queue_depth,
+)
+
+
+class FairShareTracker:
+    """
+    Учёт секунд инференса на клиента в Redis в фиксированном окне
+
+    Счётчик общий для всех воркеров, поэтому квота соблюдается по всему пулу.
+    Если Redis недоступен, учёт пропускается, а задачи не блокируются.
+    """
+
+    KEY_PREFIX = "inference_usage"
+
+    def __init__(self, redis_client: RedisClient, window_seconds: int, quota_seconds: float) -> None:
+        self.redis_client = redis_client
+        self.window_seconds = window_seconds
+        self.quota_seconds = quota_seconds
+
+    def _key(self, client_id: str) -> str:
+        window = int(time.time() // self.window_seconds)
+        return f"{self.KEY_PREFIX}:{window}:{client_id}"
+
+    async def usage(self, client_id: str) -> float:
+        try:
+            return await self.redis_client.get_float(self._key(client_id))
+        except Exception as e:
+            logger.warning(f"Failed to read inference usage for {client_id}: {e}")
+            return 0.0
+
+    async def charge(self, client_id: str, seconds: float) -> None:
+        try:
+            await self.redis_client.incr_float_with_ttl(self._key(client_id), seconds, self.window_seconds)
+        except Exception as e:
+            logger.warning(f"Failed to charge inference usage for {client_id}: {e}")
+
+
+class _Job:
+    def __init__(self, seq: int, client_id: str, estimated_seconds: float, over_quota: bool) -> None:
+        self.seq = seq
+        self.client_id = client_id
+        self.estimated_seconds = estimated_seconds
+        self.over_quota = over_quota
+        self.priority_class = priority_class(estimated_seconds)
+        self.enqueued_at = time.monotonic()
+        self.ready: asyncio.Future = asyncio.get_running_loop().create_future()
+
+
+class InferenceScheduler:
+    """
+    Планировщик слотов инференса внутри воркера
+
+    Свободный слот получает задача с наименьшей оценкой длительности
+    (shortest-job-first). Ожидание уменьшает эффективную длительность
+    (aging), поэтому длинные записи не голодают бесконечно. Клиенты,
+    превысившие квоту секунд инференса в окне, обслуживаются после остальных.
+    """
+
+    def __init__(self, max_concurrent_jobs: int, fair_share: FairShareTracker, aging_factor: float = 0.5) -> None:
+        self.max_concurrent_jobs = max_concurrent_jobs
+        self.fair_share = fair_share
+        self.aging_factor = aging_factor
+        self._queue: List[_Job] = []
+        self._running = 0
+        self._seq = itertools.count()
+        # Локальное дополнение к Redis: секунды, списанные этим воркером после чтения квоты
+        self._pending_charges: Dict[str, float] = {}
+        global _active_scheduler
+        _active_scheduler = self
+
+    @classmethod
+    def from_config(cls, config: AnimalsServiceConfig, redis_client: RedisClient) -> "InferenceScheduler":
+        fair_share = FairShareTracker(
+            redis_client,
+            window_seconds=config.INFERENCE_FAIR_SHARE_WINDOW_SECONDS,
+            quota_seconds=config.INFERENCE_FAIR_SHARE_QUOTA_SECONDS,
+        )
+        return cls(config.INFERENCE_MAX_CONCURRENT_JOBS, fair_share, config.INFERENCE_AGING_FACTOR)
+
+    def _sort_key(self, job: _Job, now: float) -> tuple:
+        waited = now - job.enqueued_at
+        return (job.over_quota, job.estimated_seconds - self.aging_factor * waited, job.seq)
+
+    def _dispatch(self) -> None:
+        now = time.monotonic()
+        while self._queue and self._running < self.max_concurrent_jobs:
+            job = min(self._queue, key=lambda j: self._sort_key(j, now))
+            self._queue.remove(job)
+            self._running += 1
+            job.ready.set_result(None)
+
+    @asynccontextmanager
+    async def slot(self, client_id: str, estimated_seconds: float) -> AsyncIterator[None]:
+        """
+        Ждёт свободный слот инференса для задачи клиента
+
+        Args:
+            client_id: идентификатор клиента для учёта квоты
+            estimated_seconds: оценка длительности аудио из заголовка
+        """
+        used = await self.fair_share.usage(client_id) + self._pending_charges.get(client_id, 0.0)
+        job = _Job(next(self._seq), client_id, estimated_seconds, used >= self.fair_share.quota_seconds)
+        self._queue.append(job)
+        self._dispatch()
+
+        try:
+            await job.ready
+        except asyncio.CancelledError:
+            if job in self._queue:
+                self._queue.remove(job)
+            elif job.ready.done():
+                self._running -= 1
+                self._dispatch()
+            raise
+
+        wait = time.monotonic() - job.enqueued_at
+        INFERENCE_QUEUE_WAIT_SECONDS.observe(wait, priority_class=job.priority_class.value)
+        INFERENCE_JOBS.inc(priority_class=job.priority_class.value, over_quota=str(job.over_quota).lower())
+        logger.info(
+            f"Inference slot granted to {client_id}: ~{estimated_seconds:.1f}s audio, "
+            f"class={job.priority_class.value}, waited {wait:.2f}s, over_quota={job.over_quota}"
+        )
+
+        # Пока задача идёт, резервируем оценку, чтобы новые задачи клиента видели расход;
+        # по завершении списываем фактическое время в слоте
+        self._pending_charges[client_id] = self._pending_charges.get(client_id, 0.0) + estimated_seconds
+        started_at = time.monotonic()
+        try:
+            yield
+        finally:
+            self._running -= 1
+            self._dispatch()
+            await self.fair_share.charge(client_id, time.monotonic() - started_at)
+            remaining = self._pending_charges.get(client_id, 0.0) - estimated_seconds
+            if remaining > 0:
+                self._pending_charges[client_id] = remaining
+            else:
+                self._pending_charges.pop(client_id, None)
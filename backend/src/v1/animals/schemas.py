@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import date, datetime
 from typing import Any, Dict, List, Optional
 from pydantic import BaseModel, Field
 
@@ -45,14 +45,21 @@ class TranscriptionResponse(BaseSchema):
     animal_id: int
     behavior_state: Optional[str] = None
     measurements: Optional[Dict[str, Any]] = None
+    weight_kg: Optional[float] = Field(None, description="Вес в кг, извлечённый из measurements")
+    temperature_c: Optional[float] = Field(None, description="Температура в °C, извлечённая из measurements")
     feeding_details: Optional[Dict[str, Any]] = None
+    feed_quantity: Optional[float] = Field(None, description="Количество корма, извлечённое из feeding_details")
     relationships: Optional[Dict[str, Any]] = None
     created_at: datetime
     updated_at: datetime
 
 
 class AnimalWithTranscriptionsResponse(AnimalResponse):
-    transcriptions: List[TranscriptionResponse] = []
+    transcriptions: List[TranscriptionResponse] = Field([], description="Последние транскрипции, от новых к старым")
+    transcriptions_next_cursor: Optional[str] = Field(
+        None, description="Курсор для /transcriptions/history (None - более старых транскрипций нет)"
+    )
+    details_included: bool = Field(True, description="False - measurements, feeding_details и relationships не загружались")
 
 
 class AudioProcessingResponse(BaseSchema):
@@ -67,5 +74,45 @@ class AudioProcessingResponse(BaseSchema):
 class AnimalsListResponse(BaseSchema):
     animals: List[AnimalResponse]
     total: int
+    total_is_exact: bool = Field(True, description="False - total оценён по статистике планировщика")
     page: int
     page_size: int
+    next_cursor: Optional[str] = Field(None, description="Курсор следующей страницы (None - страниц больше нет)")
+
+
+class AnimalTypesResponse(BaseSchema):
+    animal_types: List[str]
+    counts: Dict[str, int] = Field(description="Количество животных каждого типа")
+    total_types: int
+
+
+class AnimalSearchResponse(BaseSchema):
+    animals: List[AnimalResponse] = Field(description="Найденные животные, самые похожие - первыми")
+    search_term: str
+    next_cursor: Optional[str] = Field(None, description="Курсор следующей страницы (None - страниц больше нет)")
+
+
+class TranscriptionsPageResponse(BaseSchema):
+    animal_id: int
+    transcriptions: List[TranscriptionResponse]
+    details_included: bool = Field(True, description="False - measurements, feeding_details и relationships не загружались")
+    next_cursor: Optional[str] = Field(None, description="Курсор следующей страницы (None - страниц больше нет)")
+
+
+class DailyStatsResponse(BaseSchema):
+    day: date
+    notes_count: int = Field(description="Количество транскрипций за день")
+    weight_min: Optional[float] = None
+    weight_max: Optional[float] = None
+    weight_avg: Optional[float] = None
+    temperature_min: Optional[float] = None
+    temperature_max: Optional[float] = None
+    temperature_avg: Optional[float] = None
+    feed_quantity: float = Field(0, description="Суммарное количество корма за день")
+
+
+class AnimalTrendsResponse(BaseSchema):
+    animal_id: int
+    date_from: date
+    date_to: date
+    days: List[DailyStatsResponse] = Field(description="Дни с транскрипциями, по возрастанию даты")
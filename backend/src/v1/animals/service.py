@@ -1,16 +1,25 @@
+import asyncio
 import logging
 import os
 import tempfile
+import time
 import uuid
-from datetime import datetime
-from typing import Dict, List, Optional, Any
+from datetime import date, datetime, timedelta, timezone
+from typing import Dict, List, Mapping, Optional, Any, Tuple
 import aiofiles
 
 from fastapi import HTTPException, UploadFile, status
 from dependency_injector.wiring import Provide
 
+from exceptions import AlreadyExists, DoesNotExist
+from pagination import encode_cursor
 from v1.animals.config import AnimalsServiceConfig
-from db.postgres.unit_of_work import UnitOfWork
+from v1.animals.audio_formats import probe_audio_duration
+from v1.animals.data_transfer import DataFormat, DataTable, TransferStats, export_table, import_table, temp_export_path
+from v1.animals.pipeline import run_transcription_pipeline
+from v1.animals.facets import AnimalTypeFacets
+from v1.animals.scheduler import InferenceScheduler
+from db.postgres.unit_of_work import UnitOfWork, read_unit_of_work
 from common_schemas import (
     AnimalCreate, 
     AnimalUpdate, 
@@ -28,15 +37,24 @@ from v1.animals.schemas import (
     TranscriptionResponse,
     AnimalWithTranscriptionsResponse,
     AudioProcessingResponse,
-    AnimalsListResponse
+    AnimalsListResponse,
+    AnimalSearchResponse,
+    AnimalTypesResponse,
+    TranscriptionsPageResponse,
+    AnimalTrendsResponse,
+    DailyStatsResponse
 )
 
 logger = logging.getLogger(__name__)
 
 
 class AnimalsService:
-    def __init__(self, config: AnimalsServiceConfig) -> None:
+    def __init__(
+        self, config: AnimalsServiceConfig, scheduler: InferenceScheduler, facets: AnimalTypeFacets
+    ) -> None:
         self.config = config
+        self.scheduler = scheduler
+        self.facets = facets
         # Создаем директорию для временных аудио файлов, если она не существует
         os.makedirs(self.config.TEMP_AUDIO_PATH, exist_ok=True)
         logger.info(f"AnimalsService initialized with config: {config}")
@@ -44,95 +62,87 @@ class AnimalsService:
     async def create_animal(self, data: AnimalCreateRequest) -> AnimalResponse:
         """Создание нового животного"""
         async with UnitOfWork() as uow:
-            # Проверяем, что животное с таким именем не существует
-            existing_animals = await uow.animals.search_by_name(data.name)
-            if existing_animals:
+            # Уникальность имени проверяет БД (uq_animals_name_lower): один INSERT ... RETURNING
+            try:
+                created_animal = await uow.animals.insert_returning(
+                    AnimalCreate(animal=data.animal, name=data.name)
+                )
+            except AlreadyExists:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail=f"Animal with name '{data.name}' already exists"
                 )
-
-            # Создаем животное
-            animal_data = AnimalCreate(
-                animal=data.animal,
-                name=data.name
-            )
-            
-            animal_id = await uow.animals.insert_one(animal_data)
             await uow.commit()
+        await self.facets.apply({created_animal.animal: 1})
 
-            # Получаем созданное животное
-            created_animal = await uow.animals.find_by_id(animal_id)
-            
-            return AnimalResponse(
-                id=created_animal.id,
-                animal=created_animal.animal,
-                name=created_animal.name,
-                created_at=created_animal.created_at,
-                updated_at=created_animal.updated_at
-            )
+        return AnimalResponse(
+            id=created_animal.id,
+            animal=created_animal.animal,
+            name=created_animal.name,
+            created_at=created_animal.created_at,
+            updated_at=created_animal.updated_at
+        )
 
     async def update_animal(self, animal_id: int, data: AnimalUpdateRequest) -> AnimalResponse:
         """Обновление информации о животном"""
+        update_data = AnimalUpdate(animal=data.animal, name=data.name).model_dump(exclude_none=True)
+        if not update_data:
+            return await self.get_animal_by_id(animal_id)
+
         async with UnitOfWork() as uow:
-            # Проверяем, что животное существует
-            existing_animal = await uow.animals.find_by_id(animal_id)
-            if not existing_animal:
+            # Один UPDATE ... RETURNING: существование - по числу строк, уникальность имени -
+            # ограничением БД, прежний тип (для фасетов) - из того же запроса
+            try:
+                result = await uow.animals.update_returning(animal_id, update_data, previous_columns=("animal",))
+            except AlreadyExists:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Animal with name '{data.name}' already exists"
+                )
+            if result is None:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="Animal not found"
                 )
-
-            # Проверяем, что новое имя не занято другим животным
-            if data.name and data.name != existing_animal.name:
-                animals_with_name = await uow.animals.search_by_name(data.name)
-                if animals_with_name:
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail=f"Animal with name '{data.name}' already exists"
-                    )
-
-            # Обновляем животное
-            update_data = AnimalUpdate()
-            if data.animal is not None:
-                update_data.animal = data.animal
-            if data.name is not None:
-                update_data.name = data.name
-
-            updated_animal = await uow.animals.update_by_id(animal_id, update_data)
             await uow.commit()
 
-            return AnimalResponse(
-                id=updated_animal.id,
-                animal=updated_animal.animal,
-                name=updated_animal.name,
-                created_at=updated_animal.created_at,
-                updated_at=updated_animal.updated_at
-            )
+        updated_animal, previous = result
+        if updated_animal.animal != previous["animal"]:
+            await self.facets.apply({previous["animal"]: -1, updated_animal.animal: 1})
+
+        return AnimalResponse(
+            id=updated_animal.id,
+            animal=updated_animal.animal,
+            name=updated_animal.name,
+            created_at=updated_animal.created_at,
+            updated_at=updated_animal.updated_at
+        )
 
     async def delete_animal(self, animal_id: int) -> Dict[str, Any]:
-        """Удаление животного"""
+        """Удаление животного вместе с его транскрипциями"""
         async with UnitOfWork() as uow:
-            # Проверяем, что животное существует
-            existing_animal = await uow.animals.find_by_id(animal_id)
-            if not existing_animal:
+            # Транскрипции ссылаются на животное без каскада - удаляются первыми в той же
+            # транзакции; дневные сводки удаляет каскад внешнего ключа. Существование -
+            # по строке из DELETE ... RETURNING
+            await uow.animal_transcriptions.delete_by_animal_id(animal_id)
+            try:
+                deleted_animal = await uow.animals.delete_by_id(animal_id)
+            except DoesNotExist:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="Animal not found"
                 )
-
-            # Удаляем животное (soft delete через базовый репозиторий)
-            deleted_animal = await uow.animals.delete_by_id(animal_id)
             await uow.commit()
+        await self.facets.apply({deleted_animal.animal: -1})
 
-            return {
-                "message": f"Animal '{deleted_animal.name}' has been deleted successfully",
-                "deleted_animal_id": animal_id
-            }
+        return {
+            "message": f"Animal '{deleted_animal.name}' has been deleted successfully",
+            "deleted_animal_id": animal_id
+        }
 
     async def get_animal_by_id(self, animal_id: int) -> AnimalResponse:
         """Получение животного по ID"""
-        async with UnitOfWork() as uow:
+        async with read_unit_of_work() as uow:
             animal = await uow.animals.find_by_id(animal_id)
             if not animal:
                 raise HTTPException(
@@ -152,114 +162,237 @@ class AnimalsService:
         self, 
         page: int = 1, 
         page_size: int = 50, 
-        animal_type: Optional[str] = None
+        animal_type: Optional[str] = None,
+        cursor: Optional[str] = None
     ) -> AnimalsListResponse:
         """Получение списка всех животных с пагинацией"""
-        async with UnitOfWork() as uow:
+        async with read_unit_of_work() as uow:
             offset = (page - 1) * page_size
+            next_cursor = None
             
-            if animal_type:
-                animals = await uow.animals.find_by_animal_type(animal_type)
-                # Применяем пагинацию вручную для фильтрованного списка
-                total = len(animals)
-                animals = animals[offset:offset + page_size]
+            if cursor or page == 1:
+                # Keyset-пагинация: стоимость не зависит от глубины страницы,
+                # фильтр по типу обслуживается индексом (animal, id)
+                animals_page, total = await uow.animals.find_page_by_animal_type(
+                    animal_type, cursor=cursor, limit=page_size, mappings=True
+                )
+                animals, next_cursor = animals_page.items, animals_page.next_cursor
             else:
-                animals = await uow.animals.find_all(limit=page_size, offset=offset)
-                # Для подсчета общего количества делаем отдельный запрос
-                all_animals = await uow.animals.find_all(limit=10000, offset=0)  # большой лимит для подсчета
-                total = len(all_animals)
-
-            animal_responses = [
-                AnimalResponse(
-                    id=animal.id,
-                    animal=animal.animal,
-                    name=animal.name,
-                    created_at=animal.created_at,
-                    updated_at=animal.updated_at
+                # Совместимость с page: OFFSET, но с курсором для перехода на keyset
+                animals = await uow.animals.find_all(
+                    limit=page_size + 1, offset=offset, animal_type=animal_type, mappings=True
                 )
-                for animal in animals
-            ]
+                if len(animals) > page_size:
+                    animals = animals[:page_size]
+                    next_cursor = encode_cursor([animals[-1]["id"]])
+                # Общее количество: точный COUNT(*) для небольшой выборки,
+                # оценка планировщика - для большой
+                total = await uow.animals.count_by_animal_type(animal_type)
 
             return AnimalsListResponse(
-                animals=animal_responses,
-                total=total,
+                animals=self._animal_responses(animals),
+                total=total.value,
+                total_is_exact=total.exact,
                 page=page,
-                page_size=page_size
+                page_size=page_size,
+                next_cursor=next_cursor
             )
 
-    async def get_animal_with_transcriptions(self, animal_id: int) -> AnimalWithTranscriptionsResponse:
-        """Получение животного со всеми его транскрипциями"""
+    async def get_animal_types(self) -> AnimalTypesResponse:
+        """Типы животных с количеством: из фасетов в Redis, при их отсутствии - пересборка"""
+        counts = await self.facets.get()
+        if counts is None:
+            counts = await self.rebuild_animal_type_facets()
+
+        return AnimalTypesResponse(
+            animal_types=sorted(counts),
+            counts=dict(sorted(counts.items())),
+            total_types=len(counts)
+        )
+
+    async def rebuild_animal_type_facets(self) -> Dict[str, int]:
+        """
+        Полный пересчёт фасетов типов по БД
+
+        Только с primary: на отстающей реплике нет свежих записей, а их инкременты,
+        пришедшие до сборки хеша, потеряны - устаревшие счётчики остались бы в Redis.
+        """
         async with UnitOfWork() as uow:
-            animal_with_transcriptions = await uow.animals.find_with_transcriptions(animal_id)
-            if not animal_with_transcriptions:
+            counts = await uow.animals.count_by_animal_types()
+        try:
+            await self.facets.rebuild(counts)
+        except Exception as e:
+            logger.warning(f"Failed to store animal type facets: {e}")
+        return counts
+
+    async def import_data(self, table: DataTable, data_format: DataFormat, data_file: UploadFile) -> TransferStats:
+        """Массовая загрузка CSV/Parquet в таблицу через COPY"""
+        os.makedirs(self.config.TEMP_AUDIO_PATH, exist_ok=True)
+        temp_file_path = os.path.join(self.config.TEMP_AUDIO_PATH, f"{uuid.uuid4()}.{data_format.value}")
+        try:
+            # Файл копируется на диск блоками, а не читается в память целиком
+            async with aiofiles.open(temp_file_path, 'wb') as temp_file:
+                while chunk := await data_file.read(1024 * 1024):
+                    await temp_file.write(chunk)
+
+            stats = await import_table(table, data_format, temp_file_path, self.config.DATA_TRANSFER_CHUNK_ROWS)
+        finally:
+            await self._cleanup_temp_file(temp_file_path)
+
+        if table == DataTable.ANIMALS:
+            # Инкрементальные фасеты не видят строк, загруженных через COPY
+            await self.rebuild_animal_type_facets()
+        return stats
+
+    async def export_data(self, table: DataTable, data_format: DataFormat) -> Tuple[str, TransferStats]:
+        """Выгрузка таблицы во временный файл; удалить файл после отдачи - на вызывающем"""
+        path = temp_export_path(table, data_format)
+        try:
+            stats = await export_table(table, data_format, path, self.config.DATA_TRANSFER_CHUNK_ROWS)
+        except Exception:
+            await self._cleanup_temp_file(path)
+            raise
+        return path, stats
+
+    async def search_animals_by_name(
+        self, name: str, cursor: Optional[str] = None, limit: int = 50
+    ) -> AnimalSearchResponse:
+        """Поиск животных по имени: подстрока или похожее имя, по убыванию похожести"""
+        async with read_unit_of_work() as uow:
+            animals_page = await uow.animals.search_ranked_by_name(
+                name, cursor=cursor, limit=limit, mappings=True
+            )
+
+            return AnimalSearchResponse(
+                animals=self._animal_responses(animals_page.items),
+                search_term=name,
+                next_cursor=animals_page.next_cursor
+            )
+
+    async def get_animal_with_transcriptions(
+        self, animal_id: int, limit: Optional[int] = None, include_details: bool = True
+    ) -> AnimalWithTranscriptionsResponse:
+        """Животное с последними транскрипциями; более старые - по transcriptions_next_cursor"""
+        async with read_unit_of_work() as uow:
+            animal = await uow.animals.find_by_id(animal_id)
+            if not animal:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="Animal not found"
                 )
 
-            transcription_responses = [
-                TranscriptionResponse(
-                    id=transcription.id,
-                    animal_id=transcription.animal_id,
-                    behavior_state=transcription.behavior_state,
-                    measurements=transcription.measurements,
-                    feeding_details=transcription.feeding_details,
-                    relationships=transcription.relationships,
-                    created_at=transcription.created_at,
-                    updated_at=transcription.updated_at
-                )
-                for transcription in animal_with_transcriptions.transcriptions
-            ]
+            transcriptions_page = await uow.animal_transcriptions.find_recent_by_animal_id(
+                animal_id,
+                limit=limit or self.config.ANIMAL_DETAIL_TRANSCRIPTIONS_LIMIT,
+                include_details=include_details
+            )
 
             return AnimalWithTranscriptionsResponse(
-                id=animal_with_transcriptions.id,
-                animal=animal_with_transcriptions.animal,
-                name=animal_with_transcriptions.name,
-                created_at=animal_with_transcriptions.created_at,
-                updated_at=animal_with_transcriptions.updated_at,
-                transcriptions=transcription_responses
+                id=animal.id,
+                animal=animal.animal,
+                name=animal.name,
+                created_at=animal.created_at,
+                updated_at=animal.updated_at,
+                transcriptions=self._transcription_responses(transcriptions_page.items),
+                transcriptions_next_cursor=transcriptions_page.next_cursor,
+                details_included=include_details
             )
 
-    async def create_transcription(self, data: TranscriptionCreateRequest) -> TranscriptionResponse:
-        """Создание новой транскрипции для животного"""
-        async with UnitOfWork() as uow:
-            # Проверяем, что животное существует
-            animal = await uow.animals.find_by_id(data.animal_id)
-            if not animal:
+    async def get_animal_transcriptions(
+        self,
+        animal_id: int,
+        cursor: Optional[str] = None,
+        limit: int = 50,
+        include_details: bool = True
+    ) -> TranscriptionsPageResponse:
+        """Транскрипции животного от новых к старым с курсорной пагинацией"""
+        async with read_unit_of_work() as uow:
+            transcriptions_page = await uow.animal_transcriptions.find_recent_by_animal_id(
+                animal_id, cursor=cursor, limit=limit, include_details=include_details
+            )
+            # Проверяем существование животного только для пустой первой страницы
+            if not transcriptions_page.items and not cursor:
+                if not await uow.animals.find_by_id(animal_id):
+                    raise HTTPException(
+                        status_code=status.HTTP_404_NOT_FOUND,
+                        detail="Animal not found"
+                    )
+
+            return TranscriptionsPageResponse(
+                animal_id=animal_id,
+                transcriptions=self._transcription_responses(transcriptions_page.items),
+                next_cursor=transcriptions_page.next_cursor,
+                details_included=include_details
+            )
+
+    @staticmethod
+    def _animal_responses(rows: List[Mapping[str, Any]]) -> List[AnimalResponse]:
+        """Колонки из БД типизированы драйвером: ответы собираются напрямую, без схемы на строку"""
+        return [AnimalResponse.model_construct(**row) for row in rows]
+
+    @staticmethod
+    def _transcription_responses(transcriptions: List[AnimalTranscriptionSchema]) -> List[TranscriptionResponse]:
+        """Схемы из репозитория уже провалидированы: ответы собираются без повторной валидации JSONB"""
+        return [TranscriptionResponse.model_construct(**dict(transcription)) for transcription in transcriptions]
+
+    async def get_animal_trends(
+        self, animal_id: int, date_from: Optional[date] = None, date_to: Optional[date] = None
+    ) -> AnimalTrendsResponse:
+        """Вес, температура и кормление животного по дням - только из дневных сводок"""
+        date_to = date_to or datetime.now(timezone.utc).date()
+        date_from = date_from or date_to - timedelta(days=self.config.ANIMAL_TRENDS_DEFAULT_DAYS - 1)
+        if date_from > date_to or (date_to - date_from).days >= self.config.ANIMAL_TRENDS_MAX_DAYS:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"date_from must not be after date_to, period is limited to {self.config.ANIMAL_TRENDS_MAX_DAYS} days"
+            )
+
+        async with read_unit_of_work() as uow:
+            days = await uow.animal_daily_stats.find_range(animal_id, date_from, date_to)
+            # Существование животного проверяем только для пустого периода
+            if not days and not await uow.animals.find_by_id(animal_id):
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="Animal not found"
                 )
 
-            # Создаем транскрипцию
-            transcription_data = AnimalTranscriptionCreate(
-                animal_id=data.animal_id,
-                behavior_state=data.behavior_state,
-                measurements=data.measurements,
-                feeding_details=data.feeding_details,
-                relationships=data.relationships
+            return AnimalTrendsResponse(
+                animal_id=animal_id,
+                date_from=date_from,
+                date_to=date_to,
+                days=[DailyStatsResponse.model_validate(day, from_attributes=True) for day in days]
             )
 
-            transcription_id = await uow.animal_transcriptions.insert_one(transcription_data)
+    async def create_transcription(self, data: TranscriptionCreateRequest) -> TranscriptionResponse:
+        """Создание новой транскрипции для животного"""
+        async with UnitOfWork() as uow:
+            # Существование животного проверяет внешний ключ: один INSERT ... RETURNING,
+            # при его нарушении - 404 Animal not found
+            created_transcription = await uow.animal_transcriptions.insert_returning(
+                AnimalTranscriptionCreate(
+                    animal_id=data.animal_id,
+                    behavior_state=data.behavior_state,
+                    measurements=data.measurements,
+                    feeding_details=data.feeding_details,
+                    relationships=data.relationships
+                )
+            )
             await uow.commit()
 
-            # Получаем созданную транскрипцию
-            created_transcription = await uow.animal_transcriptions.find_by_id(transcription_id)
-
-            return TranscriptionResponse(
-                id=created_transcription.id,
-                animal_id=created_transcription.animal_id,
-                behavior_state=created_transcription.behavior_state,
-                measurements=created_transcription.measurements,
-                feeding_details=created_transcription.feeding_details,
-                relationships=created_transcription.relationships,
-                created_at=created_transcription.created_at,
-                updated_at=created_transcription.updated_at
-            )
+        return TranscriptionResponse(
+            id=created_transcription.id,
+            animal_id=created_transcription.animal_id,
+            behavior_state=created_transcription.behavior_state,
+            measurements=created_transcription.measurements,
+            feeding_details=created_transcription.feeding_details,
+            relationships=created_transcription.relationships,
+            created_at=created_transcription.created_at,
+            updated_at=created_transcription.updated_at
+        )
 
     async def get_transcription_by_id(self, transcription_id: int) -> TranscriptionResponse:
         """Получение транскрипции по ID"""
-        async with UnitOfWork() as uow:
+        async with read_unit_of_work() as uow:
             transcription = await uow.animal_transcriptions.find_by_id(transcription_id)
             if not transcription:
                 raise HTTPException(
@@ -281,11 +414,12 @@ class AnimalsService:
     async def process_audio(
         self, 
         audio_file: UploadFile, 
-        data: AudioProcessingRequest
+        data: AudioProcessingRequest,
+        client_id: str = "anonymous"
     ) -> AudioProcessingResponse:
         """Обработка аудио файла и создание транскрипции"""
-        # Проверяем, что животное существует
-        async with UnitOfWork() as uow:
+        # Проверяем, что животное существует, до дорогой обработки аудио
+        async with read_unit_of_work() as uow:
             animal = await uow.animals.find_by_id(data.animal_id)
             if not animal:
                 raise HTTPException(
@@ -301,9 +435,13 @@ class AnimalsService:
         
         try:
             logger.info(f"Processing audio file: {temp_file_path} for animal {data.animal_id}")
-            
+
+            # Оцениваем длительность по заголовку: короткие записи обслуживаются первыми
+            estimated_seconds = await asyncio.to_thread(probe_audio_duration, temp_file_path)
+
             # Обрабатываем аудио с помощью улучшенной системы транскрипции
-            processing_result = await self._process_audio_file(temp_file_path, data.description)
+            async with self.scheduler.slot(client_id, estimated_seconds):
+                processing_result = await self._process_audio_file(temp_file_path, data.description)
             
             # Создаем транскрипцию на основе результатов обработки
             async with UnitOfWork() as uow:
@@ -315,20 +453,23 @@ class AnimalsService:
                     relationships=processing_result.get("relationships")
                 )
 
-                transcription_id = await uow.animal_transcriptions.insert_one(transcription_data)
+                created_transcription = await uow.animal_transcriptions.insert_returning(transcription_data)
                 await uow.commit()
 
-                logger.info(f"Transcription created successfully with ID: {transcription_id}")
+                logger.info(f"Transcription created successfully with ID: {created_transcription.id}")
 
                 return AudioProcessingResponse(
-                    transcription_id=transcription_id,
+                    transcription_id=created_transcription.id,
                     animal_id=data.animal_id,
                     processing_status="completed",
                     transcribed_text=processing_result.get("transcribed_text"),
                     analysis_results=processing_result.get("analysis_results"),
-                    created_at=datetime.utcnow()
+                    created_at=created_transcription.created_at
                 )
 
+        except HTTPException:
+            # Например, животное удалено во время обработки (нарушение внешнего ключа)
+            raise
         except Exception as e:
             logger.error(f"Error processing audio for animal {data.animal_id}: {e}")
             raise HTTPException(
@@ -413,28 +554,38 @@ class AnimalsService:
 
     async def _process_audio_file(self, file_path: str, description: Optional[str] = None) -> Dict[str, Any]:
         """Обработка аудио файла: транскрипция + анализ с помощью GigaChat"""
+        started_at = time.perf_counter()
         try:
-            # Импортируем функции для обработки аудио
-            from v1.animals.utils import transcribe_russian_audio, parse_text
-            
-            # 1. Транскрибируем аудио в текст с помощью улучшенной системы
-            logger.info(f"Starting audio transcription for file: {file_path}")
-            transcribed_text = transcribe_russian_audio(file_path)
-            
-            if transcribed_text.startswith("Ошибка при транскрибации"):
-                logger.warning(f"Transcription failed: {transcribed_text}")
+            # Импортируем тяжёлый ML-стек только при первой обработке аудио
+            from v1.animals.inference import iter_transcribed_chunks
+            from v1.animals.utils import parse_text
+
+            # 1-2. Транскрибируем аудио по чанкам; каждый чанк сразу уходит
+            # на анализ в GigaChat, пока ASR декодирует следующий
+            logger.info(f"Starting pipelined transcription and analysis for file: {file_path}")
+            try:
+                pipeline_result = await run_transcription_pipeline(
+                    lambda: iter_transcribed_chunks(file_path, self.config.ASR_CHUNK_SECONDS),
+                    parse_text,
+                    max_concurrent_analyses=self.config.LLM_MAX_CONCURRENT_ANALYSES,
+                )
+                transcribed_text = pipeline_result.text
+                analysis_data = pipeline_result.analysis
+            except Exception as e:
+                logger.warning(f"Transcription failed: {e}")
+                pipeline_result = None
+                transcribed_text = ""
+
+            if not transcribed_text:
                 # Используем описание как fallback
                 if description:
                     transcribed_text = f"Наблюдение за животным: {description}"
                 else:
                     transcribed_text = "Не удалось распознать речь из аудиозаписи"
-            
+                analysis_data = await asyncio.to_thread(parse_text, transcribed_text)
+
             logger.info(f"Transcription completed: {transcribed_text[:100]}...")
-            
-            # 2. Анализируем транскрибированный текст с помощью GigaChat
-            logger.info("Starting text analysis with GigaChat")
-            analysis_data = parse_text(transcribed_text)
-            
+
             # 3. Формируем результат
             return {
                 "transcribed_text": transcribed_text,
@@ -444,10 +595,13 @@ class AnimalsService:
                 "relationships": analysis_data.get("relationships", {}),
                 "analysis_results": {
                     "audio_quality": "обработано",
-                    "processing_time_seconds": 15,  # примерное время обработки
-                    "confidence_score": 0.85,
+                    "processing_time_seconds": round(time.perf_counter() - started_at, 2),
+                    "confidence_score": round(pipeline_result.confidence, 3) if pipeline_result else 0.0,
+                    "audio_seconds": round(pipeline_result.audio_seconds, 2) if pipeline_result else 0.0,
+                    "chunks": len(pipeline_result.chunks) if pipeline_result else 0,
+                    "asr_models": sorted({c.model_name for c in pipeline_result.chunks}) if pipeline_result else [],
                     "description": description,
-                    "processing_method": "Audio Transcription + GigaChat Analysis",
+                    "processing_method": "Pipelined Audio Transcription + GigaChat Analysis",
                     "raw_analysis": analysis_data
                 }
             }
@@ -64,7 +64,9 @@ class AuthService:
         except email_validator.EmailNotValidError:
             raise EmailNotValidError()
 
-        async with UnitOfWork() as uow:
+        # Только проверки занятости - с реплики; окончательно уникальность
+        # проверяется на primary в confirm_registration
+        async with UnitOfWork(read_only=True) as uow:
             # Check if user already exists
             existing_user = await uow.users.select_user_by_email(data.email)
             if existing_user:
@@ -250,7 +252,7 @@ class AuthService:
 
     async def get_user_profile(self, user_id: str) -> dict:
         """Получение профиля пользователя с дополнительной статистикой"""
-        async with UnitOfWork() as uow:
+        async with UnitOfWork(read_only=True) as uow:
             user = await uow.users.select_user_by_id(int(user_id))
             if not user:
                 raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
@@ -390,7 +392,7 @@ class AuthService:
         if not check_region(login_schema.phone, self.config.AVALIABLES_COUNTRY_CODES):
             raise RegionNotAvaliableError
 
-        async with UnitOfWork() as uow:
+        async with UnitOfWork(read_only=True) as uow:
             user = await uow.users.select_user_by_number(login_schema.phone)
             message_response: ResponseSchema = await self.send_verification_to_phone_number(
                 login_schema.phone, login_schema.send_message_type